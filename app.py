@@ -42,4 +42,15 @@ if __name__ == "__main__":
         print("네이버 트렌드 API 인증 정보가 .env 파일에 설정되지 않았습니다.")
         exit()
 
-    demo.launch(debug=True)
+    # 헬스 체크 엔드포인트를 먼저 등록한 뒤 Gradio 앱을 마운트하고, 워밍업을 백그라운드에서 시작합니다.
+    import uvicorn
+    from fastapi import FastAPI
+    from warmup import add_health_routes, warmup
+
+    app = gr.mount_gradio_app(add_health_routes(FastAPI()), demo, path="/")
+    warmup.start()
+    uvicorn.run(
+        app,
+        host=os.getenv("GRADIO_SERVER_NAME", "127.0.0.1"),
+        port=int(os.getenv("GRADIO_SERVER_PORT", 7860)),
+    )
@@ -0,0 +1,189 @@
+"""
+네이버 블로그 스크래핑 벤치마크 (URL마다 브라우저 실행 vs 공유 브라우저 + 컨텍스트 제한 vs HTTP 추출).
+
+로컬 HTTP 서버가 네이버 블로그 구조(iframe#mainFrame -> div.se-main-container, lazy 이미지)를
+흉내 낸 페이지를 제공하며, 각 방식의 전체 소요 시간과 프로세스 트리(Chromium 포함) 최대 RSS를 비교합니다.
+실행: python benchmarks/bench_blog_scraping.py [URL 수]
+(Playwright의 Chromium 대신 설치된 Chromium을 쓰려면 NAVER_SCRAPE_CHROMIUM_PATH에 실행 파일 경로를 지정합니다.)
+브라우저를 실행할 수 없으면 일부 결과만 출력하지 않고 실패(exit 1)로 끝납니다.
+"""
+import os
+import sys
+import time
+import asyncio
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from playwright.async_api import async_playwright  # noqa: E402
+from modules.naver_search.blog_browser import CHROMIUM_EXECUTABLE_PATH, SharedBlogBrowser  # noqa: E402
+from modules.naver_search.blog_extractor import clean_image_urls, extract_blog_post  # noqa: E402
+
+ASSET_DELAY_SECONDS = 0.3  # 이미지/CSS 응답 지연 (실제 CDN 왕복을 흉내 냄)
+
+
+class FakeBlogHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body, content_type="text/html; charset=utf-8"):
+        data = body if isinstance(body, bytes) else body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path.startswith("/blog/"):
+            post = path.rsplit("/", 1)[-1]
+            self._send(f'<html><body><iframe id="mainFrame" src="/postview/{post}"></iframe></body></html>')
+        elif path.startswith("/postview/"):
+            post = path.rsplit("/", 1)[-1]
+            host = f"http://{self.headers['Host']}"
+            images = "".join(
+                f'<img src="{host}/thumb/{post}_{i}.jpg?type=w80" data-lazy-src="{host}/img/{post}_{i}.jpg?type=w966">'
+                for i in range(8)
+            )
+            paragraphs = "".join(f"<p>후기 {post} 문단 {i}. 주차가 편하고 야경이 좋았어요.</p>" for i in range(40))
+            self._send(
+                f'<html><head><link rel="stylesheet" href="/style.css"></head><body>'
+                f'<div class="se-main-container">{paragraphs}{images}</div></body></html>'
+            )
+        else:
+            time.sleep(ASSET_DELAY_SECONDS)
+            self._send(b"\0" * 50_000, "image/jpeg" if path.endswith(".jpg") else "text/css")
+
+
+# --- 기존 방식: URL마다 async_playwright() + Chromium 실행 ---
+async def legacy_scrape(url):
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, executable_path=CHROMIUM_EXECUTABLE_PATH)
+        page = await browser.new_page()
+        await page.goto(url, wait_until="domcontentloaded", timeout=20000)
+        frame_element = await page.wait_for_selector("iframe#mainFrame", timeout=5000)
+        frame = await frame_element.content_frame()
+        element = await frame.wait_for_selector("div.se-main-container", timeout=5000)
+        text = await element.inner_text()
+        sources = []
+        for img in await element.query_selector_all("img"):
+            sources.append(await img.get_attribute("data-lazy-src") or await img.get_attribute("data-src") or await img.get_attribute("src"))
+        await browser.close()
+        return text, clean_image_urls(sources)
+
+
+# --- 프로세스 트리 RSS 측정 ---
+def _tree_rss_bytes(root_pid):
+    try:
+        import psutil
+        root = psutil.Process(root_pid)
+        total = 0
+        for proc in [root] + root.children(recursive=True):
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+    except ImportError:
+        pass
+
+    # psutil이 없으면 /proc에서 직접 계산 (Linux)
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+            except OSError:
+                pass
+    tree, frontier = {root_pid}, [root_pid]
+    while frontier:
+        pid = frontier.pop()
+        children = [child for child, parent in parents.items() if parent == pid]
+        tree.update(children)
+        frontier.extend(children)
+    total = 0
+    for pid in tree:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+        except OSError:
+            pass
+    return total
+
+
+class PeakRSSSampler:
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _tree_rss_bytes(os.getpid()))
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+async def http_scrape(url):
+    return await asyncio.to_thread(extract_blog_post, url) or ("", [])
+
+
+def run_case(label, scrape, urls):
+    async def main():
+        return await asyncio.gather(*(scrape(url) for url in urls), return_exceptions=True)
+
+    with PeakRSSSampler() as sampler:
+        started = time.perf_counter()
+        results = asyncio.run(main())
+        elapsed = time.perf_counter() - started
+    # SharedBlogBrowser는 예외 대신 오류 문구를 본문 자리에 돌려주므로, 본문 내용으로 성공 여부를 가립니다.
+    failures = [
+        result if isinstance(result, BaseException) else result[0]
+        for result in results
+        if isinstance(result, BaseException) or not ("문단" in result[0] and len(result[1]) == 8)
+    ]
+    if failures:
+        # 실패한 URL이 섞이면 시간/RSS가 실제 스크래핑 비용이 아니므로 수치를 출력하지 않습니다.
+        reason = str(failures[0]).strip().splitlines()[0] if str(failures[0]).strip() else "빈 결과"
+        print(f"{label:<32} 실행 실패 {len(failures)}/{len(urls)}: {reason}")
+        return False
+    print(f"{label:<32} {elapsed:7.2f}s  peak RSS {sampler.peak / 1024 / 1024:8.1f} MB  성공 {len(urls)}/{len(urls)}")
+    return True
+
+
+def main():
+    n_urls = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBlogHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/blog/{i}" for i in range(n_urls)]
+
+    print(f"URL {n_urls}개 (이미지/CSS 응답 지연 {ASSET_DELAY_SECONDS}s)")
+    passed = run_case("HTTP + BeautifulSoup", http_scrape, urls)
+    passed &= run_case("URL마다 브라우저 (기존)", legacy_scrape, urls)
+
+    shared = SharedBlogBrowser()
+    passed &= run_case(f"공유 브라우저 (컨텍스트 {shared.max_contexts}개)", shared.scrape, urls)
+    # 두 번째 실행은 브라우저가 이미 떠 있는 상태(서버 운영 중)의 비용입니다.
+    passed &= run_case("공유 브라우저 (실행 중)", shared.scrape, urls)
+    shared.close()
+    server.shutdown()
+    if not passed:
+        print("실패: 일부 방식을 측정하지 못했습니다. 브라우저 비교 수치로 사용할 수 없습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
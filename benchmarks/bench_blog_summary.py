@@ -0,0 +1,147 @@
+"""
+블로그 후기 요약 벤치마크 (전체 본문 1차 요약 + 2차 스트리밍 vs 글별 동시 요약 후 종합).
+
+OpenAI 호환 /v1/chat/completions를 흉내 내는 로컬 스텁 서버가 입력/출력 토큰 수에 비례해
+응답을 지연시키므로, 네트워크나 API 키 없이 두 방식의 첫 토큰까지 시간과 전체 시간을 비교할 수 있습니다.
+실행: python benchmarks/bench_blog_summary.py [후기 수]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# --- 스텁 LLM 서버 설정 ---
+BASE_LATENCY = 0.3            # 요청 하나의 고정 지연(초)
+INPUT_CHARS_PER_SEC = 40_000  # 프롬프트 처리 속도 (글자/초)
+TOKENS_PER_SEC = 100          # 생성 속도 (토큰/초)
+MAX_OUTPUT_TOKENS = 1500
+
+
+def output_tokens_for(prompt_chars):
+    # 입력이 길수록 (상세 요약일수록) 응답도 길어지는 경향을 흉내 냅니다.
+    return min(MAX_OUTPUT_TOKENS, 150 + prompt_chars // 40)
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt_chars = sum(len(message.get("content") or "") for message in body["messages"])
+        time.sleep(BASE_LATENCY + prompt_chars / INPUT_CHARS_PER_SEC)
+        tokens = [f"토큰{i} " for i in range(output_tokens_for(prompt_chars))]
+
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for token in tokens:
+                time.sleep(1 / TOKENS_PER_SEC)
+                self._chunk({"id": "stub", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+                             "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]})
+            self._chunk({"id": "stub", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+                         "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+            if (body.get("stream_options") or {}).get("include_usage"):
+                self._chunk({"id": "stub", "object": "chat.completion.chunk", "created": 0, "model": body["model"], "choices": [],
+                             "usage": {"prompt_tokens": prompt_chars // 2, "completion_tokens": len(tokens),
+                                       "total_tokens": prompt_chars // 2 + len(tokens)}})
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+            return
+
+        time.sleep(len(tokens) / TOKENS_PER_SEC)
+        data = json.dumps({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_chars // 2, "completion_tokens": len(tokens), "total_tokens": prompt_chars // 2 + len(tokens)},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _chunk(self, payload):
+        self._write_chunk(f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8"))
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+def make_reviews(n_posts):
+    return [
+        {"content": "\n".join(f"후기 {i}: {j}번째 문단. 주말 오후라 붐볐지만 야경이 좋았고 근처 카페에 들렀어요." for j in range(60))}
+        for i in range(n_posts)
+    ]
+
+
+def no_progress(*args, **kwargs):
+    pass
+
+
+# --- 기존 방식: 전체 본문으로 1차 요약(invoke) 후 2차 스트리밍 ---
+def legacy_summary_stream(gpt, reviews):
+    full_text = "".join(f"--- 블로그 후기 {i+1} ---\n\n{review['content']}\n\n" for i, review in enumerate(reviews))
+    initial_summary = gpt.invoke(f"다음 후기들을 종합하여 상세하게 요약해주세요.\n{full_text}").content
+    full = ""
+    for chunk in gpt.stream(f"아래 1차 요약본에서 방문객 경험만 추출해주세요.\n{initial_summary}"):
+        full += chunk.content
+        yield full
+
+
+def measure_sync(label, stream):
+    started = time.perf_counter()
+    first = None
+    for _ in stream:
+        first = first or time.perf_counter() - started
+    print(f"{label:<28} 첫 토큰 {first:6.2f}s  전체 {time.perf_counter() - started:6.2f}s")
+
+
+async def measure_async(label, stream):
+    started = time.perf_counter()
+    first = None
+    async for _ in stream:
+        first = first or time.perf_counter() - started
+    print(f"{label:<28} 첫 토큰 {first:6.2f}s  전체 {time.perf_counter() - started:6.2f}s")
+
+
+def main():
+    n_posts = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    from langchain_openai import ChatOpenAI
+    import modules.naver_search.search as search
+    from modules.naver_search.llm_cache import LLMCache
+
+    # 실제 캐시 파일을 건드리지 않도록 임시 캐시를 사용합니다.
+    search.llm_cache = LLMCache(os.path.join(tempfile.mkdtemp(), "bench.sqlite3"))
+
+    reviews = make_reviews(n_posts)
+    print(f"후기 {n_posts}개, 후기당 {len(reviews[0]['content'])}자")
+    measure_sync("전체 본문 요약 (기존)", legacy_summary_stream(ChatOpenAI(temperature=0, model_name=search.SUMMARY_MODEL_NAME), reviews))
+
+    # ChatOpenAI의 비동기 HTTP 클라이언트는 이벤트 루프에 묶이므로, Gradio처럼 하나의 루프에서 실행합니다.
+    async def run_map_reduce():
+        await measure_async("글별 요약 + 종합 (캐시 없음)", search.summarize_blog_contents_stream(reviews, progress=no_progress))
+        await measure_async("글별 요약 + 종합 (캐시 적중)", search.summarize_blog_contents_stream(reviews, progress=no_progress))
+
+    asyncio.run(run_map_reduce())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+CSV 내보내기 정제 단계 벤치마크 (셀 단위 vs 컬럼 단위).
+
+실행: python benchmarks/bench_export_cleaning.py [행 수]
+"""
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from utils import clean_dataframe  # noqa: E402
+
+
+def make_rows(n_rows):
+    """TourAPI 상세 응답을 흉내 낸 합성 행을 생성합니다."""
+    rows = []
+    for i in range(n_rows):
+        rows.append({
+            "contentid": str(100000 + i),
+            "title": f"<b>관광지 {i}</b>",
+            "addr1": f"서울특별시 종로구 세종대로 {i % 300}",
+            "tel": f"02-{i % 9000 + 1000}-{i % 10000:04d}",
+            "homepage": f'<a href="https://www.example{i % 50}.kr/page/{i}" target="_blank" title="새창">www.example{i % 50}.kr</a>',
+            "overview": f"<p>관광지 {i}의 개요입니다.<br>\n  여러 줄에 걸친   설명과 <strong>강조</strong>가 있습니다.</p>" * 3,
+            "usetime": "09:00~18:00<br>(입장마감 17:00)",
+            "infocenter": f"문의 02-{i % 9000 + 1000}-0000",
+            "parking": "가능" if i % 2 else "",
+        })
+    return rows
+
+
+def legacy_clean_rows(rows):
+    """기존 export_to_csv의 셀 단위 정제 로직을 그대로 재현합니다."""
+    def clean_html(raw_html):
+        if not raw_html:
+            return ""
+        cleanr = re.compile('<.*?>')
+        return re.sub(cleanr, '', raw_html).strip()
+
+    cleaned_rows = []
+    for item_data in rows:
+        cleaned_item = {}
+        for k, v in item_data.items():
+            if k == 'homepage':
+                match = re.search(r'href=["\\](["\\]+)[\"\\]', str(v))
+                cleaned_item[k] = match.group(1) if match else clean_html(str(v))
+            else:
+                cleaned_item[k] = clean_html(v) if isinstance(v, str) else v
+        cleaned_rows.append(cleaned_item)
+    return cleaned_rows
+
+
+def legacy_clean(rows, headers):
+    return pd.DataFrame(legacy_clean_rows(rows), columns=headers).to_csv(index=False)
+
+
+def columnar_clean(rows, headers):
+    df = pd.DataFrame(rows, columns=headers, dtype=object)
+    return clean_dataframe(df).to_csv(index=False)
+
+
+def columnar_clean_only(rows, headers):
+    return clean_dataframe(pd.DataFrame(rows, columns=headers, dtype=object))
+
+
+def best_of(fn, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rows = make_rows(n_rows)
+    headers = list(rows[0].keys())
+
+    legacy_only = best_of(lambda: legacy_clean_rows(rows))
+    columnar_only = best_of(lambda: columnar_clean_only(rows, headers))
+    legacy = best_of(lambda: legacy_clean(rows, headers))
+    columnar = best_of(lambda: columnar_clean(rows, headers))
+
+    print(f"rows: {n_rows:,}")
+    print(f"[정제만]     셀 단위(기존): {legacy_only:.3f}s / 컬럼 단위(신규): {columnar_only:.3f}s / {legacy_only / columnar_only:.2f}x")
+    print(f"[CSV 포함]   셀 단위(기존): {legacy:.3f}s / 컬럼 단위(신규): {columnar:.3f}s / {legacy / columnar:.2f}x")
@@ -0,0 +1,70 @@
+"""
+TourAPI 목록 응답 JSON 디코딩 처리량 벤치마크.
+
+실행: python benchmarks/bench_json_decode.py [녹화된 응답 JSON 파일 또는 디렉터리 ...]
+인자가 없으면 1000행짜리 areaBasedList2 응답을 합성하여 사용합니다.
+"""
+import glob
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import utils  # noqa: E402
+from utils import get_api_items, decode_api_items  # noqa: E402
+
+
+def synthesize_list_response(n_rows=1000):
+    """areaBasedList2 응답 형태의 합성 JSON 바이트를 생성합니다."""
+    items = [{
+        "addr1": f"서울특별시 종로구 세종대로 {i}", "addr2": "", "areacode": "1",
+        "cat1": "A02", "cat2": "A0201", "cat3": "A02010100",
+        "contentid": str(126000 + i), "contenttypeid": "12",
+        "createdtime": "20071106000000", "modifiedtime": "20250101120000",
+        "firstimage": f"http://tong.visitkorea.or.kr/cms/resource/{i}_image2_1.jpg",
+        "firstimage2": f"http://tong.visitkorea.or.kr/cms/resource/{i}_image3_1.jpg",
+        "cpyrhtDivCd": "Type3", "mapx": "126.9769930325", "mapy": "37.5788222356",
+        "mlevel": "6", "sigungucode": "23", "tel": "02-3700-3900",
+        "title": f"관광지 {i}", "zipcode": "03045",
+        "lDongRegnCd": "11", "lDongSignguCd": "110",
+        "lclsSystm1": "HS", "lclsSystm2": "HS01", "lclsSystm3": "HS010100",
+    } for i in range(n_rows)]
+    body = {"items": {"item": items}, "numOfRows": n_rows, "pageNo": 1, "totalCount": n_rows}
+    envelope = {"response": {"header": {"resultCode": "0000", "resultMsg": "OK"}, "body": body}}
+    return json.dumps(envelope, ensure_ascii=False).encode("utf-8")
+
+
+def load_payloads(paths):
+    files = []
+    for path in paths:
+        files.extend(sorted(glob.glob(os.path.join(path, "*.json"))) if os.path.isdir(path) else [path])
+    payloads = []
+    for file_path in files:
+        with open(file_path, "rb") as f:
+            payloads.append(f.read())
+    return payloads
+
+
+def measure(label, decode, payloads, rounds=20):
+    total_items = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for payload in payloads:
+            total_items += len(decode(payload))
+    elapsed = time.perf_counter() - start
+    total_mb = sum(len(p) for p in payloads) * rounds / 1e6
+    print(f"{label:<22} {elapsed:7.3f}s  {total_items / elapsed:12,.0f} items/s  {total_mb / elapsed:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    payloads = load_payloads(sys.argv[1:]) if len(sys.argv) > 1 else [synthesize_list_response()]
+    print(f"payloads: {len(payloads)}개, 총 {sum(len(p) for p in payloads) / 1e6:.2f} MB, 기본 백엔드: {utils.JSON_BACKEND}")
+
+    measure("json (stdlib)", lambda b: get_api_items(json.loads(b)), payloads)
+    if utils.orjson is not None:
+        measure("orjson", lambda b: get_api_items(utils.orjson.loads(b)), payloads)
+    if utils.msgspec is not None:
+        generic = utils.msgspec.json.Decoder()
+        measure("msgspec (dict)", lambda b: get_api_items(generic.decode(b)), payloads)
+        measure("msgspec (TourItem)", lambda b: decode_api_items(b, typed=True), payloads)
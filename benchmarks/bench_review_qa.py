@@ -0,0 +1,71 @@
+"""
+후기 기반 챗봇 벤치마크 (전체 본문을 프롬프트로 보내기 vs TF-IDF로 고른 문단만 보내기).
+
+bench_blog_summary.py의 스텁 LLM 서버를 사용하여 프롬프트 크기, 색인 생성/검색 시간,
+첫 토큰까지 시간과 전체 시간을 비교합니다.
+실행: python benchmarks/bench_review_qa.py [후기 수]
+"""
+import os
+import sys
+import time
+import random
+import threading
+from http.server import ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bench_blog_summary import StubLLMHandler, measure_sync  # noqa: E402
+
+QUESTIONS = ["주차하기 편한가요?", "유모차 끌고 가기 괜찮나요?", "비 오는 날 가도 괜찮을까요?"]
+TOPICS = [
+    "주차장이 넓고 주차비도 저렴해서 편했어요.", "유모차 끌고 다니기 좋게 길이 평평했어요.", "비 오는 날에는 돌길이 미끄러워 조심해야 해요.",
+    "해 질 무렵 야경이 정말 예뻤어요.", "화장실이 깨끗하고 수유실도 있었어요.", "입장료는 무료였고 해설 프로그램도 있었어요.",
+    "근처 카페 라떼가 맛있어서 다음에도 들를 거예요.", "주말 오후에는 사람이 너무 많아 대기가 길었어요.",
+]
+
+
+def make_reviews(n_posts):
+    rng = random.Random(0)
+    return [
+        {"content": "\n".join(f"{rng.choice(TOPICS)} 후기 {i}의 {j}번째 이야기입니다." for j in range(80))}
+        for i in range(n_posts)
+    ]
+
+
+def legacy_answer_stream(gpt, question, reviews):
+    full_text = "".join(f"--- 블로그 후기 {i+1} ---\n\n{review['content']}\n\n" for i, review in enumerate(reviews))
+    full = ""
+    for chunk in gpt.stream(f"다음 후기 모음만 근거로 답변해주세요.\n{full_text}\n질문: {question}"):
+        full += chunk.content
+        yield full
+
+
+def main():
+    n_posts = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    from langchain_openai import ChatOpenAI
+    import modules.naver_search.search as search
+    from modules.naver_search.review_retrieval import get_review_index
+
+    reviews = make_reviews(n_posts)
+    started = time.perf_counter()
+    index = get_review_index(reviews)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"후기 {n_posts}개, 본문 {index.total_chars}자, 문단 {len(index.passages)}개, 색인 생성 {build_ms:.1f}ms")
+
+    gpt = ChatOpenAI(temperature=0, model_name="gpt-4.1-mini")
+    for question in QUESTIONS:
+        started = time.perf_counter()
+        passages = index.search(question)
+        search_ms = (time.perf_counter() - started) * 1000
+        print(f"\n질문: {question}  (검색 {search_ms:.2f}ms, 발췌 {sum(len(text) for _, text in passages)}자)")
+        measure_sync("전체 본문 (기존)", legacy_answer_stream(gpt, question, reviews))
+        measure_sync("관련 문단만", search.answer_question_from_reviews_stream(question, reviews))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
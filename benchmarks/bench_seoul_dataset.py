@@ -0,0 +1,118 @@
+"""
+서울시 관광지 데이터셋 표현 방식 벤치마크 (raw/processed dict 리스트 vs 컬럼형 DataFrame).
+
+메모리 사용량과 언어 선택/중복 제거/카테고리 필터 시간을 비교합니다.
+실행: python benchmarks/bench_seoul_dataset.py [관광지 수]
+"""
+import gc
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from modules.seoul_search.seoul_api import build_seoul_frame  # noqa: E402
+from modules.seoul_search.index import SeoulIndex  # noqa: E402
+
+LANGUAGES = ["ko", "en", "ja", "zh-CN", "zh-TW"]
+TAGS = ["관광", "명소", "유적", "문화", "미술관", "박물관", "전시", "공원", "체육", "시장", "카페", "맛집", "산책", "둘레길", "야경"]
+CATEGORY_KEYWORDS = {
+    "관광지": ["관광", "명소", "유적"],
+    "문화시설": ["문화", "미술관", "박물관", "전시", "갤러리", "도서관"],
+    "레포츠": ["레포츠", "스포츠", "공원", "체육"],
+    "음식점": ["음식점", "맛집", "식당", "카페"],
+}
+
+
+def make_rows(n_places):
+    """TbVwAttractions 응답을 흉내 낸 합성 row를 생성합니다. (관광지마다 언어별 row)"""
+    rng = random.Random(0)
+    rows = []
+    for i in range(n_places):
+        tags = ",".join(rng.sample(TAGS, 3))
+        for lang in LANGUAGES:
+            rows.append({
+                "POST_SN": f"KOP{i:06d}", "LANG_CODE_ID": lang, "POST_SJ": f"관광지 {i} ({lang})",
+                "POST_URL": f"https://korean.visitseoul.net/attractions/{i}",
+                "ADDRESS": f"서울 종로구 {i % 200}", "NEW_ADDRESS": f"서울특별시 종로구 세종대로 {i % 300}" if i % 4 else "",
+                "CMMN_TELNO": f"02-{i % 9000 + 1000}-0000", "CMMN_FAX": "", "CMMN_HMPG_URL": "",
+                "CMMN_USE_TIME": "09:00~18:00", "CMMN_BSNDE": "연중무휴", "CMMN_RSTDE": "매주 월요일",
+                "SUBWAY_INFO": f"{i % 9 + 1}호선", "TAG": tags, "BF_DESC": "",
+            })
+    return rows
+
+
+def legacy_process(raw_items):
+    """기존 _process_raw_items의 dict 리스트 가공 로직을 그대로 재현합니다."""
+    ko_items = [item for item in raw_items if item.get('LANG_CODE_ID') == 'ko']
+    items_to_process = ko_items if ko_items else list({item['POST_SN']: item for item in raw_items}.values())
+    final_items = []
+    for item in items_to_process:
+        processed_item = {
+            'contentid': item.get('POST_SN'), 'title': item.get('POST_SJ'),
+            'addr1': item.get('NEW_ADDRESS') or item.get('ADDRESS'), 'tel': item.get('CMMN_TELNO'),
+            'tags': item.get('TAG'), 'firstimage': None, 'firstimage2': None, 'mapx': None, 'mapy': None,
+        }
+        final_items.append({'raw': item, 'processed': processed_item})
+    return final_items
+
+
+def legacy_filter(items, keywords):
+    return [item for item in items if item['processed'].get('tags') and any(k in item['processed']['tags'] for k in keywords)]
+
+
+def measure_memory(build, n_places):
+    """원본 row를 만들고 build(rows)로 가공한 뒤, 원본 리스트를 버리고 남는 메모리를 잽니다."""
+    gc.collect()
+    tracemalloc.start()
+    rows = make_rows(n_places)
+    result = build(rows)
+    del rows
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def best_of(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    n_places = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"관광지 {n_places}개 x 언어 {len(LANGUAGES)}개 = row {n_places * len(LANGUAGES)}개")
+
+    legacy_items, legacy_bytes = measure_memory(legacy_process, n_places)
+    frame, frame_bytes = measure_memory(build_seoul_frame, n_places)
+    print(f"메모리: dict 리스트 {legacy_bytes / 2**20:.1f} MB, DataFrame {frame_bytes / 2**20:.1f} MB")
+
+    rows = make_rows(n_places)
+    print(f"언어 선택/중복 제거: dict 리스트 {best_of(lambda: legacy_process(rows), 3) * 1000:.1f} ms, "
+          f"DataFrame {best_of(lambda: build_seoul_frame(rows), 3) * 1000:.1f} ms")
+
+    index = SeoulIndex(frame)
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        legacy = legacy_filter(legacy_items, keywords)
+        columnar = index.search(keywords=keywords)
+        assert [item['processed']['title'] for item in legacy] == columnar.titles()
+
+        legacy_time = best_of(lambda: legacy_filter(legacy_items, keywords))
+
+        def uncached():
+            index._tag_cache.clear()
+            return index.positions_for_tags(keywords)
+
+        cold_time = best_of(uncached)
+        warm_time = best_of(lambda: index.search(keywords=keywords))
+        print(f"[{category}] {len(columnar)}건 - dict 리스트 {legacy_time * 1000:.2f} ms, "
+              f"컬럼형(캐시 없음) {cold_time * 1000:.3f} ms, 컬럼형(캐시) {warm_time * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
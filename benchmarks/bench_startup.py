@@ -0,0 +1,79 @@
+"""
+앱 시작 시간 벤치마크 (python -X importtime -c "import app").
+
+`import app`은 모든 탭을 구성하므로 서버가 요청을 받기 전까지 걸리는 시간과 거의 같습니다.
+대부분은 gradio import(pandas 포함)이고 그 시간은 환경마다 크게 다르므로, 같은 실행에서 잰
+gradio 시간을 뺀 앱 자체 시간(탭 구성과 앱 모듈 import)을 예산과 비교합니다.
+여러 번 실행해 앱 자체 시간이 가장 짧은 실행을 사용하고, 처음 사용할 때 불러오도록 미룬 무거운
+모듈이 시작 시점에 다시 import되면 실패(exit 1)로 처리하여 회귀를 잡습니다.
+실행: python benchmarks/bench_startup.py [반복 횟수]
+"""
+import os
+import re
+import sys
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+BASELINE_MODULE = "gradio"  # 앱과 무관하게 항상 치르는 import (pandas도 gradio가 불러옴)
+# gradio를 뺀 앱 자체 시작 시간 예산 (ms). 1 CPU 환경에서 1.0~1.45s로 측정되어 여유를 두었습니다.
+APP_BUDGET_MS = float(os.getenv("STARTUP_APP_BUDGET_MS", 2000))
+# 시작 시점에 import되면 안 되는 모듈 (각 기능을 처음 사용할 때 불러옴)
+DEFERRED_MODULES = ["langchain_openai", "openai", "nltk", "sklearn", "scipy", "matplotlib", "playwright"]
+TOP_N = 12
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def measure_once():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=ROOT, capture_output=True, text=True, timeout=300,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import app 실패:\n{result.stderr[-2000:]}")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return modules
+
+
+def app_ms(modules):
+    """import app 전체에서 gradio import를 뺀 시간 (ms)"""
+    return (modules["app"][1] - modules.get(BASELINE_MODULE, (0, 0, 0))[1]) / 1000
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    measurements = [measure_once() for _ in range(runs)]
+    best = min(measurements, key=app_ms)
+    total_ms = best["app"][1] / 1000
+    own_ms = app_ms(best)
+
+    # app이 직접 불러온 모듈(들여쓰기 1단계) 중 오래 걸린 것
+    direct = sorted(((cumulative, name) for name, (_, cumulative, depth) in best.items() if depth == 1), reverse=True)
+    print(f"import app: {total_ms:.0f}ms = {BASELINE_MODULE} {total_ms - own_ms:.0f}ms + 앱 자체 {own_ms:.0f}ms "
+          f"(앱 자체 최소, {runs}회)  예산 {APP_BUDGET_MS:.0f}ms")
+    print(f"  app 자체(탭 구성): {best['app'][0] / 1000:.0f}ms")
+    for cumulative, name in direct[:TOP_N]:
+        print(f"  {name:<50} {cumulative / 1000:8.1f}ms")
+
+    loaded = [name for name in DEFERRED_MODULES if name in best]
+    failed = False
+    if loaded:
+        print(f"실패: 시작 시점에 import된 지연 대상 모듈: {', '.join(loaded)}")
+        failed = True
+    if own_ms > APP_BUDGET_MS:
+        print(f"실패: 앱 자체 시작 시간이 예산을 초과했습니다. ({own_ms:.0f}ms > {APP_BUDGET_MS:.0f}ms)")
+        failed = True
+    if not failed:
+        print("통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
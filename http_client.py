@@ -0,0 +1,154 @@
+import os
+import threading
+import time
+
+import requests
+import requests.adapters
+import urllib3
+from urllib3.connection import HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# --- 업스트림별 커넥션 풀 설정 (환경 변수로 조정 가능) ---
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+def _env_bool(name, default):
+    value = os.getenv(name)
+    return default if value is None else value.strip().lower() not in ("0", "false", "no")
+
+CLIENT_CONFIGS = {
+    # TourAPI 서버는 낮은 보안 레벨의 암호화 스위트만 지원하므로 SECLEVEL=1 컨텍스트를 사용합니다.
+    "tourapi": {"pool_maxsize": _env_int("TOURAPI_POOL_MAXSIZE", 16), "ssl_ciphers": "DEFAULT@SECLEVEL=1"},
+    "naver": {"pool_maxsize": _env_int("NAVER_POOL_MAXSIZE", 16)},
+    "seoul": {"pool_maxsize": _env_int("SEOUL_POOL_MAXSIZE", 8)},
+    "default": {"pool_maxsize": _env_int("DEFAULT_POOL_MAXSIZE", 10)},
+}
+POOL_BLOCK = _env_bool("HTTP_POOL_BLOCK", False)  # True면 pool_maxsize를 넘는 요청은 빈 연결을 기다립니다.
+KEEP_ALIVE = _env_bool("HTTP_KEEP_ALIVE", True)
+
+# --- 풀 텔레메트리 ---
+class PoolTelemetry:
+    """한 세션의 연결 생성, 재사용, 대기 시간, TLS 핸드셰이크 횟수를 집계합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_handshake(self):
+        with self._lock:
+            self.tls_handshakes += 1
+
+    def record_queue_wait(self, seconds):
+        with self._lock:
+            self.queue_wait_total += seconds
+            self.queue_wait_max = max(self.queue_wait_max, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            reused = max(self.requests - self.connections_opened, 0)
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+                "tls_handshakes": self.tls_handshakes,
+                "queue_wait_avg_ms": round(self.queue_wait_total / self.requests * 1000, 3) if self.requests else 0.0,
+                "queue_wait_max_ms": round(self.queue_wait_max * 1000, 3),
+            }
+
+class _TelemetryHTTPSConnectionMixin:
+    telemetry = None
+
+    def connect(self):
+        super().connect()
+        self.telemetry.record_handshake()
+
+class _TelemetryPoolMixin:
+    telemetry = None
+
+    def _new_conn(self):
+        self.telemetry.record_connection()
+        return super()._new_conn()
+
+    def _get_conn(self, timeout=None):
+        start = time.perf_counter()
+        try:
+            return super()._get_conn(timeout=timeout)
+        finally:
+            self.telemetry.record_queue_wait(time.perf_counter() - start)
+
+def _instrumented_pool_classes(telemetry):
+    https_connection_cls = type(
+        "TelemetryHTTPSConnection", (_TelemetryHTTPSConnectionMixin, HTTPSConnection), {"telemetry": telemetry}
+    )
+    http_pool_cls = type(
+        "TelemetryHTTPConnectionPool", (_TelemetryPoolMixin, HTTPConnectionPool), {"telemetry": telemetry}
+    )
+    https_pool_cls = type(
+        "TelemetryHTTPSConnectionPool", (_TelemetryPoolMixin, HTTPSConnectionPool),
+        {"telemetry": telemetry, "ConnectionCls": https_connection_cls},
+    )
+    return {"http": http_pool_cls, "https": https_pool_cls}
+
+class PooledAdapter(requests.adapters.HTTPAdapter):
+    """풀 크기/암호화 스위트를 설정하고 텔레메트리를 수집하는 HTTPAdapter."""
+
+    def __init__(self, telemetry, ssl_ciphers=None, **kwargs):
+        self.telemetry = telemetry
+        self.ssl_ciphers = ssl_ciphers
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.ssl_ciphers:
+            kwargs['ssl_context'] = urllib3.util.ssl_.create_urllib3_context(ciphers=self.ssl_ciphers)
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _instrumented_pool_classes(self.telemetry)
+
+    def send(self, request, **kwargs):
+        self.telemetry.record_request()
+        return super().send(request, **kwargs)
+
+# --- 세션 팩토리 ---
+_sessions = {}
+_telemetry = {}
+_sessions_lock = threading.Lock()
+
+def create_session(name, pool_maxsize=10, ssl_ciphers=None, pool_block=POOL_BLOCK, keep_alive=KEEP_ALIVE):
+    """업스트림 하나를 위한 풀링 세션을 생성합니다."""
+    telemetry = PoolTelemetry()
+    adapter = PooledAdapter(
+        telemetry, ssl_ciphers=ssl_ciphers,
+        pool_connections=4, pool_maxsize=pool_maxsize, pool_block=pool_block,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+    _telemetry[name] = telemetry
+    return session
+
+def get_session(name="default"):
+    """이름별로 공유되는 풀링 세션을 반환합니다. (최초 호출 시 생성)"""
+    with _sessions_lock:
+        if name not in _sessions:
+            config = CLIENT_CONFIGS.get(name, CLIENT_CONFIGS["default"])
+            _sessions[name] = create_session(name, **config)
+        return _sessions[name]
+
+def get_pool_telemetry():
+    """업스트림별 풀 텔레메트리 스냅샷을 반환합니다."""
+    return {name: telemetry.snapshot() for name, telemetry in _telemetry.items()}
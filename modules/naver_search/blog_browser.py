@@ -0,0 +1,157 @@
+import os
+import asyncio
+import threading
+
+from .blog_extractor import CONTENT_SELECTORS, clean_image_urls
+
+# --- 브라우저 설정 (환경 변수로 조정 가능) ---
+MAX_CONTEXTS = int(os.getenv("NAVER_SCRAPE_CONCURRENCY", 3))  # 동시에 여는 브라우저 컨텍스트(탭) 수
+URL_DEADLINE_SECONDS = float(os.getenv("NAVER_SCRAPE_DEADLINE_SECONDS", 25))  # URL 하나에 허용하는 전체 시간
+# Playwright가 받은 Chromium 대신 시스템에 설치된 Chromium/Chrome을 쓸 때 실행 파일 경로를 지정합니다.
+CHROMIUM_EXECUTABLE_PATH = os.getenv("NAVER_SCRAPE_CHROMIUM_PATH") or None
+NAVIGATION_TIMEOUT_MS = 20000
+SELECTOR_TIMEOUT_MS = 5000
+
+# 본문 텍스트와 이미지 주소(속성)만 필요하므로 실제 리소스는 받지 않습니다.
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet", "ping"}
+BLOCKED_HOST_KEYWORDS = ("googletagmanager", "google-analytics", "doubleclick", "nelo", "veta.naver.com", "adpost")
+
+# 네이버 블로그는 lazy loading을 사용하므로 data-lazy-src, data-src, src 순으로 확인
+IMAGE_SOURCES_JS = "imgs => imgs.map(img => img.getAttribute('data-lazy-src') || img.getAttribute('data-src') || img.getAttribute('src'))"
+
+class SharedBlogBrowser:
+    """블로그 스크래핑용 Chromium 하나를 공유하는 브라우저 풀.
+
+    URL마다 브라우저를 띄우지 않고, 전용 이벤트 루프 스레드에서 한 번 띄운 브라우저에
+    URL별 컨텍스트만 새로 만듭니다. 동시에 열 수 있는 컨텍스트 수는 세마포어로 제한하고,
+    이미지/폰트/광고 요청은 차단하며, URL마다 전체 제한 시간을 둡니다.
+    """
+
+    def __init__(self, max_contexts=MAX_CONTEXTS, deadline_seconds=URL_DEADLINE_SECONDS):
+        self.max_contexts = max_contexts
+        self.deadline_seconds = deadline_seconds
+        self._lock = threading.Lock()
+        self._loop = None
+        self._playwright = None
+        self._browser = None
+        self._launch_lock = None
+        self._semaphore = None
+        self.pages_scraped = 0
+        self.timeouts = 0
+        self.launches = 0
+
+    # --- 이벤트 루프/브라우저 ---
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="naver-blog-browser", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    async def _get_browser(self):
+        # 루프 스레드 안에서만 호출되므로 asyncio 잠금으로 충분합니다.
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.max_contexts)
+        async with self._launch_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    from playwright.async_api import async_playwright  # 브라우저가 필요할 때만 불러옵니다.
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True, executable_path=CHROMIUM_EXECUTABLE_PATH)
+                self.launches += 1
+        return self._browser
+
+    @staticmethod
+    async def _block_non_essential(route):
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in request.url for host in BLOCKED_HOST_KEYWORDS):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    # --- 스크래핑 (루프 스레드에서 실행) ---
+    async def _extract(self, page, url):
+        await page.goto(url, wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT_MS)
+
+        main_frame = page
+        try:
+            main_frame_element = await page.wait_for_selector("iframe#mainFrame", timeout=SELECTOR_TIMEOUT_MS)
+            main_frame = await main_frame_element.content_frame() or page
+        except Exception:
+            main_frame = page
+
+        for selector in CONTENT_SELECTORS:
+            try:
+                content_element = await main_frame.wait_for_selector(selector, timeout=SELECTOR_TIMEOUT_MS)
+                if not content_element:
+                    continue
+                text_content = await content_element.inner_text()
+                if text_content.strip():
+                    # 이미지 속성은 한 번의 evaluate로 모두 가져옵니다.
+                    sources = await content_element.eval_on_selector_all("img", IMAGE_SOURCES_JS)
+                    return text_content, clean_image_urls(sources)
+            except Exception:
+                continue
+        return "", []
+
+    async def _scrape(self, url):
+        try:
+            browser = await self._get_browser()
+        except Exception as e:
+            return f"페이지에 접근하는 중 오류가 발생했습니다: {e}", []
+
+        async with self._semaphore:
+            context = None
+            try:
+                context = await browser.new_context()
+                await context.route("**/*", self._block_non_essential)
+                page = await context.new_page()
+                text_content, image_urls = await asyncio.wait_for(self._extract(page, url), self.deadline_seconds)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                return f"페이지에 접근하는 중 오류가 발생했습니다: {self.deadline_seconds:.0f}초 안에 본문을 가져오지 못했습니다.", []
+            except Exception as e:
+                return f"페이지에 접근하는 중 오류가 발생했습니다: {e}", []
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass
+
+        self.pages_scraped += 1
+        if not text_content.strip():
+            return "본문 내용을 찾을 수 없습니다. (지원되지 않는 블로그 구조일 수 있습니다)", []
+        return text_content, image_urls
+
+    async def _close(self):
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    # --- 공개 API ---
+    async def scrape(self, url):
+        """URL의 블로그 본문 텍스트와 이미지 URL들을 (text, image_urls)로 반환합니다. (비동기 핸들러용)"""
+        return await asyncio.wrap_future(self._submit(self._scrape(url)))
+
+    def warm_up(self, timeout=None):
+        """브라우저를 미리 실행해 두어 첫 스크래핑이 실행 시간을 기다리지 않게 합니다. (실패 시 예외)"""
+        self._submit(self._get_browser()).result(timeout)
+
+    def close(self):
+        """브라우저를 종료합니다. 다음 스크래핑 때 다시 실행됩니다."""
+        if self._loop is not None:
+            self._submit(self._close()).result()
+
+    def stats(self):
+        return {"pages_scraped": self.pages_scraped, "timeouts": self.timeouts, "launches": self.launches}
+
+blog_browser = SharedBlogBrowser()
@@ -0,0 +1,251 @@
+import os
+import time
+import json
+import sqlite3
+import threading
+
+from .blog_extractor import postview_url
+from .llm_cache import content_hash
+from .review_retrieval import is_valid_content
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "blog_corpus")
+CORPUS_PATH = os.path.join(CORPUS_DIR, "blog_corpus.sqlite3")
+# 저장된 본문을 다시 스크래핑하지 않고 그대로 쓰는 기간. 발행된 블로그 글은 거의 수정되지 않습니다.
+FRESH_SECONDS = int(os.getenv("BLOG_CORPUS_FRESH_DAYS", 30)) * 24 * 60 * 60
+SNIPPET_CHARS = 80
+# trigram 토크나이저는 3글자 이상인 검색어만 색인으로 찾을 수 있습니다. (더 짧으면 LIKE로 검색)
+MIN_FTS_TERM_CHARS = 3
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS posts ("
+    " url TEXT PRIMARY KEY, link TEXT NOT NULL, title TEXT NOT NULL DEFAULT '', bloggername TEXT NOT NULL DEFAULT '',"
+    " postdate TEXT NOT NULL DEFAULT '', content TEXT NOT NULL, image_urls TEXT NOT NULL, content_hash TEXT NOT NULL,"
+    " first_scraped_at REAL NOT NULL, scraped_at REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS post_keywords ("
+    " url TEXT NOT NULL, keyword TEXT NOT NULL, seen_at REAL NOT NULL, PRIMARY KEY (url, keyword))",
+    "CREATE INDEX IF NOT EXISTS post_keywords_keyword ON post_keywords (keyword)",
+]
+# 한국어는 띄어쓰기 단위가 검색어와 맞지 않으므로("서울숲에서") 부분 문자열을 찾는 trigram 토크나이저를 씁니다.
+_FTS_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+    " title, content, content='posts', content_rowid='rowid', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS posts_ai AFTER INSERT ON posts BEGIN"
+    " INSERT INTO posts_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS posts_ad AFTER DELETE ON posts BEGIN"
+    " INSERT INTO posts_fts (posts_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS posts_au AFTER UPDATE ON posts BEGIN"
+    " INSERT INTO posts_fts (posts_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);"
+    " INSERT INTO posts_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content); END",
+]
+
+def corpus_key(url):
+    """같은 글을 가리키는 여러 주소 형식을 하나로 맞춘 저장 키. (PostView 주소, 알 수 없는 형식이면 원래 주소)"""
+    return postview_url(url) or url
+
+def _snippet(text, terms, chars=SNIPPET_CHARS):
+    position = min((text.find(term) for term in terms if term in text), default=0)
+    start = max(position - chars // 2, 0)
+    return ("…" if start else "") + text[start:start + chars].replace("\n", " ") + ("…" if start + chars < len(text) else "")
+
+class BlogCorpus:
+    """스크래핑한 네이버 블로그 글을 글 주소 단위로 보관하는 SQLite 저장소.
+
+    - 같은 글은 검색 키워드가 달라도 한 번만 저장하고, 어떤 키워드로 검색되었는지는 post_keywords에 따로 기록합니다.
+    - 마지막 스크래핑 후 FRESH_SECONDS가 지나지 않은 글은 다시 스크래핑하지 않습니다.
+    - 본문을 찾지 못한 스크래핑 결과는 저장하지 않으므로 다음 검색 때 다시 시도됩니다.
+    - 저장된 글은 FTS5 색인으로 키워드와 무관하게 전문 검색할 수 있습니다. (search)
+    """
+
+    def __init__(self, path=CORPUS_PATH, fresh_seconds=FRESH_SECONDS):
+        self.path = path
+        self.fresh_seconds = fresh_seconds
+        self._lock = threading.Lock()
+        self._conn = None
+        self.has_fts = False
+        self.hits = 0       # 저장된 본문을 사용하여 건너뛴 스크래핑 수
+        self.misses = 0     # 새로 스크래핑한 글 수 (없거나 오래된 글)
+        self.stale = 0      # 그중 저장되어 있었지만 오래되어 다시 스크래핑한 글 수
+
+    def _connect(self):
+        # 호출자가 self._lock을 잡고 있어야 합니다.
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            try:
+                for statement in _FTS_SCHEMA:
+                    conn.execute(statement)
+                self.has_fts = True
+            except sqlite3.OperationalError as e:
+                # FTS5/trigram을 지원하지 않는 SQLite에서는 LIKE 검색으로 대신합니다.
+                print(f"[BlogCorpus] 전문 검색 색인을 만들 수 없어 LIKE 검색을 사용합니다: {e}")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    # --- 스크래핑 경로 ---
+    def get_fresh(self, urls):
+        """{원래 주소: (본문, 이미지 URL 목록)} 중 아직 신선한 것만 반환합니다."""
+        keys = {url: corpus_key(url) for url in dict.fromkeys(urls)}
+        if not keys:
+            return {}
+        # 여러 주소 형식(모바일/PostView 등)이 같은 글을 가리키면 키가 겹치므로 한 번만 조회합니다.
+        unique_keys = list(dict.fromkeys(keys.values()))
+        now = time.time()
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT url, content, image_urls, scraped_at FROM posts WHERE url IN ({','.join('?' * len(unique_keys))})",
+                unique_keys,
+            ).fetchall()
+            stored = {row["url"]: row for row in rows}
+            fresh = {}
+            for url, key in keys.items():
+                row = stored.get(key)
+                if row is not None and now - row["scraped_at"] < self.fresh_seconds:
+                    fresh[url] = (row["content"], json.loads(row["image_urls"]))
+                elif row is not None:
+                    self.stale += 1
+            self.hits += len(fresh)
+            self.misses += len(keys) - len(fresh)
+        return fresh
+
+    def record_search(self, keyword, results):
+        """검색 결과의 본문을 저장하고 각 글을 키워드와 연결합니다.
+
+        results: (네이버 검색 결과 항목, 본문, 이미지 URL 목록, 이번에 스크래핑했는지 여부) 목록.
+        본문을 찾지 못한 글(스크래핑 실패, 네이버 블로그가 아닌 글)은 저장하지 않습니다.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            for review, content, image_urls, scraped in results:
+                key = postview_url(review.get("link") or "")
+                if key is None or not is_valid_content(content):
+                    continue
+                link = review["link"]
+                digest = content_hash(content)
+                row = conn.execute("SELECT content_hash FROM posts WHERE url = ?", (key,)).fetchone()
+                if row is None:
+                    conn.execute(
+                        "INSERT INTO posts (url, link, title, bloggername, postdate, content, image_urls, content_hash,"
+                        " first_scraped_at, scraped_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (key, link, review.get("title", ""), review.get("bloggername", ""), review.get("postdate", ""),
+                         content, json.dumps(image_urls, ensure_ascii=False), digest, now, now),
+                    )
+                elif row["content_hash"] != digest:
+                    conn.execute(
+                        "UPDATE posts SET link = ?, title = ?, content = ?, image_urls = ?, content_hash = ?, scraped_at = ?"
+                        " WHERE url = ?",
+                        (link, review.get("title", ""), content, json.dumps(image_urls, ensure_ascii=False), digest, now, key),
+                    )
+                elif scraped:
+                    # 다시 스크래핑했지만 본문이 그대로이면 시각만 갱신합니다. (FTS 색인을 다시 만들지 않음)
+                    conn.execute("UPDATE posts SET scraped_at = ? WHERE url = ?", (now, key))
+                conn.execute(
+                    "INSERT OR REPLACE INTO post_keywords (url, keyword, seen_at) VALUES (?, ?, ?)", (key, keyword, now)
+                )
+            conn.commit()
+
+    # --- 분석용 조회 ---
+    def search(self, query, keyword=None, limit=20):
+        """저장된 모든 글에서 검색어(공백으로 구분된 단어 모두 포함)를 찾습니다.
+
+        keyword를 주면 그 키워드로 검색되었던 글로 좁힙니다.
+        반환: {url, link, title, postdate, keywords, snippet, scraped_at} 목록
+        """
+        terms = [term.replace('"', "") for term in (query or "").split()]
+        terms = [term for term in terms if term]
+        if not terms:
+            return []
+        keyword_filter = " AND posts.url IN (SELECT url FROM post_keywords WHERE keyword = ?)" if keyword else ""
+        keyword_args = [keyword] if keyword else []
+
+        with self._lock:
+            conn = self._connect()
+            if self.has_fts and all(len(term) >= MIN_FTS_TERM_CHARS for term in terms):
+                rows = conn.execute(
+                    "SELECT posts.* FROM posts_fts JOIN posts ON posts.rowid = posts_fts.rowid"
+                    f" WHERE posts_fts MATCH ?{keyword_filter} ORDER BY bm25(posts_fts) LIMIT ?",
+                    [" ".join(f'"{term}"' for term in terms), *keyword_args, limit],
+                ).fetchall()
+            else:
+                conditions = " AND ".join("(posts.title LIKE ? OR posts.content LIKE ?)" for _ in terms)
+                rows = conn.execute(
+                    f"SELECT posts.* FROM posts WHERE {conditions}{keyword_filter} ORDER BY posts.postdate DESC LIMIT ?",
+                    [arg for term in terms for arg in (f"%{term}%", f"%{term}%")] + keyword_args + [limit],
+                ).fetchall()
+            keywords = self._keywords_for(conn, [row["url"] for row in rows])
+        return [
+            {
+                "url": row["url"], "link": row["link"], "title": row["title"], "postdate": row["postdate"],
+                "keywords": keywords.get(row["url"], []), "snippet": _snippet(row["content"], terms),
+                "scraped_at": row["scraped_at"],
+            }
+            for row in rows
+        ]
+
+    def posts_for_keyword(self, keyword):
+        """키워드로 검색되었던 글들을 (본문 포함) 최근 글 순으로 반환합니다."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT posts.* FROM posts JOIN post_keywords ON post_keywords.url = posts.url"
+                " WHERE post_keywords.keyword = ? ORDER BY posts.postdate DESC",
+                (keyword,),
+            ).fetchall()
+        return [{**dict(row), "image_urls": json.loads(row["image_urls"])} for row in rows]
+
+    def related_keywords(self, keyword):
+        """같은 글이 함께 검색된 다른 키워드와 겹치는 글 수를 많은 순으로 반환합니다."""
+        with self._lock:
+            return [tuple(row) for row in self._connect().execute(
+                "SELECT other.keyword, COUNT(*) AS shared FROM post_keywords AS this"
+                " JOIN post_keywords AS other ON other.url = this.url AND other.keyword != this.keyword"
+                " WHERE this.keyword = ? GROUP BY other.keyword ORDER BY shared DESC",
+                (keyword,),
+            ).fetchall()]
+
+    @staticmethod
+    def _keywords_for(conn, urls):
+        if not urls:
+            return {}
+        keywords = {}
+        for url, keyword in conn.execute(
+            f"SELECT url, keyword FROM post_keywords WHERE url IN ({','.join('?' * len(urls))}) ORDER BY seen_at",
+            urls,
+        ):
+            keywords.setdefault(url, []).append(keyword)
+        return keywords
+
+    def stats(self):
+        with self._lock:
+            conn = self._connect()
+            posts = conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+            keywords = conn.execute("SELECT COUNT(DISTINCT keyword) FROM post_keywords").fetchone()[0]
+            return {
+                "posts": posts, "keywords": keywords, "hits": self.hits, "misses": self.misses, "stale": self.stale,
+                "fts": self.has_fts,
+            }
+
+blog_corpus = BlogCorpus()
+
+if __name__ == "__main__":
+    # 모듈 직접 실행 시 테스트 (python -m modules.naver_search.blog_corpus)
+    import tempfile
+
+    corpus = BlogCorpus(os.path.join(tempfile.mkdtemp(), "blog_corpus.sqlite3"))
+    review = {"title": "서울숲 후기", "link": "https://blog.naver.com/tourlens/223000000001", "postdate": "20240501"}
+    corpus.record_search("서울숲", [(review, "서울숲에서 산책하고 주차도 편했어요.", [], True)])
+
+    # 같은 글의 서로 다른 주소 형식을 한 번에 조회해도 하나의 저장 글로 찾아야 합니다.
+    spellings = [
+        "https://blog.naver.com/tourlens/223000000001",
+        "https://m.blog.naver.com/tourlens/223000000001",
+        "https://blog.naver.com/PostView.naver?blogId=tourlens&logNo=223000000001",
+    ]
+    fresh = corpus.get_fresh(spellings)
+    assert sorted(fresh) == sorted(spellings), fresh
+    assert len({content for content, _ in fresh.values()}) == 1
+    assert [row["title"] for row in corpus.search("서울숲에서")] == ["서울숲 후기"]
+    print("blog_corpus OK", corpus.stats())
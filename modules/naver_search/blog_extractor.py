@@ -0,0 +1,114 @@
+import re
+from urllib.parse import urlparse, parse_qs, urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+from http_client import get_session
+
+# --- 본문 추출 설정 ---
+REQUEST_TIMEOUT_SECONDS = 10
+POSTVIEW_URL = "https://blog.naver.com/PostView.naver?blogId={blog_id}&logNo={log_no}&redirect=Dlog&widgetTypeCall=true"
+BLOG_HOSTS = ("blog.naver.com", "m.blog.naver.com")
+# PostView는 데스크톱 브라우저 요청에만 본문 전체를 돌려주므로 일반 브라우저처럼 요청합니다.
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Referer": "https://blog.naver.com/",
+}
+
+CONTENT_SELECTORS = [
+    "div.se-main-container",
+    "div.post-view",
+    "#postViewArea",
+]
+IMAGE_SOURCE_ATTRIBUTES = ("data-lazy-src", "data-src", "src")  # 네이버 블로그는 lazy loading을 사용하므로 이 순서로 확인
+
+_LOG_NO_RE = re.compile(r"^\d+$")
+
+def clean_image_urls(sources):
+    """이미지 주소 목록에서 사용할 원본 주소만 순서대로 중복 없이 반환합니다."""
+    image_urls = []
+    for src in sources:
+        if src and src.startswith("http") and "storep-phinf.pstatic.net" not in src:
+            # 썸네일 파라미터(?type=...)를 제거하여 원본 이미지 URL 확보
+            cleaned_src = src.split("?")[0]
+            if cleaned_src not in image_urls:
+                image_urls.append(cleaned_src)
+    return image_urls
+
+def postview_url(url):
+    """블로그 글 주소에서 본문 iframe(PostView) 주소를 만듭니다. 알 수 없는 형식이면 None."""
+    parsed = urlparse(url)
+    if parsed.hostname not in BLOG_HOSTS:
+        return None
+
+    query = parse_qs(parsed.query)
+    blog_id, log_no = query.get("blogId", [None])[0], query.get("logNo", [None])[0]
+    if not (blog_id and log_no):
+        # https://blog.naver.com/{blogId}/{logNo}
+        parts = [part for part in parsed.path.split("/") if part]
+        if len(parts) == 2 and _LOG_NO_RE.match(parts[1]):
+            blog_id, log_no = parts
+    if not (blog_id and log_no):
+        return None
+    return POSTVIEW_URL.format(blog_id=blog_id, log_no=log_no)
+
+def _element_text(element):
+    # 스마트에디터 글은 문단 단위로, 예전 에디터 글은 블록 단위로 줄을 나눕니다.
+    paragraphs = element.select(".se-text-paragraph")
+    if paragraphs:
+        lines = (paragraph.get_text("", strip=False).strip() for paragraph in paragraphs)
+    else:
+        lines = element.get_text("\n", strip=True).splitlines()
+    return "\n".join(line for line in lines if line)
+
+def _extract_content(soup):
+    for selector in CONTENT_SELECTORS:
+        element = soup.select_one(selector)
+        if element is None:
+            continue
+        text_content = _element_text(element)
+        if text_content.strip():
+            sources = [
+                next((img.get(attribute) for attribute in IMAGE_SOURCE_ATTRIBUTES if img.get(attribute)), None)
+                for img in element.find_all("img")
+            ]
+            return text_content, clean_image_urls(sources)
+    return "", []
+
+def parse_blog_html(html):
+    """PostView HTML에서 (본문 텍스트, 이미지 URL 목록)을 추출합니다. 본문이 없으면 ("", [])."""
+    return _extract_content(BeautifulSoup(html, "html.parser"))
+
+def _fetch_html(url):
+    response = get_session("naver").get(url, headers=REQUEST_HEADERS, timeout=REQUEST_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    if not response.encoding or response.encoding.lower() == "iso-8859-1":
+        response.encoding = "utf-8"
+    return response.text
+
+def extract_blog_post(url):
+    """브라우저 없이 HTTP 요청만으로 블로그 본문과 이미지 URL을 가져옵니다.
+
+    PostView 주소를 알 수 있으면 바로 요청하고, 아니면 글 페이지의 iframe#mainFrame 주소를 따라갑니다.
+    본문을 찾지 못하거나 요청이 실패하면 None을 반환하므로, 호출하는 쪽에서 브라우저로 다시 시도합니다.
+    """
+    try:
+        target = postview_url(url)
+        if target is None:
+            outer = BeautifulSoup(_fetch_html(url), "html.parser")
+            frame = outer.select_one("iframe#mainFrame")
+            if frame is None or not frame.get("src"):
+                # iframe이 없는 글(모바일 페이지 등)은 받은 페이지에서 바로 찾습니다.
+                text_content, image_urls = _extract_content(outer)
+                return (text_content, image_urls) if text_content else None
+            target = urljoin(url, frame["src"])
+
+        text_content, image_urls = parse_blog_html(_fetch_html(target))
+    except requests.exceptions.RequestException as e:
+        print(f"블로그 본문 HTTP 요청 실패 ({url}): {e}")
+        return None
+    except Exception as e:
+        print(f"블로그 본문 파싱 중 오류 ({url}): {e}")
+        return None
+    return (text_content, image_urls) if text_content else None
@@ -0,0 +1,372 @@
+import os
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from http_client import get_session
+from utils import SingleFlight, request_key
+from .trend_store import trend_store
+
+DATALAB_URL = "https://openapi.naver.com/v1/datalab/search"
+
+# 데이터랩 트렌드 API
+NAVER_TREND_CLIENT_ID = os.getenv("NAVER_TREND_CLIENT_ID")
+NAVER_TREND_CLIENT_SECRET = os.getenv("NAVER_TREND_CLIENT_SECRET")
+
+MAX_GROUPS_PER_REQUEST = 5  # datalab/search가 한 번에 받는 keywordGroups 최대 개수
+# 기간이 다른 요청을 하나로 묶을 때, 각 요청의 기간보다 늘어나도 되는 최대 일수
+MAX_WINDOW_SLACK_DAYS = int(os.getenv("DATALAB_MAX_WINDOW_SLACK_DAYS", 60))
+
+TIME_UNIT = "date"
+VOLATILE_DAYS = 2  # 최근 며칠의 값은 아직 바뀔 수 있으므로 저장하지 않고 매번 새로 받음
+ALIGN_OVERLAP_DAYS = 7  # 새 구간을 저장된 값과 같은 기준으로 맞출 때 겹쳐 받을 일수
+# 저장된 구간 앞/뒤의 요청을 저장된 구간까지 이어 받을 때 허용하는 최대 빈 일수.
+# 더 멀리 떨어진 요청은 그 기간만 받아 저장하지 않고 바로 반환합니다.
+MAX_BRIDGE_DAYS = int(os.getenv("DATALAB_MAX_BRIDGE_DAYS", 30))
+
+# 인기 순위 계산 시 모든 묶음에 함께 넣는 기준 키워드 (너무 인기 있거나 없지 않은 키워드가 좋음)
+DEFAULT_RANKING_ANCHOR = os.getenv("DATALAB_RANKING_ANCHOR", "서울숲")
+RANKING_WORKERS = 4
+
+# 같은 묶음 요청이 동시에 들어오면 하나의 호출로 합칩니다.
+datalab_flight = SingleFlight("datalab")
+
+# --- 묶음 계획 ---
+def plan_trend_batches(trend_requests, max_groups=MAX_GROUPS_PER_REQUEST, slack_days=MAX_WINDOW_SLACK_DAYS):
+    """(keyword, start_date, end_date) 요청 목록을 datalab 호출 단위로 묶습니다.
+
+    기간이 같은 요청은 그대로, 기간이 다른 요청은 둘을 모두 덮는 기간이 각 요청 기간보다
+    slack_days 이상 길어지지 않을 때만 같은 호출에 넣습니다. 한 호출의 서로 다른 키워드는
+    max_groups개를 넘지 않습니다.
+    반환값: [(start_date, end_date, [요청 인덱스, ...]), ...]
+    """
+    order = sorted(range(len(trend_requests)), key=lambda i: (trend_requests[i][1], trend_requests[i][2]))
+    batches = []
+    current = None  # [start, end, indexes, keywords, shortest_span_days]
+
+    for i in order:
+        keyword, start, end = trend_requests[i]
+        span = (end - start).days
+        if current is not None:
+            cover_start, cover_end = min(current[0], start), max(current[1], end)
+            cover_span = (cover_end - cover_start).days
+            fits_window = cover_span <= min(current[4], span) + slack_days
+            fits_groups = keyword in current[3] or len(current[3]) < max_groups
+            if fits_window and fits_groups:
+                current[0], current[1] = cover_start, cover_end
+                current[2].append(i)
+                current[3].add(keyword)
+                current[4] = min(current[4], span)
+                continue
+            batches.append((current[0], current[1], current[2]))
+        current = [start, end, [i], {keyword}, span]
+
+    if current is not None:
+        batches.append((current[0], current[1], current[2]))
+    return batches
+
+# --- API 호출 ---
+def _post_datalab(start_date, end_date, keywords, time_unit="date"):
+    """키워드 묶음(최대 5개)의 트렌드를 한 번에 조회하여 {keyword: data}를 반환합니다."""
+    headers = {
+        "X-Naver-Client-Id": NAVER_TREND_CLIENT_ID,
+        "X-Naver-Client-Secret": NAVER_TREND_CLIENT_SECRET,
+        "Content-Type": "application/json"
+    }
+    body = {
+        "startDate": start_date.strftime("%Y-%m-%d"),
+        "endDate": end_date.strftime("%Y-%m-%d"),
+        "timeUnit": time_unit,
+        "keywordGroups": [{"groupName": keyword, "keywords": [keyword]} for keyword in keywords]
+    }
+    response = get_session("naver").post(DATALAB_URL, headers=headers, data=json.dumps(body))
+    response.raise_for_status()
+    return {result.get('title'): result.get('data') or [] for result in response.json().get('results', [])}
+
+def fetch_trend_batch(start_date, end_date, keywords, time_unit="date"):
+    """_post_datalab의 결과를 동일 요청끼리 공유합니다. 실패하면 None."""
+    if not NAVER_TREND_CLIENT_ID or not NAVER_TREND_CLIENT_SECRET:
+        print("네이버 트렌드 API 인증 정보가 .env 파일에 설정되지 않았습니다.")
+        return None
+
+    key = request_key("datalab", tuple(keywords), str(start_date), str(end_date), time_unit)
+    try:
+        return datalab_flight.do(key, _post_datalab, start_date, end_date, list(keywords), time_unit)
+    except requests.exceptions.RequestException as e:
+        print(f"네이버 트렌드 API 호출 오류: {e}")
+    except Exception as e:
+        print(f"트렌드 데이터 처리 중 오류: {e}")
+    return None
+
+def rescale_window(points, start_date, end_date):
+    """묶음 응답에서 [start_date, end_date] 구간만 잘라, 그 구간 최댓값이 100이 되도록 다시 맞춥니다.
+
+    datalab의 ratio는 한 요청 안에서 (모든 키워드, 전체 기간 중) 최댓값 기준 상대값이므로,
+    구간 최댓값으로 나누면 해당 키워드만 해당 기간으로 단독 요청한 것과 같은 값이 됩니다.
+    """
+    start, end = start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+    window = [point for point in points if start <= point['period'] <= end]
+    if not window:
+        return None
+    peak = max(float(point['ratio']) for point in window)
+    if peak <= 0:
+        return [dict(point) for point in window]
+    return [{'period': point['period'], 'ratio': round(float(point['ratio']) * 100 / peak, 5)} for point in window]
+
+def fetch_trends(trend_requests):
+    """여러 (keyword, start_date, end_date) 요청의 트렌드를 최소한의 datalab 호출로 가져옵니다.
+
+    반환값은 요청 순서대로의 리스트이며, 결과가 없는 요청은 None입니다.
+    """
+    results = [None] * len(trend_requests)
+    for start, end, indexes in plan_trend_batches(trend_requests):
+        keywords = list(dict.fromkeys(trend_requests[i][0] for i in indexes))
+        batch = fetch_trend_batch(start, end, keywords)
+        if not batch:
+            continue
+        for i in indexes:
+            keyword, req_start, req_end = trend_requests[i]
+            results[i] = rescale_window(batch.get(keyword) or [], req_start, req_end)
+    return results
+
+# --- 저장소를 이용한 점진 조회 ---
+def _days(start_date, end_date):
+    return [start_date + timedelta(days=n) for n in range((end_date - start_date).days + 1)]
+
+def _plan_missing_fetch(keyword, windows, stable_until):
+    """키워드의 요청 기간들 중 저장소에 없는 날짜를 찾아, 한 번에 받을 조회 기간을 정합니다.
+
+    이미 저장된 값이 있으면 기준을 맞출 수 있도록 저장된 날짜와 ALIGN_OVERLAP_DAYS만큼 겹치게
+    조회 기간을 넓힙니다. 요청 기간 밖으로는 저장된 구간 쪽으로만 넓히며, 요청 기간은 줄이지 않습니다.
+    반환값: (시작일, 종료일, 저장 여부). 받을 것이 없으면 None.
+    저장된 구간과 MAX_BRIDGE_DAYS 넘게 떨어진 요청(앞이든 뒤든)은 그 기간만 받고 저장하지 않습니다.
+    (이어 받으면 한 번의 일 단위 조회가 수년에 걸쳐, 전체 최댓값 기준으로 요청 기간의 정밀도가 떨어집니다.)
+    """
+    need_start = min(start for start, _ in windows)
+    need_end = max(end for _, end in windows)
+    stored = trend_store.get_series(keyword, TIME_UNIT, need_start.isoformat(), need_end.isoformat())
+
+    missing = sorted({
+        day for start, end in windows for day in _days(start, end)
+        if day > stable_until or day.isoformat() not in stored
+    })
+    if not missing:
+        return None
+
+    fetch_start, fetch_end = missing[0], missing[-1]
+    first_stored, last_stored = trend_store.bounds(keyword, TIME_UNIT)
+    if first_stored:
+        first_stored, last_stored = date.fromisoformat(first_stored), date.fromisoformat(last_stored)
+        overlap = timedelta(days=ALIGN_OVERLAP_DAYS - 1)
+        if fetch_end < first_stored:  # 저장된 구간보다 앞
+            if (first_stored - fetch_end).days > MAX_BRIDGE_DAYS:
+                return fetch_start, fetch_end, False
+            fetch_end = min(first_stored + overlap, last_stored)  # 뒤쪽으로 이어 붙임
+        elif fetch_start > last_stored:  # 저장된 구간보다 뒤: 앞쪽으로 이어 붙임
+            if (fetch_start - last_stored).days > MAX_BRIDGE_DAYS:
+                return fetch_start, fetch_end, False
+            fetch_start = max(last_stored - overlap, first_stored)
+        else:  # 저장된 구간과 걸침: 저장된 구간 안쪽에 있는 끝만 겹치도록 넓힘
+            if fetch_start >= first_stored:
+                fetch_start = max(fetch_start - overlap, first_stored)
+            if fetch_end <= last_stored:
+                fetch_end = min(fetch_end + overlap, last_stored)
+    return fetch_start, fetch_end, True
+
+def _align_factor(stored, fetched):
+    """겹치는 날짜의 합 비율로, 새로 받은 값을 저장된 기준에 맞추는 배율을 구합니다."""
+    overlap = [period for period in fetched if period in stored]
+    if not overlap:
+        return None
+    stored_sum = sum(stored[period] for period in overlap)
+    fetched_sum = sum(fetched[period] for period in overlap)
+    if stored_sum <= 0 or fetched_sum <= 0:
+        return None
+    return stored_sum / fetched_sum
+
+def _merge_fetched(keyword, fetch_start, fetch_end, points, stable_until, store=True):
+    """받은 구간을 저장소 기준에 맞춰 저장하고, 확정되지 않은 최근 날짜 값은 따로 반환합니다.
+
+    기준을 맞출 수 없으면(겹치는 값이 모두 0 등) None을 반환하여 전체를 다시 받게 합니다.
+    store가 False이면 저장하지 않고 받은 값을 모두 그대로 반환합니다.
+    """
+    fetched = {day.isoformat(): 0.0 for day in _days(fetch_start, fetch_end)}  # 응답에 없는 날짜는 0
+    fetched.update({point['period']: float(point['ratio']) for point in points or []})
+    if not store:
+        return fetched
+
+    stored = trend_store.get_series(keyword, TIME_UNIT, fetch_start.isoformat(), fetch_end.isoformat())
+    if trend_store.bounds(keyword, TIME_UNIT)[0] is None:
+        factor = 1.0
+    else:
+        factor = _align_factor(stored, fetched)
+        if factor is None:
+            return None
+
+    stable_key = stable_until.isoformat()
+    scaled = {period: ratio * factor for period, ratio in fetched.items()}
+    trend_store.put_series(keyword, TIME_UNIT, {p: r for p, r in scaled.items() if p <= stable_key and p not in stored})
+    return {p: r for p, r in scaled.items() if p > stable_key}
+
+def get_naver_trends(trend_requests, use_store=True):
+    """여러 (keyword, start_date, end_date) 요청의 트렌드를 반환합니다. (요청 순서대로, 없으면 None)
+
+    지난 날짜의 값은 바뀌지 않으므로 로컬 저장소에 쌓아 두고, 저장소에 없는 날짜와
+    아직 확정되지 않은 최근 VOLATILE_DAYS일만 datalab에서 받아 합칩니다.
+    각 결과는 요청 기간 안의 최댓값이 100이 되도록 맞춰 반환합니다.
+    """
+    if not use_store:
+        return fetch_trends(trend_requests)
+
+    stable_until = date.today() - timedelta(days=VOLATILE_DAYS)
+    windows_by_keyword = {}
+    for keyword, start, end in trend_requests:
+        windows_by_keyword.setdefault(keyword, []).append((start, end))
+
+    # 1. 키워드별로 저장소에 없는 구간을 계산하여 한 번에 (5개씩 묶어) 조회
+    fetch_plan = {}
+    for keyword, windows in windows_by_keyword.items():
+        planned = _plan_missing_fetch(keyword, windows, stable_until)
+        if planned:
+            fetch_plan[keyword] = planned
+    fetch_keys = list(fetch_plan)
+    fetched = fetch_trends([(keyword, *fetch_plan[keyword][:2]) for keyword in fetch_keys])
+
+    # 2. 받은 값을 저장소 기준에 맞춰 합치고, 기준을 맞출 수 없는 키워드는 전체 기간을 다시 받음
+    volatile = {}
+    failed = set()
+    reset_keys = []
+    for keyword, points in zip(fetch_keys, fetched):
+        if points is None:
+            failed.add(keyword)
+            continue
+        fetch_start, fetch_end, store = fetch_plan[keyword]
+        recent = _merge_fetched(keyword, fetch_start, fetch_end, points, stable_until, store=store)
+        if recent is None:
+            reset_keys.append(keyword)
+        else:
+            volatile[keyword] = recent
+
+    if reset_keys:
+        full_windows = {}
+        for keyword in reset_keys:
+            first_stored, last_stored = trend_store.bounds(keyword, TIME_UNIT)
+            starts = [start for start, _ in windows_by_keyword[keyword]] + [date.fromisoformat(first_stored)]
+            ends = [end for _, end in windows_by_keyword[keyword]] + [date.fromisoformat(last_stored)]
+            full_windows[keyword] = (min(starts), max(ends))
+        refetched = fetch_trends([(keyword, *full_windows[keyword]) for keyword in reset_keys])
+        for keyword, points in zip(reset_keys, refetched):
+            if points is None:
+                failed.add(keyword)
+                continue
+            trend_store.delete_keyword(keyword, TIME_UNIT)
+            volatile[keyword] = _merge_fetched(keyword, *full_windows[keyword], points, stable_until) or {}
+
+    # 3. 저장소 + 최근 값으로 각 요청 기간의 시계열을 만들어 반환
+    results = []
+    for keyword, start, end in trend_requests:
+        series = trend_store.get_series(keyword, TIME_UNIT, start.isoformat(), end.isoformat())
+        series.update({p: r for p, r in volatile.get(keyword, {}).items() if start.isoformat() <= p <= end.isoformat()})
+        if not series or (keyword in failed and not any(series.values())):
+            results.append(None)
+            continue
+        points = [{'period': period, 'ratio': series[period]} for period in sorted(series)]
+        results.append(rescale_window(points, start, end))
+    return results
+
+# --- 기준 키워드를 이용한 전체 순위 ---
+def rank_keywords_by_trend(keywords, start_date, end_date, anchor=DEFAULT_RANKING_ANCHOR, progress_callback=None):
+    """키워드 목록 전체를 같은 기준으로 비교할 수 있는 인기 점수로 정렬합니다.
+
+    datalab ratio는 한 요청 안에서만 비교할 수 있으므로, 모든 요청에 기준 키워드(anchor)를 넣고
+    나머지 4자리에 키워드를 채웁니다. 요청마다 기준 키워드의 기간 합계로 나누면 모든 키워드가
+    "기준 키워드 대비 검색량"이라는 같은 척도를 갖게 되므로, N개 키워드를 약 N/4번의 호출로 비교합니다.
+
+    반환값: keyword, relative_to_anchor(기준 키워드 대비 배수), score(최댓값 100), rank 컬럼의 DataFrame
+    """
+    keywords = [keyword for keyword in dict.fromkeys(keywords) if keyword and keyword != anchor]
+    slots = MAX_GROUPS_PER_REQUEST - 1
+    batches = [keywords[i:i + slots] for i in range(0, len(keywords), slots)]
+
+    # (묶음 수 x 5) 합계 행렬: 0번 열은 기준 키워드, 요청 실패 시 해당 행은 NaN
+    sums = np.full((len(batches), MAX_GROUPS_PER_REQUEST), np.nan)
+
+    def fetch(batch_index):
+        batch = batches[batch_index]
+        data = fetch_trend_batch(start_date, end_date, [anchor] + batch)
+        if data is None:
+            return batch_index, None
+        return batch_index, [sum(float(point['ratio']) for point in data.get(keyword) or []) for keyword in [anchor] + batch]
+
+    with ThreadPoolExecutor(max_workers=RANKING_WORKERS, thread_name_prefix="datalab-rank") as executor:
+        for done, (batch_index, row) in enumerate(executor.map(fetch, range(len(batches))), start=1):
+            if row is not None:
+                sums[batch_index, :len(row)] = row
+            if progress_callback:
+                progress_callback(done, len(batches))
+
+    # 기준 키워드 합계가 0이면 그 묶음은 척도를 맞출 수 없으므로 NaN으로 남깁니다.
+    anchor_sums = sums[:, 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative = np.where(anchor_sums[:, None] > 0, sums[:, 1:] / anchor_sums[:, None], np.nan)
+
+    # 묶음은 keywords를 4개씩 순서대로 채웠으므로, 행 우선으로 펼치면 keywords 순서와 같습니다.
+    flat = relative.ravel()[:len(keywords)]
+    peak = np.nanmax(flat) if np.isfinite(flat).any() else np.nan
+
+    ranking = pd.DataFrame({
+        "keyword": keywords,
+        "relative_to_anchor": np.round(flat, 6),
+        "score": np.round(flat * 100 / peak, 3) if np.isfinite(peak) and peak > 0 else np.nan,
+    })
+    ranking = ranking.sort_values("relative_to_anchor", ascending=False, na_position="last").reset_index(drop=True)
+    ranking["rank"] = ranking["relative_to_anchor"].rank(ascending=False, method="min").astype("Int64")
+    ranking.attrs.update({"anchor": anchor, "requests": len(batches)})
+    return ranking
+
+if __name__ == "__main__":
+    # 모듈 직접 실행 시 테스트 (python -m modules.naver_search.datalab)
+    import tempfile
+    from .trend_store import TrendStore
+
+    trend_store = TrendStore(os.path.join(tempfile.mkdtemp(), "trend_store.sqlite3"))
+    NAVER_TREND_CLIENT_ID = NAVER_TREND_CLIENT_SECRET = "test"
+    calls = []
+
+    def _post_datalab(start_date, end_date, keywords, time_unit="date"):
+        # 실제 API처럼 조회 기간 안의 최댓값이 100이 되도록 돌려줍니다.
+        calls.append((start_date, end_date))
+        days = list(_days(start_date, end_date))
+        values = [1 + day.toordinal() % 10 for day in days]
+        peak = max(values)
+        return {keyword: [{'period': day.isoformat(), 'ratio': value * 100 / peak} for day, value in zip(days, values)]
+                for keyword in keywords}
+
+    today = date.today()
+    old_start, old_end = today - timedelta(days=800), today - timedelta(days=700)
+    assert get_naver_trends([("서울숲", old_start, old_end)])[0]
+    assert trend_store.bounds("서울숲", TIME_UNIT) == (old_start.isoformat(), old_end.isoformat())
+
+    # 저장된 구간보다 한참 뒤의 요청은 저장된 구간까지 이어 받지 않고 그 기간만 받아야 합니다.
+    calls.clear()
+    recent = get_naver_trends([("서울숲", today - timedelta(days=90), today)])[0]
+    assert calls == [(today - timedelta(days=90), today)], calls
+    assert len(recent) == 91 and max(point['ratio'] for point in recent) == 100
+    assert trend_store.bounds("서울숲", TIME_UNIT) == (old_start.isoformat(), old_end.isoformat())
+
+    # 한참 앞선 요청도 마찬가지입니다.
+    calls.clear()
+    get_naver_trends([("서울숲", today - timedelta(days=1000), today - timedelta(days=950))])
+    assert calls == [(today - timedelta(days=1000), today - timedelta(days=950))], calls
+
+    # MAX_BRIDGE_DAYS 안쪽이면 저장된 구간과 ALIGN_OVERLAP_DAYS만큼 겹쳐 받고 저장합니다.
+    calls.clear()
+    near_start, near_end = old_end + timedelta(days=10), old_end + timedelta(days=40)
+    assert len(get_naver_trends([("서울숲", near_start, near_end)])[0]) == 31
+    assert calls == [(old_end - timedelta(days=ALIGN_OVERLAP_DAYS - 1), near_end)], calls
+    assert trend_store.bounds("서울숲", TIME_UNIT) == (old_start.isoformat(), near_end.isoformat())
+    print("datalab OK", len(calls), "calls")
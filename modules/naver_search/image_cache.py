@@ -0,0 +1,153 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+from http_client import get_session
+from utils import SingleFlight
+
+# --- 이미지 캐시 설정 (환경 변수로 조정 가능) ---
+IMAGE_CACHE_DIR = os.path.join(os.path.dirname(__file__), "naver_search_png")
+MAX_CACHE_BYTES = int(os.getenv("NAVER_IMAGE_CACHE_MAX_MB", 512)) * 1024 * 1024
+MAX_WORKERS = int(os.getenv("NAVER_IMAGE_DOWNLOAD_WORKERS", 8))
+PER_HOST_LIMIT = int(os.getenv("NAVER_IMAGE_PER_HOST_LIMIT", 4))  # 같은 이미지 서버에 동시에 보내는 요청 수
+REQUEST_TIMEOUT_SECONDS = 10
+DEFAULT_EXTENSION = ".jpg"
+
+def _extension_of(url):
+    # 파일 확장자 추출 (없거나 이상하면 .jpg 사용)
+    file_ext = os.path.splitext(urlparse(url).path)[-1].lower()
+    if not file_ext or len(file_ext) > 5:
+        return DEFAULT_EXTENSION
+    return file_ext
+
+class BlogImageCache:
+    """블로그 이미지를 URL 해시 파일명으로 보관하는 디스크 캐시 겸 동시 다운로더.
+
+    같은 URL은 같은 파일을 가리키므로 검색할 때마다 폴더를 지우지 않고 재사용하며,
+    전체 크기가 max_bytes를 넘으면 가장 오래 쓰지 않은 파일부터 지웁니다.
+    다운로드는 스레드 풀에서 동시에 하되, 이미지 서버(host)마다 동시 요청 수를 제한합니다.
+    """
+
+    def __init__(self, cache_dir=IMAGE_CACHE_DIR, max_bytes=MAX_CACHE_BYTES, max_workers=MAX_WORKERS, per_host_limit=PER_HOST_LIMIT):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.per_host_limit = per_host_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="naver-image")
+        self._flight = SingleFlight("naver_image")
+        self._lock = threading.Lock()
+        self._host_slots = {}  # host -> BoundedSemaphore (self._lock 안에서 만듦)
+        self._entries = None  # 파일 경로 -> 크기 (오래 쓰지 않은 순서)
+        self._total_bytes = 0
+        self.hits = 0
+        self.downloads = 0
+        self.evictions = 0
+
+    # --- 색인 ---
+    def _load_entries(self):
+        # 호출자가 self._lock을 잡고 있어야 합니다. 처음 한 번만 폴더를 훑어 마지막 사용 시각 순으로 색인합니다.
+        if self._entries is not None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith(".part"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.path, stat.st_size))
+        self._entries = OrderedDict((path, size) for _, path, size in sorted(files))
+        self._total_bytes = sum(self._entries.values())
+
+    def path_for(self, url):
+        """URL이 저장될 (또는 저장된) 로컬 경로."""
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}{_extension_of(url)}")
+
+    def _touch(self, path):
+        with self._lock:
+            self._load_entries()
+            if path not in self._entries:
+                return False
+            self._entries.move_to_end(path)
+        try:
+            os.utime(path)  # 재시작 후에도 LRU 순서를 유지하기 위해 수정 시각을 갱신
+        except OSError:
+            pass
+        return True
+
+    def _add(self, path, size):
+        evicted = []
+        with self._lock:
+            self._load_entries()
+            self._total_bytes += size - self._entries.pop(path, 0)
+            self._entries[path] = size
+            self.downloads += 1
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                old_path, old_size = self._entries.popitem(last=False)
+                self._total_bytes -= old_size
+                evicted.append(old_path)
+            self.evictions += len(evicted)
+        for old_path in evicted:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+    # --- 다운로드 ---
+    def _host_slot(self, host):
+        # 같은 host에 서로 다른 세마포어가 만들어지지 않도록 잠금 안에서 만듭니다.
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return slot
+
+    def _download(self, url, path):
+        host = urlparse(url).hostname or ""
+        # 응답 상태 오류로 끝나더라도 스트리밍 응답을 닫아 커넥션을 풀에 돌려줍니다.
+        with self._host_slot(host), get_session("default").get(url, stream=True, timeout=REQUEST_TIMEOUT_SECONDS) as response:
+            response.raise_for_status()
+            # 다 받은 뒤에만 최종 이름으로 바꿔, 중간에 실패한 파일이 캐시에 남지 않게 합니다.
+            part_path = f"{path}.{threading.get_ident()}.part"
+            size = 0
+            try:
+                with open(part_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=8192):
+                        f.write(chunk)
+                        size += len(chunk)
+                os.replace(part_path, path)
+            finally:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+        self._add(path, size)
+        return path
+
+    def fetch(self, url):
+        """이미지를 캐시에서 찾거나 내려받아 로컬 경로를 반환합니다. 실패하면 None."""
+        path = self.path_for(url)
+        if self._touch(path) and os.path.exists(path):
+            self.hits += 1
+            return path
+        try:
+            # 여러 세션이 같은 이미지를 동시에 요청하면 한 번만 내려받습니다.
+            return self._flight.do(path, self._download, url, path)
+        except (requests.exceptions.RequestException, OSError) as e:
+            print(f"이미지 다운로드 실패: {url}, 오류: {e}")
+            return None
+
+    def submit(self, urls):
+        """중복을 제외한 URL들의 다운로드를 시작하고 {future: url}을 반환합니다. (완료 순서대로 꺼내 쓰기 위함)"""
+        return {self._executor.submit(self.fetch, url): url for url in dict.fromkeys(urls) if url}
+
+    def stats(self):
+        with self._lock:
+            self._load_entries()
+            return {
+                "files": len(self._entries), "bytes": self._total_bytes, "max_bytes": self.max_bytes,
+                "hits": self.hits, "downloads": self.downloads, "evictions": self.evictions,
+            }
+
+blog_image_cache = BlogImageCache()
@@ -0,0 +1,114 @@
+import os
+import time
+import json
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from collections import defaultdict
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), "llm_cache")
+CACHE_PATH = os.path.join(CACHE_DIR, "llm_cache.sqlite3")
+
+def content_hash(*parts):
+    """캐시 키에 쓰는 해시. 순서가 있는 여러 값을 하나의 키로 만듭니다."""
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def normalize_question(question):
+    """질문을 캐시 키용으로 가볍게 정규화합니다. (전각/대소문자/공백/문장 부호 차이를 무시)
+
+    "주차 편한가요?"와 "주차편한가요 ??"는 같은 키가 됩니다.
+    """
+    normalized = unicodedata.normalize("NFKC", question or "").lower()
+    return "".join(ch for ch in normalized if not ch.isspace() and unicodedata.category(ch)[0] not in ("P", "S"))
+
+def usage_tokens(message):
+    """LLM 응답(또는 마지막 스트리밍 chunk)의 usage_metadata에서 전체 토큰 수를 꺼냅니다. 없으면 0."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    return int(usage.get("total_tokens", 0))
+
+class LLMCache:
+    """LLM 응답을 (namespace, key) 단위로 보관하는 SQLite 저장소.
+
+    key는 프롬프트 버전, 모델, 입력 내용의 해시를 합친 값이어야 하며,
+    그중 하나라도 바뀌면 새 항목으로 취급됩니다. 저장할 때 응답을 만드는 데 쓴 토큰 수를 함께 기록하여,
+    캐시 적중으로 아낀 토큰 수를 namespace별 적중률과 함께 stats()로 보여줍니다.
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._stats = defaultdict(lambda: {"hits": 0, "misses": 0, "tokens_saved": 0})
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, created_at REAL NOT NULL,"
+                " tokens INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (namespace, key))"
+            )
+            try:
+                # tokens 컬럼이 없던 이전 캐시 파일
+                self._conn.execute("ALTER TABLE llm_cache ADD COLUMN tokens INTEGER NOT NULL DEFAULT 0")
+            except sqlite3.OperationalError:
+                pass
+            self._conn.commit()
+        return self._conn
+
+    def _record(self, namespace, hits, misses, tokens_saved):
+        # 호출자가 self._lock을 잡고 있어야 합니다.
+        stats = self._stats[namespace]
+        stats["hits"] += hits
+        stats["misses"] += misses
+        stats["tokens_saved"] += tokens_saved
+
+    def get(self, namespace, key):
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value, tokens FROM llm_cache WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            self._record(namespace, int(row is not None), int(row is None), row[1] if row else 0)
+        return row[0] if row else None
+
+    def get_many(self, namespace, keys):
+        """{key: value}를 반환합니다. 없는 key는 결과에 포함되지 않습니다."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT key, value, tokens FROM llm_cache WHERE namespace = ? AND key IN ({','.join('?' * len(keys))})",
+                [namespace, *keys],
+            ).fetchall()
+            self._record(namespace, len(rows), len(keys) - len(rows), sum(tokens for _, _, tokens in rows))
+        return {key: value for key, value, _ in rows}
+
+    def put(self, namespace, key, value, tokens=0):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (namespace, key, value, created_at, tokens) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, value, time.time(), int(tokens)),
+            )
+            conn.commit()
+
+    def stats(self):
+        """namespace별 {hits, misses, hit_rate, tokens_saved} (프로세스 시작 이후)."""
+        with self._lock:
+            return {
+                namespace: {**stats, "hit_rate": round(stats["hits"] / max(stats["hits"] + stats["misses"], 1), 3)}
+                for namespace, stats in self._stats.items()
+            }
+
+# --- 캐시된 응답 재생 ---
+REPLAY_CHUNK_CHARS = 40
+
+def replay_chunks(text, chunk_chars=REPLAY_CHUNK_CHARS):
+    """캐시된 응답을 스트리밍처럼 점점 늘어나는 문자열로 돌려줍니다. (Gradio 출력 갱신용)"""
+    for end in range(chunk_chars, len(text) + chunk_chars, chunk_chars):
+        yield text[:end]
+
+llm_cache = LLMCache()
@@ -0,0 +1,167 @@
+import os
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+
+import httpx
+
+from utils import SingleFlight, clean_html, request_key
+
+BLOG_SEARCH_URL = "https://openapi.naver.com/v1/search/blog.json"
+
+# --- 클라이언트 설정 (환경 변수로 조정 가능) ---
+MAX_CONNECTIONS = int(os.getenv("NAVER_ASYNC_MAX_CONNECTIONS", 16))
+MAX_CONCURRENCY = int(os.getenv("NAVER_ASYNC_CONCURRENCY", 8))  # 동시에 보낼 검색 요청 수 (API 초당 호출 제한 고려)
+CACHE_TTL_SECONDS = int(os.getenv("NAVER_SEARCH_CACHE_TTL_SECONDS", 30 * 60))
+CACHE_MAX_ENTRIES = int(os.getenv("NAVER_SEARCH_CACHE_MAX_ENTRIES", 2048))
+REQUEST_TIMEOUT_SECONDS = 10
+
+def parse_blog_items(data):
+    """블로그 검색 응답에서 화면에 쓰는 필드만 정리하여 반환합니다."""
+    return [
+        {
+            "title": clean_html(item.get("title", "")),
+            "description": clean_html(item.get("description", "")),
+            "link": item.get("link", ""),
+            "postdate": item.get("postdate", ""),
+        }
+        for item in data.get("items", [])
+    ]
+
+class _TTLCache:
+    """(query, display, sort) -> 검색 결과를 TTL 동안 보관하는 LRU 캐시."""
+
+    def __init__(self, ttl_seconds, max_entries):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+class NaverSearchClient:
+    """네이버 블로그 검색용 비동기 클라이언트.
+
+    전용 이벤트 루프 스레드에서 httpx.AsyncClient 하나(커넥션 풀)를 공유하므로, 동기 핸들러와
+    비동기 핸들러 어디에서 호출하든 같은 풀과 캐시를 사용합니다. 여러 검색어는 동시에 조회하고,
+    같은 (query, display, sort)는 TTL 동안 다시 요청하지 않습니다.
+    """
+
+    def __init__(self, client_id, client_secret, max_connections=MAX_CONNECTIONS, max_concurrency=MAX_CONCURRENCY,
+                 cache_ttl=CACHE_TTL_SECONDS, cache_size=CACHE_MAX_ENTRIES):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.cache = _TTLCache(cache_ttl, cache_size)
+        self.flight = SingleFlight("naver_async")
+        self._lock = threading.Lock()
+        self._loop = None
+        self._client = None
+        self._semaphore = None
+        self.requests = 0
+        self.cache_hits = 0
+
+    # --- 이벤트 루프/커넥션 풀 ---
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="naver-client", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def _get_client(self):
+        # 루프 스레드 안에서만 호출되므로 별도의 잠금이 필요 없습니다.
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                timeout=REQUEST_TIMEOUT_SECONDS,
+                headers={"X-Naver-Client-Id": self.client_id or "", "X-Naver-Client-Secret": self.client_secret or ""},
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    # --- 검색 (루프 스레드에서 실행) ---
+    async def _fetch(self, query, display, sort):
+        client = self._get_client()
+        async with self._semaphore:
+            self.requests += 1
+            response = await client.get(BLOG_SEARCH_URL, params={"query": query, "display": display, "sort": sort})
+        response.raise_for_status()
+        return parse_blog_items(response.json())
+
+    async def _search(self, query, display, sort):
+        cache_key = (query, display, sort)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        if not self.client_id or not self.client_secret:
+            print("네이버 블로그 API 인증 정보가 .env 파일에 설정되지 않았습니다.")
+            return []
+
+        try:
+            results = await self.flight.do_async(request_key("blog", query, display, sort), self._fetch, query, display, sort)
+        except httpx.HTTPError as e:
+            print(f"네이버 블로그 API 호출 오류: {e}")
+            return []
+        except Exception as e:
+            print(f"블로그 데이터 처리 중 오류: {e}")
+            return []
+        self.cache.set(cache_key, results)
+        return results
+
+    async def _search_many(self, queries, display, sort):
+        unique_queries = list(dict.fromkeys(queries))
+        results = await asyncio.gather(*(self._search(query, display, sort) for query in unique_queries))
+        return dict(zip(unique_queries, results))
+
+    # --- 공개 API ---
+    def search(self, query, display=5, sort="sim"):
+        """블로그 검색 결과를 반환합니다. (동기 호출용)"""
+        results = self._submit(self._search(query, display, sort)).result()
+        # 호출자가 결과를 수정해도 캐시와 다른 호출자에게 영향이 없도록 복사합니다.
+        return [dict(item) for item in results]
+
+    async def search_async(self, query, display=5, sort="sim"):
+        """블로그 검색 결과를 반환합니다. (다른 이벤트 루프의 비동기 핸들러용)"""
+        results = await asyncio.wrap_future(self._submit(self._search(query, display, sort)))
+        return [dict(item) for item in results]
+
+    def search_many(self, queries, display=5, sort="sim"):
+        """여러 검색어를 동시에 조회하여 {검색어: 결과}를 반환합니다. (동기 호출용)"""
+        results = self._submit(self._search_many(queries, display, sort)).result()
+        return {query: [dict(item) for item in items] for query, items in results.items()}
+
+    async def search_many_async(self, queries, display=5, sort="sim"):
+        results = await asyncio.wrap_future(self._submit(self._search_many(queries, display, sort)))
+        return {query: [dict(item) for item in items] for query, items in results.items()}
+
+    def stats(self):
+        return {"requests": self.requests, "cache_hits": self.cache_hits, "cached_queries": len(self.cache)}
@@ -0,0 +1,129 @@
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .llm_cache import content_hash
+
+# --- 검색 설정 ---
+WINDOW_SENTENCES = 3   # 문단(passage) 하나에 묶는 문장 수
+WINDOW_STRIDE = 2      # 다음 문단 시작까지의 문장 수 (겹치는 1문장이 문맥을 이어 줌)
+TOP_K = 8
+MAX_CONTEXT_CHARS = 6000  # LLM에 보내는 후기 발췌의 최대 글자 수
+INDEX_CACHE_SIZE = 32
+
+_FALLBACK_SENTENCE_RE = re.compile(r"(?<=[.!?。])\s+")
+
+_sent_tokenize = None
+
+def _get_sent_tokenize():
+    """NLTK 문장 토크나이저를 처음 쓸 때 준비합니다. (import와 punkt 다운로드가 앱 시작을 늦추지 않도록)"""
+    global _sent_tokenize
+    if _sent_tokenize is None:
+        import nltk
+        from nltk.tokenize import sent_tokenize
+
+        # NLTK 문장 토크나이저 다운로드 (최초 1회 실행 필요)
+        try:
+            nltk.data.find('tokenizers/punkt')
+        except LookupError:
+            nltk.download('punkt')
+
+        try:
+            sent_tokenize("문장 확인.")
+            _sent_tokenize = sent_tokenize
+        except LookupError:
+            # punkt 데이터를 받을 수 없는 환경에서는 문장 부호 기준으로 나눕니다.
+            _sent_tokenize = lambda line: [part for part in _FALLBACK_SENTENCE_RE.split(line) if part]
+    return _sent_tokenize
+
+def prepare_retrieval():
+    """문장 토크나이저와 scikit-learn을 미리 불러옵니다. (앱 시작 직후 워밍업용)"""
+    _get_sent_tokenize()
+    from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: F401
+    from sklearn.metrics.pairwise import cosine_similarity  # noqa: F401
+
+def is_valid_content(content):
+    """스크래핑 오류 메시지가 아닌, 실제 본문인지 확인합니다."""
+    return bool(content.strip()) and "본문 내용을 찾을 수 없습니다" not in content and "페이지에 접근하는 중 오류" not in content
+
+def _split_sentences(text):
+    # 블로그 글은 줄바꿈이 문장 구분 역할을 하는 경우가 많아 줄 단위로 먼저 나눕니다.
+    sent_tokenize = _get_sent_tokenize()
+    sentences = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            sentences.extend(sent_tokenize(line))
+    return sentences
+
+class ReviewPassageIndex:
+    """블로그 후기 묶음(corpus) 하나에 대한 문단 검색 색인.
+
+    각 후기를 문장 단위로 나눠 WINDOW_SENTENCES개씩 겹치는 문단으로 묶고, 한국어에 맞게
+    글자 n-gram TF-IDF 행렬을 한 번만 만들어 둡니다. 질문마다 행렬과 한 번의 곱으로 유사도를 구해
+    관련 문단만 골라내므로, 전체 본문 대신 짧은 발췌만 LLM에 보낼 수 있습니다.
+    """
+
+    def __init__(self, contents):
+        """contents: (후기 번호, 본문) 목록"""
+        self.corpus_hash = content_hash(*contents)
+        self.passages = []  # (후기 번호, 문단 순서, 텍스트)
+        for post_number, content in contents:
+            sentences = _split_sentences(content)
+            for order, start in enumerate(range(0, max(len(sentences) - WINDOW_SENTENCES + WINDOW_STRIDE, 1), WINDOW_STRIDE)):
+                passage = " ".join(sentences[start:start + WINDOW_SENTENCES])
+                if passage:
+                    self.passages.append((post_number, order, passage))
+
+        from sklearn.feature_extraction.text import TfidfVectorizer  # 처음 색인을 만들 때 불러옵니다.
+
+        self.vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 3), sublinear_tf=True)
+        self.matrix = self.vectorizer.fit_transform([text for _, _, text in self.passages]) if self.passages else None
+        self.total_chars = sum(len(content) for _, content in contents)
+
+    def search(self, question, top_k=TOP_K, max_chars=MAX_CONTEXT_CHARS):
+        """질문과 가장 관련 있는 문단들을 (후기 번호, 텍스트) 목록으로 반환합니다. (후기/본문 순서로 정렬)"""
+        if self.matrix is None:
+            return []
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        scores = cosine_similarity(self.vectorizer.transform([question]), self.matrix).ravel()
+        k = min(top_k, len(scores))
+        if not scores.any():
+            # 질문과 겹치는 글자가 전혀 없으면 각 후기의 첫 문단을 대신 보냅니다.
+            candidates = [i for i, (_, order, _) in enumerate(self.passages) if order == 0][:k]
+        else:
+            candidates = np.argpartition(-scores, k - 1)[:k]
+            candidates = [int(i) for i in candidates[np.argsort(-scores[candidates])] if scores[i] > 0]
+
+        selected, used_chars = [], 0
+        for i in candidates:
+            text = self.passages[i][2]
+            if selected and used_chars + len(text) > max_chars:
+                break
+            selected.append(i)
+            used_chars += len(text)
+        return [(self.passages[i][0], self.passages[i][2]) for i in sorted(selected, key=lambda i: self.passages[i][:2])]
+
+_index_cache = OrderedDict()
+_index_lock = threading.Lock()
+
+def get_review_index(reviews_data):
+    """후기 목록의 색인을 반환합니다. 같은 후기 묶음(검색 결과)에 대해서는 한 번만 만듭니다."""
+    contents = [(i + 1, review.get("content", "")) for i, review in enumerate(reviews_data)]
+    contents = [(number, content) for number, content in contents if is_valid_content(content)]
+    key = content_hash(*contents)
+    with _index_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    index = ReviewPassageIndex(contents)
+    with _index_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
@@ -2,96 +2,31 @@ import gradio as gr
 import json
 import asyncio
 import os
-import requests
-import shutil
-from playwright.async_api import async_playwright
-from modules.naver_search.naver_review import search_naver_blog
-from langchain_openai import ChatOpenAI
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-import nltk
-from nltk.tokenize import sent_tokenize
-
-# NLTK 문장 토크나이저 다운로드 (최초 1회 실행 필요)
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+from modules.naver_search.naver_review import search_naver_blog_async
+from modules.naver_search.blog_browser import blog_browser
+from modules.naver_search.blog_corpus import blog_corpus
+from modules.naver_search.blog_extractor import extract_blog_post
+from modules.naver_search.image_cache import blog_image_cache
+from modules.naver_search.llm_cache import llm_cache, content_hash, normalize_question, replay_chunks, usage_tokens
+from modules.naver_search.review_retrieval import get_review_index, is_valid_content
 
 
 # --- 블로그 스크래핑 ---
 async def scrape_blog_content(url: str) -> tuple[str, list[str]]:
     """
-    Playwright를 사용하여 주어진 URL의 블로그 본문 텍스트와 이미지 URL들을 스크래핑합니다.
+    주어진 URL의 블로그 본문 텍스트와 이미지 URL들을 스크래핑합니다.
+    HTTP 요청 + BeautifulSoup으로 먼저 시도하고, 실패할 때만 공유 브라우저(blog_browser)를 사용합니다.
     """
-    text_content = ""
-    image_urls = []
-    try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            await page.goto(url, wait_until="domcontentloaded", timeout=20000)
-
-            main_frame = page
-            try:
-                main_frame_element = await page.wait_for_selector(
-                    "iframe#mainFrame", timeout=5000
-                )
-                main_frame = await main_frame_element.content_frame()
-                if main_frame is None:
-                    main_frame = page
-            except Exception:
-                main_frame = page
-
-            content_selectors = [
-                "div.se-main-container",
-                "div.post-view",
-                "#postViewArea",
-            ]
-            content_element = None
-            for selector in content_selectors:
-                try:
-                    await main_frame.wait_for_selector(selector, timeout=5000)
-                    content_element = await main_frame.query_selector(selector)
-                    if content_element:
-                        text_content = await content_element.inner_text()
-                        if text_content.strip():
-                            # 이미지 찾기
-                            images = await content_element.query_selector_all("img")
-                            for img in images:
-                                # 네이버 블로그는 lazy loading을 사용하므로 data-lazy-src, data-src, src 순으로 확인
-                                lazy_src = await img.get_attribute("data-lazy-src")
-                                data_src = await img.get_attribute("data-src")
-                                regular_src = await img.get_attribute("src")
-
-                                src = lazy_src or data_src or regular_src
-
-                                if (
-                                    src
-                                    and src.startswith("http")
-                                    and "storep-phinf.pstatic.net" not in src
-                                ):
-                                    # 썸네일 파라미터(?type=...)를 제거하여 원본 이미지 URL 확보
-                                    cleaned_src = src.split("?")[0]
-                                    if cleaned_src not in image_urls:
-                                        image_urls.append(cleaned_src)
-                            break  # 내용과 이미지를 찾았으면 중단
-                except Exception:
-                    continue
-
-            await browser.close()
-
-            if not text_content.strip():
-                return (
-                    "본문 내용을 찾을 수 없습니다. (지원되지 않는 블로그 구조일 수 있습니다)",
-                    [],
-                )
-
-            return text_content, image_urls
+    extracted = await asyncio.to_thread(extract_blog_post, url)
+    if extracted is not None:
+        return extracted
+    return await blog_browser.scrape(url)
 
-    except Exception as e:
-        return f"페이지에 접근하는 중 오류가 발생했습니다: {e}", []
+
+def _report_index_failure(future):
+    """미리 만드는 문단 색인이 실패하면 로그로 남깁니다."""
+    if not future.cancelled() and future.exception() is not None:
+        print(f"후기 문단 색인 생성 실패: {future.exception()!r}")
 
 
 # --- 메인 검색 및 스크래핑 함수 ---
@@ -99,27 +34,35 @@ async def search_naver_reviews_and_scrape(
     keyword, progress=gr.Progress(track_tqdm=True)
 ):
     """
-    네이버 블로그를 검색(10개)하고, 각 결과의 본문과 이미지를 스크래핑하여 로컬에 저장합니다.
+    네이버 블로그를 검색(10개)하고, 각 결과의 본문과 이미지를 스크래핑합니다.
+    blog_corpus에 최근에 저장된 글은 다시 스크래핑하지 않고, 새로 스크래핑한 글은 키워드와 함께 저장합니다.
+    이미지는 blog_image_cache로 동시에 내려받으며, 받은 순서대로 갤러리를 갱신합니다.
     """
-    # --- 이미지 저장 폴더 설정 및 초기화 ---
-    image_save_dir = os.path.join(os.path.dirname(__file__), "naver_search_png")
-    if os.path.exists(image_save_dir):
-        shutil.rmtree(image_save_dir)
-    os.makedirs(image_save_dir, exist_ok=True)
-
     if not keyword:
-        return "{}", "키워드를 입력해주세요.", [], []
+        yield "{}", "키워드를 입력해주세요.", [], []
+        return
 
     progress(0, desc="네이버 블로그 검색 중...")
-    blog_reviews = search_naver_blog(keyword, display=10)
+    blog_reviews = await search_naver_blog_async(keyword, display=10)
 
     if not blog_reviews:
-        return "{}", f"'{keyword}'에 대한 네이버 블로그 검색 결과가 없습니다.", [], []
+        yield "{}", f"'{keyword}'에 대한 네이버 블로그 검색 결과가 없습니다.", [], []
+        return
+
+    # 다른 키워드나 이전 검색에서 이미 스크래핑한 글은 저장된 본문을 그대로 사용합니다.
+    stored_posts = blog_corpus.get_fresh(
+        review["link"] for review in blog_reviews if review.get("link") and "blog.naver.com" in review["link"]
+    )
+
+    async def get_stored_result(link):
+        return stored_posts[link]
 
     tasks = []
     for review in blog_reviews:
         link = review.get("link")
-        if link and "blog.naver.com" in link:
+        if link in stored_posts:
+            tasks.append(get_stored_result(link))
+        elif link and "blog.naver.com" in link:
             tasks.append(scrape_blog_content(link))
         else:
 
@@ -128,8 +71,13 @@ async def search_naver_reviews_and_scrape(
 
             tasks.append(get_empty_result())
 
-    progress(0.5, desc=f"{len(tasks)}개의 블로그 본문 및 이미지 스크래핑 중...")
+    # 동시에 여는 컨텍스트 수는 blog_browser가 제한하므로 모두 한 번에 넘겨도 됩니다.
+    progress(0.5, desc=f"{len(tasks) - len(stored_posts)}개의 블로그 본문 및 이미지 스크래핑 중... (저장된 글 {len(stored_posts)}개)")
     scraped_results = await asyncio.gather(*tasks)
+    blog_corpus.record_search(keyword, [
+        (review, text_content, image_urls, review.get("link") not in stored_posts)
+        for review, (text_content, image_urls) in zip(blog_reviews, scraped_results)
+    ])
 
     scraped_reviews = []
     all_image_urls = []
@@ -139,32 +87,6 @@ async def search_naver_reviews_and_scrape(
         scraped_reviews.append(review)
         all_image_urls.extend(image_urls)
 
-    # --- 스크래핑된 이미지 다운로드 ---
-    progress(0.8, desc=f"{len(all_image_urls)}개 이미지 다운로드 중...")
-    local_image_paths = []
-    for i, img_url in enumerate(all_image_urls):
-        try:
-            response = requests.get(img_url, stream=True, timeout=10)
-            response.raise_for_status()
-
-            # 파일 확장자 추출 (없으면 .jpg 사용)
-            file_ext = os.path.splitext(img_url.split("?")[0])[-1]
-            if not file_ext or len(file_ext) > 5:  # 간단한 유효성 검사
-                file_ext = ".jpg"
-
-            file_name = f"image_{i+1}{file_ext}"
-            file_path = os.path.join(image_save_dir, file_name)
-
-            with open(file_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            local_image_paths.append(file_path)
-        except requests.exceptions.RequestException as e:
-            print(f"이미지 다운로드 실패: {img_url}, 오류: {e}")
-            continue
-
-    progress(1, desc="완료")
-
     raw_json_output = json.dumps(scraped_reviews, indent=2, ensure_ascii=False)
 
     formatted_output_lines = [f"### '{keyword}' 네이버 블로그 검색 및 스크래핑 결과\n"]
@@ -187,73 +109,131 @@ async def search_naver_reviews_and_scrape(
 
     formatted_output = "\n".join(formatted_output_lines)
 
-    return raw_json_output, formatted_output, scraped_reviews, local_image_paths
+    # 본문은 먼저 보여주고, 이미지는 받는 대로 갤러리에 추가합니다.
+    yield raw_json_output, formatted_output, scraped_reviews, []
+
+    # 챗봇 질문에 쓸 문단 색인은 이미지를 받는 동안 미리 만들어 둡니다. (실패해도 질문할 때 다시 만듦)
+    index_future = asyncio.get_running_loop().run_in_executor(None, get_review_index, scraped_reviews)
+    index_future.add_done_callback(_report_index_failure)
+
+    # --- 스크래핑된 이미지 다운로드 (캐시된 이미지는 다시 받지 않음) ---
+    downloads = blog_image_cache.submit(all_image_urls)
+    progress(0.8, desc=f"{len(downloads)}개 이미지 다운로드 중...")
+    local_image_paths = {}
+    for done in asyncio.as_completed([asyncio.wrap_future(future) for future in downloads]):
+        path = await done
+        if path:
+            local_image_paths[path] = None
+            yield raw_json_output, formatted_output, scraped_reviews, list(local_image_paths)
+
+    # 마지막에는 블로그 글 순서대로 정렬하여 보여줍니다.
+    ordered_paths = [blog_image_cache.path_for(url) for url in dict.fromkeys(all_image_urls)]
+    progress(1, desc="완료")
+    yield raw_json_output, formatted_output, scraped_reviews, [path for path in ordered_paths if path in local_image_paths]
 
 
 # --- OpenAI (GPT) 요약 함수 ---
-def summarize_blog_contents_stream(reviews_data, progress=gr.Progress(track_tqdm=True)):
+SUMMARY_MODEL_NAME = "gpt-4.1-mini"
+# 프롬프트를 바꾸면 버전을 올려야 이전 프롬프트로 만든 캐시를 쓰지 않습니다.
+POST_SUMMARY_PROMPT_VERSION = "post-summary-v1"
+DIGEST_PROMPT_VERSION = "visitor-digest-v1"
+ANSWER_PROMPT_VERSION = "review-answer-v1"
+ANSWER_MODEL_NAME = "gpt-4.1-mini"
+POST_SUMMARY_CONCURRENCY = int(os.getenv("NAVER_SUMMARY_CONCURRENCY", 10))  # 검색 결과 10개를 한 번에 요약
+MAX_POST_CHARS = 8000  # 글 하나를 요약할 때 넘기는 최대 글자 수
+
+def _post_summary_prompt(content):
+    return f"""
+    다음은 하나의 주제(행사, 장소 등)에 대한 네이버 블로그 후기 한 편입니다.
+    이 후기에서 주요 특징, 글쓴이의 반응, 긍정적인 점과 아쉬운 점을 중심으로 요약해주세요.
+    혼잡도, 방문 시간대, 날씨, 동행, 편의시설, 비용 대비 만족도처럼 글쓴이가 직접 겪은 경험은 빠짐없이 포함하고,
+    방문 후 근처의 다른 음식점, 카페, 볼거리, 즐길거리 등을 이어서 방문했다는 내용이 있다면 그 부분도 포함해주세요.
+
+    --- 블로그 후기 ---
+    {content[:MAX_POST_CHARS]}
+    ---
+
+    위 후기의 요약:
     """
-    스크래핑된 블로그 본문을 1차 요약 후, 2차로 주관적인 내용만 필터링하여 스트리밍합니다.
+
+async def _summarize_posts(gpt, contents, progress):
+    """글마다 요약을 동시에 만듭니다(map). 같은 글/프롬프트/모델의 요약은 캐시에서 가져옵니다."""
+    keys = [content_hash(POST_SUMMARY_PROMPT_VERSION, SUMMARY_MODEL_NAME, content) for content in contents]
+    summaries = llm_cache.get_many("post_summary", keys)
+    missing = [(key, content) for key, content in dict(zip(keys, contents)).items() if key not in summaries]
+
+    semaphore = asyncio.Semaphore(POST_SUMMARY_CONCURRENCY)
+
+    async def summarize(key, content):
+        async with semaphore:
+            response = await gpt.ainvoke(_post_summary_prompt(content))
+        llm_cache.put("post_summary", key, response.content, tokens=usage_tokens(response))
+        return key, response.content
+
+    done = len(contents) - len(missing)
+    progress(0.1, desc=f"후기별 요약 중... ({done}/{len(contents)}, 캐시 {done}개)")
+    for finished in asyncio.as_completed([summarize(key, content) for key, content in missing]):
+        key, summary = await finished
+        summaries[key] = summary
+        done += 1
+        progress(0.1 + 0.5 * done / len(contents), desc=f"후기별 요약 중... ({done}/{len(contents)})")
+    return [summaries[key] for key in keys]
+
+async def summarize_blog_contents_stream(reviews_data, progress=gr.Progress(track_tqdm=True)):
+    """
+    스크래핑된 블로그 본문을 글마다 동시에 요약(map)한 뒤, 요약들을 모아 주관적인 내용만
+    소주제별로 정리(reduce)하여 스트리밍합니다. 글별 요약은 내용 해시로 캐시됩니다.
     """
     if not reviews_data:
         yield "요약할 내용이 없습니다."
         return
 
-    progress(0, desc="OpenAI API로 1차 요약 준비 중...")
+    progress(0, desc="OpenAI API로 요약 준비 중...")
+
+    contents = [review.get("content", "") for review in reviews_data]
+    contents = [content for content in contents if is_valid_content(content)]
+    if not contents:
+        yield "요약할 유효한 블로그 본문이 없습니다."
+        return
+
+    # 같은 후기 묶음의 최종 요약이 있으면 API 키 확인이나 모델 import 없이 그대로 재생합니다.
+    digest_key = content_hash(DIGEST_PROMPT_VERSION, SUMMARY_MODEL_NAME, *contents)
+    cached_digest = llm_cache.get("blog_summary", digest_key)
+    if cached_digest is not None:
+        for partial in replay_chunks(cached_digest):
+            yield partial
+        progress(1, desc="요약 완료 (캐시)")
+        return
 
     if "OPENAI_API_KEY" not in os.environ:
         yield "오류: OPENAI_API_KEY 환경 변수가 설정되지 않았습니다. .env 파일을 확인해주세요."
         return
 
     try:
-        gpt = ChatOpenAI(temperature=0, model_name="gpt-4.1-mini")
+        from langchain_openai import ChatOpenAI  # 처음 사용할 때 불러옵니다. (import 비용이 큼)
+        gpt = ChatOpenAI(temperature=0, model_name=SUMMARY_MODEL_NAME, stream_usage=True)
     except Exception as e:
         yield f"ChatOpenAI 모델 초기화 중 오류 발생: {e}"
         return
 
-    full_text = ""
-    for i, review in enumerate(reviews_data):
-        content = review.get("content", "")
-        if (
-            "본문 내용을 찾을 수 없습니다" in content
-            or "페이지에 접근하는 중 오류" in content
-        ):
-            continue
-        full_text += f"--- 블로그 후기 {i+1} ---\n\n{content}\n\n"
-
-    if not full_text.strip():
-        yield "요약할 유효한 블로그 본문이 없습니다."
-        return
-
-    # 1. 1차 요약 프롬프트
-    initial_prompt = f"""
-    다음은 하나의 주제에 대한 여러 네이버 블로그 후기 내용입니다.
-    이 후기들을 종합하여 해당 주제(행사, 장소 등)의 주요 특징, 방문객들의 전반적인 반응, 긍정적인 점과 아쉬운 점을 중심으로 상세하게 요약해주세요.
-    특히, 방문객들이 해당 행사를 즐긴 후 근처의 다른 음식점, 카페, 볼거리, 즐길거리 등을 이어서 방문했다는 내용이 있다면 그 부분도 놓치지 말고 요약에 포함해주세요.
-    각 블로그의 내용을 단순히 나열하는 것이 아니라, 전체적인 관점에서 정보를 종합하고 재구성하여 전달해야 합니다.
-
-    --- 전체 후기 내용 ---
-    {full_text}
-    ---
-    
-    위 내용을 바탕으로 상세 요약:
-    """
-
-    progress(0.2, desc="GPT가 1차 요약 중입니다...")
-
+    # 1. 글별 요약 (map)
     try:
-        # 1차 요약 (스트리밍 없이 내부적으로 완료)
-        initial_summary = gpt.invoke(initial_prompt).content
+        post_summaries = await _summarize_posts(gpt, contents, progress)
     except Exception as e:
-        yield f"OpenAI API 1차 요약 중 오류가 발생했습니다: {e}"
+        yield f"OpenAI API 후기별 요약 중 오류가 발생했습니다: {e}"
         return
 
-    progress(0.6, desc="GPT가 2차 필터링 및 요약 중입니다...")
+    summaries_text = "\n\n".join(
+        f"--- 블로그 후기 {i + 1} 요약 ---\n{summary}" for i, summary in enumerate(post_summaries)
+    )
+
+    progress(0.6, desc="GPT가 요약을 종합하여 필터링 중입니다...")
 
-    # 2. 2차 필터링 및 요약 프롬프트
+    # 2. 종합 및 필터링 (reduce)
     filtering_prompt = f"""
-    아래는 여러 블로그 후기를 바탕으로 생성된 1차 요약본입니다.
-    이 요약본에서, 공식 관광 사이트에서는 얻기 힘든 '실제 방문객들의 주관적인 경험'과 관련된 내용만을 추출해주세요.
+    아래는 여러 블로그 후기를 한 편씩 요약한 내용입니다.
+    이 요약들을 종합하여, 공식 관광 사이트에서는 얻기 힘든 '실제 방문객들의 주관적인 경험'과 관련된 내용만을 추출해주세요.
+    여러 후기에서 공통으로 언급된 내용은 하나로 합치고, 의견이 엇갈리는 부분은 양쪽을 모두 전달해주세요.
 
     추출한 내용을 다음 소주제들에 맞춰 최대한 상세하고 다양하게 분류하고 정리해주세요. 각 소주제에 해당하는 내용이 없다면 그 소주제는 결과에서 생략해주세요.
 
@@ -280,26 +260,26 @@ def summarize_blog_contents_stream(reviews_data, progress=gr.Progress(track_tqdm
 
     공식 정보(행사 기간, 장소, 프로그램 목록, 가격 등)는 모두 제외하고, 오직 방문객들의 목소리가 담긴 내용만을 뽑아서 위의 형식에 맞춰 새롭게 정리해주세요.
 
-    --- 1차 요약본 ---
-    {initial_summary}
+    --- 후기별 요약 ---
+    {summaries_text}
     ---
 
     --- 방문객 경험 중심 요약 (소주제별 분류) ---
     """
 
     try:
-        # 2차 요약 (스트리밍)
-        answer_stream = gpt.stream(filtering_prompt)
-
         full_filtered_summary = ""
-        for chunk in answer_stream:
+        tokens = 0
+        async for chunk in gpt.astream(filtering_prompt):
             full_filtered_summary += chunk.content
+            tokens += usage_tokens(chunk)
             yield full_filtered_summary
 
+        llm_cache.put("blog_summary", digest_key, full_filtered_summary, tokens=tokens)
         progress(1, desc="요약 완료")
 
     except Exception as e:
-        yield f"OpenAI API 2차 요약 중 오류가 발생했습니다: {e}"
+        yield f"OpenAI API 요약 종합 중 오류가 발생했습니다: {e}"
 
 
 # --- 챗봇 답변 생성 함수 (LLM 기반 스트리밍) ---
@@ -314,37 +294,42 @@ def answer_question_from_reviews_stream(question: str, reviews_data: list):
         yield "답변을 찾을 수 있는 블로그 후기 내용이 없습니다."
         return
 
-    # 1. LLM 모델 초기화
+    # 1. 같은 후기 묶음에 대한 같은 질문(공백/문장 부호 차이 무시)의 답변이 있으면 그대로 재생
+    review_index = get_review_index(reviews_data)
+    answer_key = content_hash(ANSWER_PROMPT_VERSION, ANSWER_MODEL_NAME, review_index.corpus_hash, normalize_question(question))
+    cached_answer = llm_cache.get("review_answer", answer_key)
+    if cached_answer is not None:
+        yield from replay_chunks(cached_answer)
+        return
+
+    # 2. LLM 모델 초기화
     if "OPENAI_API_KEY" not in os.environ:
         yield "오류: OPENAI_API_KEY 환경 변수가 설정되지 않았습니다. .env 파일을 확인해주세요."
         return
     try:
-        gpt = ChatOpenAI(temperature=0, model_name="gpt-4.1-mini")
+        from langchain_openai import ChatOpenAI  # 처음 사용할 때 불러옵니다. (import 비용이 큼)
+        gpt = ChatOpenAI(temperature=0, model_name=ANSWER_MODEL_NAME, stream_usage=True)
     except Exception as e:
         yield f"ChatOpenAI 모델 초기화 중 오류 발생: {e}"
         return
 
-    # 2. 컨텍스트로 사용할 블로그 본문 전체 합치기
-    full_text = ""
-    for i, review in enumerate(reviews_data):
-        content = review.get("content", "")
-        if "본문 내용을 찾을 수 없습니다" in content or "페이지에 접근하는 중 오류" in content:
-            continue
-        full_text += f"--- 블로그 후기 {i+1} ---\n\n{content}\n\n"
-
-    if not full_text.strip():
+    # 3. 질문과 관련된 후기 문단만 골라 컨텍스트로 사용 (색인은 검색 결과마다 한 번만 생성)
+    passages = review_index.search(question)
+    if not passages:
         yield "답변을 생성할 유효한 블로그 본문이 없습니다."
         return
 
-    # 3. LLM에 전달할 프롬프트 구성
+    context_text = "\n\n".join(f"[블로그 후기 {post_number}] {text}" for post_number, text in passages)
+
+    # 4. LLM에 전달할 프롬프트 구성
     prompt = f"""
-    당신은 다음 '블로그 후기 모음' 내용을 완벽하게 숙지한 친절한 안내원입니다.
-    사용자의 '질문'에 대해, 반드시 '블로그 후기 모음' 안에서만 근거를 찾아 답변해야 합니다.
+    당신은 다음 '블로그 후기 발췌' 내용을 완벽하게 숙지한 친절한 안내원입니다.
+    사용자의 '질문'에 대해, 반드시 '블로그 후기 발췌' 안에서만 근거를 찾아 답변해야 합니다.
     후기 내용에 질문에 대한 정보가 명확하게 없는 경우, "후기 내용만으로는 알 수 없습니다."라고 솔직하게 답변해주세요.
     절대로 당신의 기존 지식을 사용하거나 정보를 추측해서는 안 됩니다.
 
-    --- 블로그 후기 모음 ---
-    {full_text}
+    --- 블로그 후기 발췌 (질문과 관련된 부분) ---
+    {context_text}
     ---
 
     사용자의 질문: "{question}"
@@ -352,14 +337,18 @@ def answer_question_from_reviews_stream(question: str, reviews_data: list):
     --- 답변 (블로그 후기 기반) ---
     """
 
-    # 4. LLM 스트리밍 호출 및 결과 반환
+    # 5. LLM 스트리밍 호출 및 결과 반환
     try:
         answer_stream = gpt.stream(prompt)
 
         full_answer = ""
+        tokens = 0
         for chunk in answer_stream:
             full_answer += chunk.content
+            tokens += usage_tokens(chunk)
             yield full_answer
+
+        llm_cache.put("review_answer", answer_key, full_answer, tokens=tokens)
             
     except Exception as e:
         yield f"챗봇 답변 생성 중 오류가 발생했습니다: {e}"
@@ -0,0 +1,70 @@
+import os
+import sqlite3
+import threading
+
+STORE_DIR = os.path.join(os.path.dirname(__file__), "trend_cache")
+STORE_PATH = os.path.join(STORE_DIR, "datalab_trends.sqlite3")
+
+class TrendStore:
+    """데이터랩 트렌드 값을 (keyword, timeUnit, period) 단위로 보관하는 SQLite 저장소.
+
+    한 키워드의 값은 모두 같은 기준(scale)으로 저장되어 있어야 하며, 새 구간을 추가할 때
+    기준을 맞추는 일은 호출하는 쪽(datalab.get_naver_trends)이 담당합니다.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS trend ("
+                " keyword TEXT NOT NULL, time_unit TEXT NOT NULL, period TEXT NOT NULL, ratio REAL NOT NULL,"
+                " PRIMARY KEY (keyword, time_unit, period))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get_series(self, keyword, time_unit, start_period=None, end_period=None):
+        """저장된 값을 {period: ratio}로 반환합니다. (기간을 주면 그 구간만)"""
+        query = "SELECT period, ratio FROM trend WHERE keyword = ? AND time_unit = ?"
+        params = [keyword, time_unit]
+        if start_period:
+            query += " AND period >= ?"
+            params.append(start_period)
+        if end_period:
+            query += " AND period <= ?"
+            params.append(end_period)
+        with self._lock:
+            return dict(self._connect().execute(query, params).fetchall())
+
+    def bounds(self, keyword, time_unit):
+        """저장된 가장 이른/늦은 period를 반환합니다. 없으면 (None, None)."""
+        with self._lock:
+            return self._connect().execute(
+                "SELECT MIN(period), MAX(period) FROM trend WHERE keyword = ? AND time_unit = ?", (keyword, time_unit)
+            ).fetchone()
+
+    def put_series(self, keyword, time_unit, series):
+        """{period: ratio}를 저장합니다. 같은 period는 덮어씁니다."""
+        if not series:
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO trend (keyword, time_unit, period, ratio) VALUES (?, ?, ?, ?)",
+                [(keyword, time_unit, period, float(ratio)) for period, ratio in series.items()],
+            )
+            conn.commit()
+
+    def delete_keyword(self, keyword, time_unit):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM trend WHERE keyword = ? AND time_unit = ?", (keyword, time_unit))
+            conn.commit()
+
+trend_store = TrendStore()
@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+from .seoul_api import fetch_all_raw_rows, build_seoul_frame
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), "seoul_cache")
+CACHE_PATH = os.path.join(CACHE_DIR, "tb_vw_attractions.json")
+REFRESH_INTERVAL_SECONDS = int(os.getenv("SEOUL_REFRESH_INTERVAL_SECONDS", 6 * 60 * 60))
+
+def _row_key(row):
+    return f"{row.get('POST_SN')}:{row.get('LANG_CODE_ID')}"
+
+def _row_hash(row):
+    return hashlib.sha1(json.dumps(row, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def _dataset_version(row_hashes):
+    digest = hashlib.sha1()
+    for key in sorted(row_hashes):
+        digest.update(f"{key}={row_hashes[key]}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+class SeoulDatasetCache:
+    """서울시 관광지 데이터셋을 메모리와 디스크에 보관하고, 백그라운드에서 주기적으로 갱신합니다.
+
+    갱신 시 row 단위 해시를 비교하여 실제로 바뀐 내용이 있을 때만 데이터셋 버전을 올립니다.
+    """
+
+    def __init__(self, path=CACHE_PATH, refresh_interval=REFRESH_INTERVAL_SECONDS):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._attempted = threading.Event()  # 첫 로드 시도(성공/실패 무관)가 끝났는지
+        self._frame = build_seoul_frame([])
+        self._row_hashes = {}
+        self.version = None
+        self.fetched_at = 0.0
+        self.last_change = {}
+        self._refresher = None
+
+    # --- 디스크 영속화 ---
+    def _load_from_disk(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"[SeoulDatasetCache] 캐시 파일을 읽는 중 오류: {e}")
+            return False
+
+        rows = snapshot.get("rows", [])
+        if not rows:
+            return False
+        self._swap(rows, {_row_key(r): _row_hash(r) for r in rows}, snapshot.get("fetched_at", 0.0))
+        print(f"[SeoulDatasetCache] 디스크 캐시에서 {len(rows)}개 row 로드 (버전 {self.version})")
+        return True
+
+    def _save_to_disk(self, rows):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fetched_at": self.fetched_at, "version": self.version, "rows": rows}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _swap(self, rows, row_hashes, fetched_at):
+        frame = build_seoul_frame(rows)
+        with self._lock:
+            self._frame = frame
+            self._row_hashes = row_hashes
+            self.version = _dataset_version(row_hashes)
+            self.fetched_at = fetched_at
+        self._loaded.set()
+
+    # --- 갱신 ---
+    def refresh(self):
+        """API에서 전체 데이터셋을 다시 받아 변경된 row가 있을 때만 교체합니다. 변경 여부를 반환합니다."""
+        with self._refresh_lock:
+            # 일부 구간만 받은 데이터로 교체하면 row가 삭제된 것처럼 보이므로, 구간 하나라도 실패하면 기존 데이터를 유지합니다.
+            try:
+                rows = fetch_all_raw_rows(strict=True)
+            except RuntimeError as e:
+                print(f"[SeoulDatasetCache] 갱신 실패: {e}")
+                return False
+            if not rows:
+                print("[SeoulDatasetCache] 갱신 실패: API에서 데이터를 받지 못해 기존 데이터를 유지합니다.")
+                return False
+
+            new_hashes = {_row_key(r): _row_hash(r) for r in rows}
+            old_hashes = self._row_hashes
+            added = new_hashes.keys() - old_hashes.keys()
+            removed = old_hashes.keys() - new_hashes.keys()
+            changed = {k for k in new_hashes.keys() & old_hashes.keys() if new_hashes[k] != old_hashes[k]}
+            self.last_change = {"added": len(added), "removed": len(removed), "changed": len(changed)}
+
+            if self._loaded.is_set() and not (added or removed or changed):
+                self.fetched_at = time.time()
+                print("[SeoulDatasetCache] 변경된 row가 없어 기존 데이터셋을 유지합니다.")
+                return False
+
+            self._swap(rows, new_hashes, time.time())
+            try:
+                self._save_to_disk(rows)
+            except Exception as e:
+                print(f"[SeoulDatasetCache] 캐시 파일 저장 중 오류: {e}")
+            print(f"[SeoulDatasetCache] 데이터셋 갱신 완료 (버전 {self.version}, {self.last_change})")
+            return True
+
+    def _refresh_loop(self):
+        while True:
+            stale_for = time.time() - self.fetched_at
+            if not self._loaded.is_set() or stale_for >= self.refresh_interval:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"[SeoulDatasetCache] 백그라운드 갱신 중 오류: {e}")
+            self._attempted.set()
+            time.sleep(max(60, self.refresh_interval - (time.time() - self.fetched_at)))
+
+    def start(self):
+        """디스크 캐시를 읽고 백그라운드 갱신 스레드를 시작합니다. 여러 번 호출해도 한 번만 시작됩니다."""
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._refresher = threading.Thread(target=self._refresh_loop, name="seoul-dataset-refresh", daemon=True)
+        self._load_from_disk()
+        self._refresher.start()
+
+    # --- 조회 ---
+    def get_snapshot(self, timeout=None):
+        """(버전, 데이터셋 DataFrame)을 함께 반환합니다. 아직 한 번도 로드되지 않았다면 첫 로드 시도를 기다립니다."""
+        if not self._loaded.is_set():
+            self.start()
+            self._attempted.wait(timeout)
+        with self._lock:
+            return self.version, self._frame
+
+    def get_frame(self, timeout=None):
+        """현재 데이터셋을 컬럼형 DataFrame으로 반환합니다."""
+        return self.get_snapshot(timeout)[1]
+
+    def is_ready(self):
+        return self._loaded.is_set()
+
+seoul_dataset = SeoulDatasetCache()
@@ -0,0 +1,279 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+
+from .dataset_cache import CACHE_DIR, seoul_dataset
+from .seoul_api import DERIVED_ADDRESS_COLUMN
+
+LINKS_PATH = os.path.join(CACHE_DIR, "tourapi_links.json")
+SEOUL_AREA_CODE = 1
+TOURAPI_REFRESH_INTERVAL_SECONDS = int(os.getenv("SEOUL_TOURAPI_LINK_REFRESH_SECONDS", 24 * 60 * 60))
+CHECK_INTERVAL_SECONDS = 10 * 60
+
+# 매칭 점수 가중치와 기준값
+TITLE_WEIGHT, ADDRESS_WEIGHT, PHONE_WEIGHT = 0.6, 0.25, 0.15
+MATCH_THRESHOLD = 0.6
+MIN_TITLE_SIMILARITY = 0.5  # 전화번호가 일치하지 않으면 이름이 이 정도는 비슷해야 함
+MIN_SHARED_GRAMS = 2
+
+# 링크에 함께 저장하여 서울 탭에서 바로 쓸 TourAPI 필드
+LINKED_TOUR_FIELDS = ("contentid", "contenttypeid", "title", "addr1", "mapx", "mapy", "firstimage", "firstimage2")
+
+# --- 정규화 ---
+BRACKET_RE = re.compile(r"\(.*?\)|\[.*?\]|<.*?>")
+NON_WORD_RE = re.compile(r"[^0-9a-z가-힣]")
+SEOUL_PREFIX_RE = re.compile(r"^\s*서울(특별시|시)?")
+SIGUNGU_RE = re.compile(r"([가-힣]{1,4}구)(?:\s|$)")
+
+def normalize_title(title):
+    if not title:
+        return ""
+    return NON_WORD_RE.sub("", BRACKET_RE.sub("", str(title)).lower())
+
+def normalize_address(address):
+    if not address:
+        return ""
+    address = SEOUL_PREFIX_RE.sub("", BRACKET_RE.sub("", str(address)))
+    return NON_WORD_RE.sub("", address.lower())
+
+def normalize_phone(phone):
+    digits = re.sub(r"\D", "", str(phone or ""))
+    if digits.startswith("82"):
+        digits = "0" + digits[2:]
+    return digits if len(digits) >= 7 else ""
+
+def sigungu_of(address):
+    """주소에서 자치구 이름(예: 종로구)을 뽑아 블로킹 키로 사용합니다."""
+    match = SIGUNGU_RE.search(SEOUL_PREFIX_RE.sub("", str(address or "")) + " ")
+    return match.group(1) if match else ""
+
+def char_ngrams(text, n=2):
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+def dice(a, b):
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+class _Record:
+    """매칭에 필요한 정규화 필드만 담은 레코드."""
+    __slots__ = ("key", "title", "address", "phone", "sigungu", "grams", "address_grams", "fingerprint")
+
+    def __init__(self, key, title, address, phone):
+        self.key = key
+        self.title = normalize_title(title)
+        self.address = normalize_address(address)
+        self.phone = normalize_phone(phone)
+        self.sigungu = sigungu_of(address)
+        self.grams = char_ngrams(self.title)
+        self.address_grams = char_ngrams(self.address)
+        self.fingerprint = hashlib.sha1(f"{self.title}|{self.address}|{self.phone}".encode("utf-8")).hexdigest()
+
+def _score(seoul, tour):
+    title_sim = 1.0 if seoul.title and seoul.title == tour.title else dice(seoul.grams, tour.grams)
+    phone_match = bool(seoul.phone) and seoul.phone == tour.phone
+    if title_sim < MIN_TITLE_SIMILARITY and not phone_match:
+        return 0.0
+    address_sim = dice(seoul.address_grams, tour.address_grams)
+    return TITLE_WEIGHT * title_sim + ADDRESS_WEIGHT * address_sim + PHONE_WEIGHT * float(phone_match)
+
+class _TourBlocks:
+    """TourAPI 레코드를 (자치구, 이름 2-gram) 블록과 전화번호로 색인하여 후보만 비교하게 합니다."""
+
+    def __init__(self, tour_records):
+        self.records = tour_records
+        self.by_block = {}
+        self.by_phone = {}
+        for record in tour_records.values():
+            for gram in record.grams:
+                self.by_block.setdefault((record.sigungu, gram), []).append(record.key)
+            if record.phone:
+                self.by_phone.setdefault(record.phone, []).append(record.key)
+
+    def candidates(self, seoul):
+        shared = {}
+        for gram in seoul.grams:
+            for key in self.by_block.get((seoul.sigungu, gram), ()):
+                shared[key] = shared.get(key, 0) + 1
+        needed = min(MIN_SHARED_GRAMS, len(seoul.grams))
+        keys = {key for key, count in shared.items() if count >= needed}
+        keys.update(self.by_phone.get(seoul.phone, ()) if seoul.phone else ())
+        return [self.records[key] for key in keys]
+
+    def best_match(self, seoul):
+        best, best_score = None, 0.0
+        for tour in self.candidates(seoul):
+            score = _score(seoul, tour)
+            if score > best_score:
+                best, best_score = tour, score
+        return (best, best_score) if best_score >= MATCH_THRESHOLD else (None, best_score)
+
+def seoul_records_from_frame(frame):
+    """서울 데이터셋 DataFrame에서 POST_SN별 매칭 레코드를 만듭니다."""
+    records = {}
+    columns = [frame.get(name) for name in ("POST_SN", "POST_SJ", DERIVED_ADDRESS_COLUMN, "CMMN_TELNO")]
+    if any(column is None for column in columns):
+        return records
+    for post_sn, title, address, phone in zip(*columns):
+        if isinstance(post_sn, str) and post_sn and post_sn not in records:
+            records[post_sn] = _Record(post_sn, title, address if isinstance(address, str) else "", phone if isinstance(phone, str) else "")
+    return records
+
+def tour_records_from_items(items):
+    return {
+        str(item["contentid"]): _Record(str(item["contentid"]), item.get("title"), item.get("addr1"), item.get("tel"))
+        for item in items if isinstance(item, dict) and item.get("contentid")
+    }
+
+def harvest_seoul_tour_items():
+    """TourAPI areaBasedList2에서 서울(areaCode=1) 전체 목록을 수집합니다."""
+    from modules.tour_api_search.area_search.harvest import ListHarvester
+    from utils import common_params
+
+    harvester = ListHarvester("areaBasedList2", {**common_params, "areaCode": SEOUL_AREA_CODE})
+    items = harvester.collect()
+    if harvester.failed_pages:
+        raise RuntimeError(f"TourAPI 페이지 {harvester.failed_pages} 수집 실패")
+    return items
+
+class SeoulTourLinker:
+    """서울시 POST_SN과 TourAPI contentid를 연결하는 조인 테이블을 만들고 디스크에 보관합니다.
+
+    서울 쪽은 매칭 필드 지문이 바뀐 레코드만, TourAPI 쪽은 바뀐 항목이 속한 자치구의
+    서울 레코드만 다시 매칭하여 점진적으로 갱신합니다.
+    """
+
+    def __init__(self, path=LINKS_PATH, tour_refresh_interval=TOURAPI_REFRESH_INTERVAL_SECONDS):
+        self.path = path
+        self.tour_refresh_interval = tour_refresh_interval
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.links = {}  # POST_SN -> {contentid, score, ...LINKED_TOUR_FIELDS}
+        self._seoul_fingerprints = {}
+        self._tour_items = {}
+        self._tour_fingerprints = {}
+        self.tour_fetched_at = 0.0
+        self.seoul_version = None
+        self.last_run = {}
+        self._worker = None
+        self._load_from_disk()
+
+    # --- 디스크 영속화 ---
+    def _load_from_disk(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"[SeoulTourLinker] 링크 파일을 읽는 중 오류: {e}")
+            return
+        self.links = snapshot.get("links", {})
+        self._seoul_fingerprints = snapshot.get("seoul_fingerprints", {})
+        self._tour_items = snapshot.get("tour_items", {})
+        self._tour_fingerprints = snapshot.get("tour_fingerprints", {})
+        self.tour_fetched_at = snapshot.get("tour_fetched_at", 0.0)
+        self.seoul_version = snapshot.get("seoul_version")
+
+    def _save_to_disk(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "seoul_version": self.seoul_version,
+                "tour_fetched_at": self.tour_fetched_at,
+                "links": self.links,
+                "seoul_fingerprints": self._seoul_fingerprints,
+                "tour_items": self._tour_items,
+                "tour_fingerprints": self._tour_fingerprints,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    # --- 매칭 ---
+    def refresh(self, frame, version=None, tour_items=None):
+        """서울 데이터셋(frame)과 TourAPI 목록(tour_items, 없으면 기존 목록)으로 링크를 갱신합니다."""
+        with self._refresh_lock:
+            seoul_records = seoul_records_from_frame(frame)
+            rematch = {key for key, record in seoul_records.items()
+                       if self._seoul_fingerprints.get(key) != record.fingerprint}
+
+            tour_items_by_id = self._tour_items
+            if tour_items is not None:
+                tour_items_by_id = {str(item["contentid"]): {field: item.get(field) for field in LINKED_TOUR_FIELDS + ("tel",)}
+                                    for item in tour_items if isinstance(item, dict) and item.get("contentid")}
+            tour_records = tour_records_from_items(tour_items_by_id.values())
+
+            # TourAPI 쪽에서 추가/삭제/변경된 항목이 있으면, 그 항목(이전/현재)이 속한 자치구와
+            # 그 항목에 연결돼 있던 서울 레코드를 다시 매칭합니다.
+            new_tour_fingerprints = {key: record.fingerprint for key, record in tour_records.items()}
+            changed_tour = {key for key in new_tour_fingerprints.keys() | self._tour_fingerprints.keys()
+                            if new_tour_fingerprints.get(key) != self._tour_fingerprints.get(key)}
+            if changed_tour:
+                affected_sigungu = {tour_records[key].sigungu for key in changed_tour if key in tour_records}
+                affected_sigungu |= {sigungu_of(self._tour_items[key].get("addr1")) for key in changed_tour if key in self._tour_items}
+                rematch |= {key for key, record in seoul_records.items() if record.sigungu in affected_sigungu}
+                rematch |= {key for key, link in self.links.items() if link.get("contentid") in changed_tour}
+
+            links = {key: link for key, link in self.links.items() if key in seoul_records and key not in rematch}
+            blocks = _TourBlocks(tour_records)
+            for key in rematch:
+                match, score = blocks.best_match(seoul_records[key])
+                if match is not None:
+                    tour_item = tour_items_by_id[match.key]
+                    links[key] = {**{field: tour_item.get(field) for field in LINKED_TOUR_FIELDS}, "score": round(score, 3)}
+
+            with self._lock:
+                self.links = links
+                self._seoul_fingerprints = {key: record.fingerprint for key, record in seoul_records.items()}
+                self._tour_items = tour_items_by_id
+                self._tour_fingerprints = new_tour_fingerprints
+                self.seoul_version = version
+                if tour_items is not None:
+                    self.tour_fetched_at = time.time()
+            self.last_run = {"rematched": len(rematch), "linked": len(links), "seoul": len(seoul_records), "tour": len(tour_records)}
+
+            try:
+                self._save_to_disk()
+            except Exception as e:
+                print(f"[SeoulTourLinker] 링크 파일 저장 중 오류: {e}")
+            print(f"[SeoulTourLinker] 링크 갱신 완료 {self.last_run}")
+            return self.last_run
+
+    def _refresh_loop(self):
+        while True:
+            try:
+                version, frame = seoul_dataset.get_snapshot()
+                tour_stale = time.time() - self.tour_fetched_at >= self.tour_refresh_interval
+                if len(frame) and (tour_stale or version != self.seoul_version):
+                    tour_items = None
+                    if tour_stale:
+                        try:
+                            tour_items = harvest_seoul_tour_items()
+                        except Exception as e:
+                            print(f"[SeoulTourLinker] TourAPI 목록 수집 실패, 기존 목록으로 매칭합니다: {e}")
+                    if tour_items is not None or self._tour_items:
+                        self.refresh(frame, version, tour_items)
+            except Exception as e:
+                print(f"[SeoulTourLinker] 백그라운드 갱신 중 오류: {e}")
+            time.sleep(CHECK_INTERVAL_SECONDS)
+
+    def start(self):
+        """백그라운드 갱신 스레드를 시작합니다. 여러 번 호출해도 한 번만 시작됩니다."""
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(target=self._refresh_loop, name="seoul-tourapi-linker", daemon=True)
+        self._worker.start()
+
+    # --- 조회 ---
+    def get_link(self, post_sn):
+        """POST_SN에 연결된 TourAPI 항목 정보를 반환합니다. (없으면 None)"""
+        with self._lock:
+            return self.links.get(post_sn)
+
+seoul_tour_links = SeoulTourLinker()
@@ -0,0 +1,194 @@
+import re
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .dataset_cache import seoul_dataset
+from .seoul_api import DERIVED_ADDRESS_COLUMN, raw_columns, frame_row_to_raw
+
+# 태그/이름/주소를 토큰으로 나눌 때 사용하는 구분자 (쉼표, 공백, 괄호, 해시 등)
+TOKEN_SPLIT_RE = re.compile(r"[\s,#/()\[\]{}·|;:]+")
+SEARCH_CACHE_SIZE = 256  # 색인 한 버전에서 기억할 (카테고리, 질의) 결과 수
+
+TITLE_COLUMN = "POST_SJ"
+TAG_COLUMN = "TAG"
+POST_SN_COLUMN = "POST_SN"
+
+def tokenize(text):
+    if not isinstance(text, str) or not text:
+        return []
+    return [token for token in TOKEN_SPLIT_RE.split(text.lower()) if token]
+
+def _column(frame, name):
+    if name in frame.columns:
+        return frame[name]
+    return pd.Series(None, index=frame.index, dtype=object)
+
+class SeoulIndex:
+    """서울시 관광지 데이터셋(DataFrame) 한 버전에 대한 색인과 조회 테이블.
+
+    - 카테고리 필터: TAG 컬럼을 고유값 코드로 나누어, 키워드를 포함하는 고유 태그 문자열만
+      찾은 뒤 코드 비교로 행을 고릅니다. (기존 `keyword in tags`와 같은 결과)
+    - text_postings: TAG/이름/주소 토큰 -> 행 위치 집합 (자유 키워드 검색용)
+    - by_title / by_post_sn: 상세 조회용 테이블
+
+    검색 결과는 데이터셋 순서대로 정렬된 행 위치 배열이며, 키워드별 결과는 메모이즈합니다.
+    """
+
+    def __init__(self, frame, version=None):
+        self.frame = frame
+        self.version = version
+        self.text_postings = {}
+        self.by_title = {}
+        self.by_post_sn = {}
+        self._tag_cache = {}
+        self._text_cache = {}
+        self._search_cache = {}
+        self._cache_lock = threading.Lock()
+        self._nbytes = None
+
+        tags = _column(frame, TAG_COLUMN)
+        self._tag_codes, tag_values = pd.factorize(tags)
+        self._tag_values = [str(value) for value in tag_values]
+
+        titles = _column(frame, TITLE_COLUMN)
+        for position, (title, post_sn, address, tag) in enumerate(zip(
+            titles, _column(frame, POST_SN_COLUMN), _column(frame, DERIVED_ADDRESS_COLUMN), tags
+        )):
+            if isinstance(title, str) and title and title not in self.by_title:  # 동일한 이름은 첫 항목을 사용
+                self.by_title[title] = position
+            if post_sn is not None and post_sn == post_sn and post_sn not in self.by_post_sn:
+                self.by_post_sn[post_sn] = position
+
+            for token in tokenize(tag) + tokenize(title) + tokenize(address):
+                self.text_postings.setdefault(token, set()).add(position)
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def nbytes(self):
+        """DataFrame과 검색용 역색인의 대략적인 메모리 크기. (버전마다 한 번만 계산)"""
+        if self._nbytes is None:
+            postings = sys.getsizeof(self.text_postings) + sum(
+                sys.getsizeof(token) + sys.getsizeof(positions) for token, positions in self.text_postings.items()
+            )
+            self._nbytes = int(self.frame.memory_usage(index=True, deep=True).sum()) + postings
+        return self._nbytes
+
+    def _cached(self, cache, key, compute):
+        with self._cache_lock:
+            cached = cache.get(key)
+        if cached is not None:
+            return cached
+        value = compute()
+        with self._cache_lock:
+            if len(cache) >= SEARCH_CACHE_SIZE:
+                cache.clear()
+            cache[key] = value
+        return value
+
+    def positions_for_tags(self, keywords):
+        """키워드 중 하나라도 TAG에 포함된 행 위치 배열 (OR)."""
+        def compute():
+            matched_codes = [code for code, value in enumerate(self._tag_values) if any(k in value for k in keywords)]
+            return np.flatnonzero(np.isin(self._tag_codes, matched_codes))
+        return self._cached(self._tag_cache, tuple(keywords), compute)
+
+    def _positions_for_token(self, token):
+        """token을 부분 문자열로 포함하는 모든 토큰의 행 위치 집합."""
+        def compute():
+            matched = set()
+            for vocab_token, positions in self.text_postings.items():
+                if token in vocab_token:
+                    matched |= positions
+            return frozenset(matched)
+        return self._cached(self._text_cache, token, compute)
+
+    def positions_for_query(self, query):
+        """질의의 모든 토큰이 TAG/이름/주소 중 어딘가에 포함된 행 위치 배열 (AND)."""
+        result = None
+        for token in tokenize(query):
+            matched = self._positions_for_token(token)
+            result = set(matched) if result is None else result & matched
+            if not result:
+                break
+        if result is None:
+            return np.arange(len(self.frame))
+        return np.array(sorted(result), dtype=np.int64)
+
+    def search(self, keywords=None, query=None):
+        """카테고리 키워드(OR)와 자유 키워드(AND)를 모두 만족하는 결과를 반환합니다.
+
+        keywords가 None이면 카테고리 조건을 적용하지 않고, 빈 리스트면 아무것도 일치하지 않습니다.
+        """
+        query = " ".join(tokenize(query))
+        if keywords is None and not query:
+            return SeoulResults(self, np.arange(len(self.frame)))
+
+        def compute():
+            positions = None
+            if keywords is not None:
+                positions = self.positions_for_tags(keywords)
+            if query:
+                query_positions = self.positions_for_query(query)
+                positions = query_positions if positions is None else np.intersect1d(positions, query_positions)
+            return positions
+        return SeoulResults(self, self._cached(self._search_cache, (None if keywords is None else tuple(keywords), query), compute))
+
+    def get_by_title(self, title):
+        """이름으로 원본 row(dict)를 찾습니다."""
+        position = self.by_title.get(title)
+        return frame_row_to_raw(self.frame, position) if position is not None else None
+
+    def get_by_post_sn(self, post_sn):
+        position = self.by_post_sn.get(post_sn)
+        return frame_row_to_raw(self.frame, position) if position is not None else None
+
+class SeoulResults:
+    """색인 검색 결과. 데이터셋을 복사하지 않고 행 위치 배열만 들고 있습니다."""
+
+    def __init__(self, index, positions):
+        self.index = index
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return SeoulResults(self.index, self.positions[key])
+        return frame_row_to_raw(self.index.frame, int(self.positions[key]))
+
+    @property
+    def nbytes(self):
+        """결과 자체(행 위치 배열)의 크기. 붙잡고 있는 색인은 shared_usage로 따로 계산합니다."""
+        return self.positions.nbytes
+
+    def shared_usage(self):
+        """결과 저장소에 넘길 (색인 키, 색인 크기). 같은 색인을 참조하는 결과들은 한 번만 계산됩니다."""
+        return f"seoul_index:{id(self.index)}", self.index.nbytes
+
+    def to_frame(self, raw_only=True):
+        """결과 행만 담은 DataFrame을 반환합니다. raw_only면 원본 API 컬럼만 포함합니다."""
+        frame = self.index.frame
+        columns = raw_columns(frame) if raw_only else list(frame.columns)
+        return frame.iloc[self.positions][columns]
+
+    def titles(self):
+        titles = _column(self.index.frame, TITLE_COLUMN).iloc[self.positions]
+        return [title for title in titles if isinstance(title, str) and title]
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_seoul_index(timeout=None):
+    """현재 데이터셋 버전의 색인을 반환합니다. 버전이 바뀐 경우에만 다시 만듭니다."""
+    global _index
+    version, frame = seoul_dataset.get_snapshot(timeout)
+    with _index_lock:
+        if _index is None or _index.version != version or _index.frame is not frame:
+            _index = SeoulIndex(frame, version)
+        return _index
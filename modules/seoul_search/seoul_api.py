@@ -1,141 +1,150 @@
-import requests
 import os
+import math
+import pandas as pd
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http_client import get_session
 
 # 사용자가 제공한 API 키
 SEOUL_TOUR_API_KEY = os.getenv("SEOUL_TOUR_API_KEY")
 BASE_URL = f"http://openapi.seoul.go.kr:8088/{SEOUL_TOUR_API_KEY}/json/TbVwAttractions"
 
-def _process_raw_items(raw_items):
-    """API에서 받은 원본 아이템 리스트를 가공하고, 원본도 함께 보존합니다."""
-    ko_items = [item for item in raw_items if item.get('LANG_CODE_ID') == 'ko']
-    
-    items_to_process = ko_items if ko_items else list({item['POST_SN']: item for item in raw_items}.values())
-
-    final_items = []
-    for item in items_to_process:
-        processed_item = {
-            'contentid': item.get('POST_SN'),
-            'title': item.get('POST_SJ'),
-            'addr1': item.get('NEW_ADDRESS') or item.get('ADDRESS'),
-            'tel': item.get('CMMN_TELNO'),
-            'tags': item.get('TAG'),
-            'firstimage': None, 
-            'firstimage2': None,
-            'mapx': None,
-            'mapy': None
-        }
-        # 원본 데이터와 가공된 데이터를 함께 저장
-        final_items.append({
-            'raw': item,
-            'processed': processed_item
-        })
-    return final_items
-
-def fetch_attractions(page_no=1, num_of_rows=12):
-    """
-    서울 열린 데이터 광장 API를 사용하여 특정 페이지의 관광 명소 정보를 가져옵니다.
-    """
-    start_index = (page_no - 1) * num_of_rows + 1
-    end_index = page_no * num_of_rows
-    url = f"{BASE_URL}/{start_index}/{end_index}/"
+# --- 컬럼형 데이터셋 ---
+DERIVED_ADDRESS_COLUMN = "addr1"  # NEW_ADDRESS가 비어 있으면 ADDRESS로 채운 주소
+CATEGORY_MAX_RATIO = 0.5  # 고유값 비율이 이 값 이하인 문자열 컬럼은 category로 저장
 
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-
-        if 'TbVwAttractions' not in data or 'row' not in data['TbVwAttractions']:
-            if 'RESULT' in data:
-                print(f"API Error: {data['RESULT'].get('CODE')} - {data['RESULT'].get('MESSAGE')}")
-            else:
-                print("API 응답에서 'TbVwAttractions' 또는 'row'를 찾을 수 없습니다.")
-            return {'items': [], 'totalCount': 0}
-
-        total_count = data['TbVwAttractions'].get('list_total_count', 0)
-        processed_items = _process_raw_items(data['TbVwAttractions']['row'])
-
-        return {
-            'items': processed_items,
-            'totalCount': total_count
-        }
-
-    except requests.exceptions.RequestException as e:
-        print(f"Request failed: {e}")
-        return {'items': [], 'totalCount': 0}
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        return {'items': [], 'totalCount': 0}
+def build_seoul_frame(raw_items):
+    """원본 row(리스트 또는 스트림)를 한국어 row만 남긴 컬럼형 DataFrame으로 만듭니다.
 
-import math
-
-def get_all_seoul_data():
+    한국어 row가 없으면 POST_SN 기준으로 중복을 제거합니다. (같은 POST_SN은 마지막 row 사용)
+    반복되는 값이 많은 문자열 컬럼(언어 코드, 태그, 요일 등)은 category로 변환해 메모리를 줄입니다.
     """
-    서울 열린 데이터 광장 API에서 페이지네이션을 통해 모든 관광 명소 데이터를 가져옵니다.
-    필터링을 위한 전체 데이터 소스로 사용됩니다.
-    """
-    all_items = []
-    page_size = 1000  # API가 한 번에 반환할 수 있는 최대 레코드 수
-    start_index = 1
-
-    # 1. 첫 호출로 전체 카운트 가져오기
-    try:
-        initial_url = f"{BASE_URL}/{start_index}/{start_index}/"
-        response = requests.get(initial_url)
-        response.raise_for_status()
-        data = response.json()
-        
-        if 'TbVwAttractions' not in data or 'list_total_count' not in data['TbVwAttractions']:
-            print("API 응답에서 전체 데이터 수를 가져올 수 없습니다.")
-            return []
-            
-        total_count = data['TbVwAttractions']['list_total_count']
-        if total_count == 0:
-            return []
-
-    except requests.exceptions.RequestException as e:
-        print(f"Initial request failed: {e}")
-        return []
-    except Exception as e:
-        print(f"An error occurred during initial fetch: {e}")
-        return []
-
-    # 2. 전체 카운트를 기반으로 모든 페이지 순회
-    total_pages = math.ceil(total_count / page_size)
-    
-    for page in range(total_pages):
-        start = page * page_size + 1
-        end = start + page_size - 1
-        url = f"{BASE_URL}/{start}/{end}/"
-        
-        print(f"Fetching page {page + 1}/{total_pages} (rows {start}-{end})...")
-        
+    df = pd.DataFrame.from_records(raw_items)
+    if df.empty:
+        return df
+
+    if 'LANG_CODE_ID' in df.columns:
+        is_ko = df['LANG_CODE_ID'].eq('ko')
+        if is_ko.any():
+            df = df[is_ko]
+        elif 'POST_SN' in df.columns:
+            df = df.drop_duplicates('POST_SN', keep='last')
+    df = df.reset_index(drop=True)
+
+    new_address = df.get('NEW_ADDRESS', pd.Series(None, index=df.index, dtype=object))
+    old_address = df.get('ADDRESS', pd.Series(None, index=df.index, dtype=object))
+    df[DERIVED_ADDRESS_COLUMN] = new_address.mask(new_address.isna() | new_address.eq(''), old_address)
+
+    for column in df.columns:
+        is_text = pd.api.types.is_object_dtype(df[column]) or pd.api.types.is_string_dtype(df[column])
+        if is_text and df[column].nunique(dropna=True) <= len(df) * CATEGORY_MAX_RATIO:
+            df[column] = df[column].astype('category')
+    return df
+
+def raw_columns(frame):
+    """가공 컬럼을 제외한 원본 API 컬럼 목록."""
+    return [column for column in frame.columns if column != DERIVED_ADDRESS_COLUMN]
+
+def frame_row_to_raw(frame, position):
+    """DataFrame의 한 행을 원본 row 형태의 dict로 되돌립니다. (결측값은 None)"""
+    raw = {}
+    for column in raw_columns(frame):
+        value = frame[column].iat[position]
+        if pd.isna(value):
+            value = None
+        elif hasattr(value, 'item'):  # numpy 스칼라는 JSON 직렬화를 위해 파이썬 값으로 변환
+            value = value.item()
+        raw[column] = value
+    return raw
+
+# --- 전체 데이터셋 병렬 수집 ---
+PAGE_SIZE = 1000  # API가 한 번에 반환할 수 있는 최대 레코드 수
+MAX_WORKERS = int(os.getenv("SEOUL_FETCH_WORKERS", 4))
+WINDOW_RETRIES = 2
+RETRY_BACKOFF_SECONDS = 0.5
+
+def _fetch_window(start, end, retries=WINDOW_RETRIES):
+    """start~end 구간의 row를 조회하여 (rows, list_total_count)를 반환합니다. 실패하면 지수 백오프로 재시도합니다."""
+    url = f"{BASE_URL}/{start}/{end}/"
+    for attempt in range(retries + 1):
         try:
-            response = requests.get(url)
+            response = get_session("seoul").get(url, timeout=30)
             response.raise_for_status()
             data = response.json()
 
-            if 'TbVwAttractions' in data and 'row' in data['TbVwAttractions']:
-                all_items.extend(data['TbVwAttractions']['row'])
-            else:
-                # 한 페이지 실패 시 다음 페이지로 계속 진행
-                print(f"Warning: Page {page + 1} fetch failed or returned no data.")
-
-        except requests.exceptions.RequestException as e:
-            print(f"Request for page {page + 1} failed: {e}")
-            continue # 오류 발생 시 다음 페이지로 넘어감
-        except Exception as e:
-            print(f"An error occurred on page {page + 1}: {e}")
-            continue
-
-    print(f"Total items fetched: {len(all_items)}")
-    return _process_raw_items(all_items)
+            block = data.get('TbVwAttractions')
+            if not block or 'row' not in block:
+                result = data.get('RESULT', {})
+                raise ValueError(f"API Error: {result.get('CODE')} - {result.get('MESSAGE')}")
+            return block['row'], block.get('list_total_count', 0)
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(RETRY_BACKOFF_SECONDS * (2 ** attempt))
+
+def iter_raw_rows(max_workers=MAX_WORKERS, strict=False):
+    """TbVwAttractions 데이터셋 전체를 원본 row 단위로 순서대로 내보냅니다.
+
+    첫 구간 응답으로 전체 개수를 확인한 뒤 나머지 구간을 동시에 받고, 도착한 구간은
+    앞 구간이 모두 나올 때까지 보관했다가 원래 순서대로 내보냅니다.
+    strict=True면 재시도 후에도 실패한 구간이 있을 때 RuntimeError를 발생시킵니다.
+    """
+    try:
+        first_rows, total_count = _fetch_window(1, PAGE_SIZE)
+    except Exception as e:
+        if strict:
+            raise RuntimeError(f"첫 구간 조회 실패: {e}") from e
+        print(f"Initial request failed: {e}")
+        return
+
+    yield from first_rows
+    fetched = len(first_rows)
+    total_pages = math.ceil(total_count / PAGE_SIZE)
+    if total_pages <= 1:
+        print(f"Total items fetched: {fetched}")
+        return
+
+    windows = {
+        page: (page * PAGE_SIZE + 1, (page + 1) * PAGE_SIZE)
+        for page in range(1, total_pages)
+    }
+    pending = {}  # 순서가 오기 전에 먼저 도착한 구간
+    next_page = 1
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="seoul-fetch") as executor:
+        futures = {executor.submit(_fetch_window, start, end): page for page, (start, end) in windows.items()}
+        for future in as_completed(futures):
+            page = futures[future]
+            try:
+                pending[page], _ = future.result()
+            except Exception as e:
+                start, end = windows[page]
+                if strict:
+                    for other in futures:
+                        other.cancel()
+                    raise RuntimeError(f"rows {start}-{end} 구간 조회 실패: {e}") from e
+                # 한 구간 실패 시 나머지 구간은 계속 진행
+                print(f"Warning: rows {start}-{end} fetch failed: {e}")
+                pending[page] = []
+
+            while next_page in pending:
+                rows = pending.pop(next_page)
+                fetched += len(rows)
+                yield from rows
+                next_page += 1
+
+    print(f"Total items fetched: {fetched}")
+
+def fetch_all_raw_rows(strict=False):
+    """TbVwAttractions 데이터셋 전체를 가공하지 않은 원본 row 리스트로 가져옵니다."""
+    return list(iter_raw_rows(strict=strict))
 
 if __name__ == '__main__':
     # 모듈 직접 실행 시 테스트
-    all_data = get_all_seoul_data(limit=5)
-    if all_data:
-        print(f"Successfully fetched {len(all_data)} items.")
-        for attraction in all_data:
-            print(attraction)
+    frame = build_seoul_frame(iter_raw_rows())
+    if len(frame):
+        print(f"Successfully fetched {len(frame)} items.")
+        for position in range(min(5, len(frame))):
+            print(frame_row_to_raw(frame, position))
     else:
-        print("Failed to fetch data or no data available.")
\ No newline at end of file
+        print("Failed to fetch data or no data available.")
@@ -1,12 +1,14 @@
 import gradio as gr
 import math
 import json
-import pandas as pd
 import tempfile
 
 # 필요한 다른 모듈들 import
-from .seoul_api import get_all_seoul_data
-from ..trend_analyzer.trend_analyzer import analyze_single_item, analyze_trends_for_titles
+from .dataset_cache import seoul_dataset
+from .index import get_seoul_index
+from .entity_resolution import seoul_tour_links
+from result_store import result_store, session_id_of
+from ..trend_analyzer.trend_analyzer import analyze_single_item, analyze_trends_for_titles, rank_titles_by_trend
 
 # UI 구성의 일관성을 위해 app.py에서 가져와 포함시킵니다.
 CONTENT_TYPE_CODES = {
@@ -32,9 +34,14 @@ CATEGORY_TO_KEYWORDS = {
 # app.py에서 옮겨온 함수들
 def create_seoul_search_ui():
     """서울시 관광정보 API용 UI 탭 (모든 기능 포함)"""
+    # 데이터셋은 앱 시작 시 한 번 로드하고, 이후에는 백그라운드에서 주기적으로 갱신합니다.
+    seoul_dataset.start()
+    seoul_tour_links.start()
+
     with gr.Blocks() as seoul_search_tab:
         # --- 상태 변수 ---
-        filtered_data_state = gr.State([])
+        # 필터링된 결과 목록은 서버의 result_store에 두고, State에는 핸들 문자열만 보관합니다.
+        results_handle_state = gr.State(None)
         current_page_state = gr.State(1)
         total_pages_state = gr.State(1)
 
@@ -42,11 +49,13 @@ def create_seoul_search_ui():
         gr.Markdown("### 서울시 관광지 검색 (카테고리별 필터링)")
         with gr.Row():
             category_dropdown = gr.Dropdown(label="카테고리", choices=list(CONTENT_TYPE_CODES.keys()), value="전체")
+            keyword_input = gr.Textbox(label="키워드", placeholder="이름, 주소, 태그로 검색 (여러 단어는 모두 포함)")
             search_btn = gr.Button("검색하기", variant="primary")
         
         with gr.Row():
             export_csv_btn = gr.Button("CSV로 내보내기")
             run_list_trend_btn = gr.Button("현재 목록 트렌드 저장하기")
+            run_list_ranking_btn = gr.Button("현재 목록 인기 순위 저장하기")
 
         places_radio = gr.Radio(label="검색된 관광지 목록", choices=[], interactive=True)
         
@@ -69,11 +78,11 @@ def create_seoul_search_ui():
         # --- 이벤트 핸들러 ---
         search_btn.click(
             fn=perform_search,
-            inputs=[category_dropdown],
-            outputs=[filtered_data_state, current_page_state, status_output, csv_file_output]
+            inputs=[category_dropdown, keyword_input],
+            outputs=[results_handle_state, current_page_state, status_output, csv_file_output]
         ).then(
             fn=update_seoul_page_view,
-            inputs=[filtered_data_state, current_page_state],
+            inputs=[results_handle_state, current_page_state],
             outputs=[
                 places_radio, pagination_row, 
                 first_page_btn, prev_page_btn, next_page_btn, last_page_btn, 
@@ -83,13 +92,19 @@ def create_seoul_search_ui():
 
         export_csv_btn.click(
             fn=export_seoul_data_to_csv,
-            inputs=[filtered_data_state],
+            inputs=[results_handle_state],
             outputs=[csv_file_output]
         )
 
         run_list_trend_btn.click(
             fn=run_seoul_list_trend_analysis,
-            inputs=[filtered_data_state],
+            inputs=[results_handle_state],
+            outputs=[status_output]
+        )
+
+        run_list_ranking_btn.click(
+            fn=run_seoul_list_trend_ranking,
+            inputs=[results_handle_state],
             outputs=[status_output]
         )
 
@@ -104,7 +119,7 @@ def create_seoul_search_ui():
         for trigger in page_change_triggers:
             trigger.then(
                 fn=update_seoul_page_view,
-                inputs=[filtered_data_state, current_page_state],
+                inputs=[results_handle_state, current_page_state],
                 outputs=[
                     places_radio, pagination_row, 
                     first_page_btn, prev_page_btn, next_page_btn, last_page_btn, 
@@ -114,42 +129,52 @@ def create_seoul_search_ui():
         
         places_radio.change(
             fn=display_details_and_analysis,
-            inputs=[places_radio, filtered_data_state],
+            inputs=[places_radio],
             outputs=[raw_json_output, pretty_output, trend_plot_output, reviews_output, details_accordion]
         )
 
     return seoul_search_tab
 
-def perform_search(category_name):
-    all_data = get_all_seoul_data()
-    if not all_data:
+def perform_search(category_name, keyword_query="", request: gr.Request = None):
+    index = get_seoul_index()
+    if not len(index):
         gr.Warning("데이터를 가져오는 데 실패했습니다. API 상태를 확인하세요.")
-        return [], 1, "", None
+        return None, 1, "", None
 
-    if category_name == "전체":
-        filtered_list = all_data
-    else:
-        keywords = CATEGORY_TO_KEYWORDS.get(category_name, [])
-        filtered_list = [item for item in all_data if item['processed'].get('tags') and any(keyword in item['processed']['tags'] for keyword in keywords)]
+    keywords = None if category_name == "전체" else CATEGORY_TO_KEYWORDS.get(category_name, [])
+    results = index.search(keywords=keywords, query=keyword_query)
     
-    if not filtered_list:
-        gr.Info(f"'{category_name}' 카테고리에 해당하는 데이터가 없습니다.")
-
-    return filtered_list, 1, "", None
-
-def update_seoul_page_view(filtered_data, page_to_go):
-    if not filtered_data:
+    if not len(results):
+        if keyword_query and keyword_query.strip():
+            gr.Info(f"'{category_name}' 카테고리에서 '{keyword_query}'에 해당하는 데이터가 없습니다.")
+        else:
+            gr.Info(f"'{category_name}' 카테고리에 해당하는 데이터가 없습니다.")
+
+    # 결과는 공유 데이터셋의 행 위치 배열입니다. 색인(과 DataFrame)은 버전마다 한 번만 계산되며,
+    # 데이터셋이 갱신된 뒤에도 이전 버전 결과가 남아 있으면 그 색인까지 한도에 포함됩니다.
+    handle = result_store.put(session_id_of(request), "seoul", results, size=results.nbytes, shared=results.shared_usage())
+    return handle, 1, "", None
+
+def _get_results(handle):
+    """핸들에 해당하는 검색 결과(SeoulResults)를 가져옵니다. 만료되었으면 다시 검색하도록 안내합니다."""
+    results = result_store.get(handle)
+    if handle and results is None:
+        gr.Warning("검색 결과가 만료되었습니다. 다시 검색해 주세요.")
+    return results
+
+def update_seoul_page_view(results_handle, page_to_go):
+    # 길이와 구간을 따로 조회하면 그 사이에 결과가 만료될 수 있으므로 한 번만 가져옵니다.
+    results = result_store.get(results_handle)
+    total_count = len(results) if results is not None else 0
+    if not total_count:
         return gr.update(choices=[], value=None), gr.update(visible=False), False, False, False, False, gr.update(choices=[], value=None), 1
 
     page_to_go = int(page_to_go)
-    total_count = len(filtered_data)
     total_pages = math.ceil(total_count / ROWS_PER_PAGE)
 
     start_idx = (page_to_go - 1) * ROWS_PER_PAGE
     end_idx = start_idx + ROWS_PER_PAGE
-    page_items = filtered_data[start_idx:end_idx]
-
-    place_titles = [item['processed']['title'] for item in page_items if item.get('processed', {}).get('title')]
+    place_titles = results[start_idx:end_idx].titles()
 
     half_window = PAGE_WINDOW_SIZE // 2
     start_page = max(1, page_to_go - half_window)
@@ -169,17 +194,16 @@ def update_seoul_page_view(filtered_data, page_to_go):
         total_pages
     )
 
-def display_details_and_analysis(selected_title, filtered_data, progress=gr.Progress(track_tqdm=True)):
+def display_details_and_analysis(selected_title, progress=gr.Progress(track_tqdm=True)):
     if not selected_title:
         return "", "", None, "", gr.update(open=False)
 
     progress(0, desc="상세 정보 로딩 중...")
-    selected_item = next((item for item in filtered_data if item.get('processed', {}).get('title') == selected_title), None)
+    raw_data = get_seoul_index().get_by_title(selected_title)
 
-    if not selected_item:
+    if not raw_data:
         return "{}", "정보를 찾을 수 없습니다.", None, "", gr.update(open=True)
 
-    raw_data = selected_item.get('raw', {})
     raw_json_str = json.dumps(raw_data, indent=2, ensure_ascii=False)
     
     KEY_MAP = {
@@ -198,6 +222,16 @@ def display_details_and_analysis(selected_title, filtered_data, progress=gr.Prog
                 pretty_str_lines.append(f"**{friendly_name}**: [{cleaned_value}]({cleaned_value})")
             else:
                 pretty_str_lines.append(f"**{friendly_name}**: {cleaned_value}")
+
+    # TourAPI 항목과 연결되어 있으면 대표 이미지와 위치 정보를 함께 보여줍니다.
+    tour_link = seoul_tour_links.get_link(raw_data.get('POST_SN'))
+    if tour_link:
+        pretty_str_lines.append(f"**TourAPI 콘텐츠 ID**: {tour_link.get('contentid')} (일치도 {tour_link.get('score')})")
+        if tour_link.get('mapx') and tour_link.get('mapy'):
+            map_url = f"https://maps.google.com/maps?q={tour_link['mapy']},{tour_link['mapx']}"
+            pretty_str_lines.append(f"**위치**: [지도에서 보기]({map_url})")
+        if tour_link.get('firstimage'):
+            pretty_str_lines.append(f"![{raw_data.get('POST_SJ', '')}]({tour_link['firstimage']})")
     pretty_str = "\n\n".join(pretty_str_lines)
 
     progress(0.5, desc="트렌드 및 후기 분석 중...")
@@ -206,15 +240,15 @@ def display_details_and_analysis(selected_title, filtered_data, progress=gr.Prog
     progress(1, desc="완료")
     return raw_json_str, pretty_str, trend_image, reviews_markdown, gr.update(open=True)
 
-def export_seoul_data_to_csv(filtered_data, progress=gr.Progress(track_tqdm=True)):
+def export_seoul_data_to_csv(results_handle, progress=gr.Progress(track_tqdm=True)):
     """현재 필터링된 서울시 데이터를 CSV 파일로 내보냅니다."""
-    if not filtered_data:
+    results = _get_results(results_handle)
+    if not results:
         gr.Warning("내보낼 데이터가 없습니다.")
         return None
     
     progress(0, desc="CSV 데이터 준비 중...")
-    raw_data_list = [item['raw'] for item in filtered_data]
-    df = pd.DataFrame(raw_data_list)
+    df = results.to_frame()
 
     progress(0.5, desc="CSV 파일 생성 중...")
     with tempfile.NamedTemporaryFile(delete=False, mode='w', suffix='.csv', prefix='seoul_attractions_', encoding='utf-8-sig') as temp_f:
@@ -223,14 +257,27 @@ def export_seoul_data_to_csv(filtered_data, progress=gr.Progress(track_tqdm=True
         progress(1, desc="완료")
         return temp_f.name
 
-def run_seoul_list_trend_analysis(filtered_data, progress=gr.Progress(track_tqdm=True)):
+def run_seoul_list_trend_analysis(results_handle, progress=gr.Progress(track_tqdm=True)):
     """현재 필터링된 목록 전체에 대한 트렌드/후기 분석을 실행하고 파일로 저장합니다."""
-    if not filtered_data:
+    results = _get_results(results_handle)
+    if not results:
         return "분석할 데이터가 없습니다."
 
-    titles = [item['processed']['title'] for item in filtered_data if item.get('processed', {}).get('title')]
+    titles = results.titles()
     if not titles:
         return "분석할 관광지 이름이 없습니다."
         
     status = analyze_trends_for_titles(titles=titles, progress=progress)
     return status
+
+def run_seoul_list_trend_ranking(results_handle, progress=gr.Progress()):
+    """현재 필터링된 목록 전체를 서로 비교 가능한 검색량 점수로 순위를 매겨 파일로 저장합니다."""
+    results = _get_results(results_handle)
+    if not results:
+        return "분석할 데이터가 없습니다."
+
+    titles = results.titles()
+    if not titles:
+        return "분석할 관광지 이름이 없습니다."
+
+    return rank_titles_by_trend(titles=titles, progress=progress)
@@ -1,10 +1,44 @@
+import os
+import time
 import asyncio
-from playwright.async_api import Page
+import functools
+import threading
 # [수정] 절대 경로 대신 안정적인 상대 경로로 변경
 from ..common import get_page_context, close_page_context, BASE_URL
+from utils import playwright_flight, request_key
 
 # This file now contains only the self-contained functions for getting dropdown options.
 
+# --- 분류 목록 캐시 ---
+# 지역/서비스 분류 목록은 거의 바뀌지 않으므로, 브라우저로 한 번 읽은 결과를 TTL 동안 재사용합니다.
+TAXONOMY_TTL_SECONDS = int(os.getenv("TAXONOMY_CACHE_TTL_SECONDS", 24 * 60 * 60))
+_option_cache = {}  # request_key -> (저장 시각, 목록)
+_option_lock = threading.Lock()
+
+def cached_options(name):
+    """드롭다운 목록 함수의 결과를 캐시하는 데코레이터. 빈 목록(실패 가능성)은 저장하지 않습니다."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args):
+            key = request_key(name, *args)
+            with _option_lock:
+                cached = _option_cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < TAXONOMY_TTL_SECONDS:
+                return list(cached[1])
+            options = await fn(*args)
+            if options:
+                with _option_lock:
+                    _option_cache[key] = (time.monotonic(), list(options))
+            return list(options)
+        return wrapper
+    return decorator
+
+def taxonomy_cache_size():
+    with _option_lock:
+        return len(_option_cache)
+
+@cached_options("get_sigungu_options")
+@playwright_flight.coalesced("get_sigungu_options")
 async def get_sigungu_options(province):
     if not province or province == "전국": return []
     p, browser, page = await get_page_context()
@@ -19,6 +53,8 @@ async def get_sigungu_options(province):
     finally:
         await close_page_context(p, browser)
 
+@cached_options("get_large_category_options")
+@playwright_flight.coalesced("get_large_category_options")
 async def get_large_category_options(tourism_type):
     if not tourism_type or tourism_type == "선택 안함": return []
     p, browser, page = await get_page_context()
@@ -35,6 +71,8 @@ async def get_large_category_options(tourism_type):
     finally:
         await close_page_context(p, browser)
 
+@cached_options("get_medium_category_options")
+@playwright_flight.coalesced("get_medium_category_options")
 async def get_medium_category_options(tourism_type, large_category):
     if not large_category or large_category == "선택 안함":
         return []
@@ -57,6 +95,8 @@ async def get_medium_category_options(tourism_type, large_category):
     finally:
         await close_page_context(p, browser)
 
+@cached_options("get_small_category_options")
+@playwright_flight.coalesced("get_small_category_options")
 async def get_small_category_options(tourism_type, large_category, medium_category):
     if not large_category or large_category == "선택 안함" or not medium_category or medium_category == "선택 안함":
         return []
@@ -1,11 +1,16 @@
+from __future__ import annotations
+
 import asyncio
 import xml.dom.minidom
 import re
 import os
 import requests
 import html
-from playwright.async_api import async_playwright, Page, expect
 import xml.etree.ElementTree as ET
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # Playwright는 브라우저를 띄울 때만 불러옵니다. (앱 시작 시간 단축)
+    from playwright.async_api import Page
 
 # --- Constants ---
 BASE_URL = "https://api.visitkorea.or.kr/#/useInforArea"
@@ -16,9 +21,13 @@ LANGUAGE_MAP = {
     "한국어": "Kor", "영어": "Eng", "일어": "Jpn", "중국어(간체)": "Chs",
     "중국어(번체)": "Cht", "독일어": "Ger", "프랑스어": "Fre", "스페인어": "Spa", "러시아어": "Rus",
 }
+PROVINCE_CHOICES = ["전국", "서울", "인천", "대전", "대구", "광주", "부산", "울산", "세종특별자치시", "경기도", "강원특별자치도", "충청북도", "충청남도", "경상북도", "경상남도", "전북특별자치도", "전라남도", "제주특별자치도"]
+TOURISM_TYPE_CHOICES = ["선택 안함", "관광지", "문화시설", "축제공연행사", "여행코스", "레포츠", "숙박", "쇼핑", "음식점"]
 
 # --- Playwright Context Management ---
 async def get_page_context():
+    from playwright.async_api import async_playwright
+
     p = await async_playwright().start()
     browser = await p.chromium.launch(headless=True)
     page = await browser.new_page()
@@ -45,6 +54,8 @@ async def wait_for_xml_update(page: Page, old_xml: str, timeout: int = 30000):
 
 # [최종 개선] 최소 클릭 페이지 이동 로직
 async def go_to_page(page: Page, target_page: int, total_pages: int = 0):
+    from playwright.async_api import expect
+
     target_page = int(target_page)
 
     # 페이지네이션 컨트롤이 존재하는지 먼저 확인
@@ -127,6 +138,8 @@ async def go_to_page(page: Page, target_page: int, total_pages: int = 0):
 
 # [최종] 상세 정보 로직 단순화
 async def scrape_item_detail_xml(page: Page, params):
+    from playwright.async_api import expect
+
     try:
         gallery_container = page.locator("ul.gallery-list")
         await expect(gallery_container).to_be_visible(timeout=60000)
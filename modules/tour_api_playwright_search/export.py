@@ -5,9 +5,10 @@ import tempfile
 import re
 import pandas as pd
 import xml.etree.ElementTree as ET
-from playwright.async_api import expect
 import datetime
 
+from utils import clean_dataframe
+
 # Relative imports from within the same module
 from . import scraper
 from .common import (
@@ -19,6 +20,7 @@ from .common import (
 
 async def export_details_to_csv(search_params, progress=gr.Progress(track_tqdm=True)):
     """[최종 리팩토링] 다중 행 데이터 타입(여행 코스, 숙박)을 지원하고 모든 안정성 로직이 포함된 최종 버전입니다."""
+    from playwright.async_api import expect  # 내보내기를 실행할 때만 불러옵니다.
 
     # --- 0. 설정 및 피드백 디렉토리 생성 ---
     ITEMS_PER_PAGE = 12
@@ -382,14 +384,8 @@ async def export_details_to_csv(search_params, progress=gr.Progress(track_tqdm=T
     existing_cols = [col for col in final_ordered_columns if col in df.columns]
     df = df.reindex(columns=existing_cols).fillna("")
 
-    if "homepage" in df.columns:
-        df["homepage"] = df["homepage"].apply(
-            lambda x: (
-                re.search(r'href=["\\](.*?)["\\]', str(x)).group(1)
-                if x and isinstance(x, str) and re.search(r'href=["\\](.*?)["\\]', x)
-                else x
-            )
-        )
+    # 기존처럼 homepage에서만 URL을 뽑고, 나머지 컬럼은 수집한 값(줄바꿈 포함)을 그대로 둡니다.
+    df = clean_dataframe(df, columns=["homepage"])
 
     try:
         with tempfile.NamedTemporaryFile(
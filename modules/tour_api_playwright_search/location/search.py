@@ -1,5 +1,10 @@
+from __future__ import annotations
+
 import asyncio
-from playwright.async_api import Page
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # Playwright는 브라우저를 띄울 때만 불러옵니다. (앱 시작 시간 단축)
+    from playwright.async_api import Page
 
 async def navigate_to_location_search_page(page: Page, **kwargs):
     print("[LOC_LOG] Starting navigation for location-based search.")
@@ -1,7 +1,12 @@
+from __future__ import annotations
+
 import asyncio
 import xml.etree.ElementTree as ET
 import math
-from playwright.async_api import Page
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # Playwright는 브라우저를 띄울 때만 불러옵니다. (앱 시작 시간 단축)
+    from playwright.async_api import Page
 
 # --- Import modules for each search type and common utilities ---
 from .common import (
@@ -13,6 +18,7 @@ from .area.search import (
     get_sigungu_options, get_large_category_options,
     get_medium_category_options, get_small_category_options
 )
+from utils import playwright_flight
 
 # --- Re-export dropdown functions for app.py to use ---
 __all__ = [
@@ -169,6 +175,7 @@ async def get_items_from_page(page: Page, pageNo: int, totalPages: int):
         })
     return results
 
+@playwright_flight.coalesced("get_item_detail_xml")
 async def get_item_detail_xml(params):
     """The main function to get detail XML for a single item."""
     p, browser, page = await get_page_context()
@@ -1,12 +1,18 @@
+from __future__ import annotations
+
 import asyncio
 import xml.etree.ElementTree as ET
 import math
-from playwright.async_api import Page
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # Playwright는 브라우저를 띄울 때만 불러옵니다. (앱 시작 시간 단축)
+    from playwright.async_api import Page
 
 from ..common import (
     get_page_context, close_page_context, go_to_page, scrape_item_detail_xml,
     TOTAL_SEARCH_BASE_URL, LANGUAGE_MAP
 )
+from utils import playwright_flight
 
 async def _navigate_to_total_search_page(page: Page, **kwargs):
     """Navigates to the total search URL, sets all filters, and enters the keyword."""
@@ -99,6 +105,7 @@ async def get_total_search_results(pageNo=1, temp_dir: str = "", totalPages: int
     finally:
         await close_page_context(p, browser)
 
+@playwright_flight.coalesced("get_total_search_item_detail_xml")
 async def get_total_search_item_detail_xml(params):
     """The main function to get detail XML for a single item from a total search."""
     p, browser, page = await get_page_context()
@@ -6,10 +6,12 @@ import re
 import xml.etree.ElementTree as ET
 
 from . import scraper
+from .common import PROVINCE_CHOICES, TOURISM_TYPE_CHOICES
 from .total_search.search import get_total_search_results, get_total_search_item_detail_xml
 from .date_search.search import get_date_search_results, get_date_search_item_detail_xml
 from .export import export_details_to_csv
 from ..tour_api_search.location_search.location import get_location_js
+from result_store import result_store, session_id_of
 
 def create_tour_api_playwright_tab():
     """'Tour API 직접 조회 (Playwright)' 탭의 UI를 생성합니다."""
@@ -39,7 +41,8 @@ def create_tour_api_playwright_tab():
         search_params = gr.State({})
         current_page = gr.State(1)
         total_pages = gr.State(1)
-        current_gallery_data = gr.State([])
+        # 현재 페이지의 검색 결과(항목별 XML 포함)는 서버의 result_store에 두고 핸들만 보관합니다.
+        current_gallery_handle = gr.State(None)
         selected_item_info = gr.State({})
 
         DEFAULT_LARGE_CATEGORIES = ["선택 안함", "자연", "인문(문화/예술/역사)", "레포츠", "쇼핑", "음식", "숙박", "추천코스"]
@@ -52,9 +55,9 @@ def create_tour_api_playwright_tab():
                 with gr.Tabs() as api_tabs:
                     with gr.TabItem("지역별 관광정보"):
                         language_dropdown = gr.Dropdown(label="언어", choices=list(scraper.LANGUAGE_MAP.keys()), value="한국어", interactive=True)
-                        province_dropdown = gr.Dropdown(label="광역시/도", choices=["전국", "서울", "인천", "대전", "대구", "광주", "부산", "울산", "세종특별자치시", "경기도", "강원특별자치도", "충청북도", "충청남도", "경상북도", "경상남도", "전북특별자치도", "전라남도", "제주특별자치도"], value="전국", interactive=True)
+                        province_dropdown = gr.Dropdown(label="광역시/도", choices=PROVINCE_CHOICES, value="전국", interactive=True)
                         sigungu_dropdown = gr.Dropdown(label="시/군/구", choices=[], interactive=True)
-                        tourism_type_dropdown = gr.Dropdown(label="관광타입", choices=["선택 안함", "관광지", "문화시설", "축제공연행사", "여행코스", "레포츠", "숙박", "쇼핑", "음식점"], value="선택 안함", interactive=True)
+                        tourism_type_dropdown = gr.Dropdown(label="관광타입", choices=TOURISM_TYPE_CHOICES, value="선택 안함", interactive=True)
                         large_category_dropdown = gr.Dropdown(label="서비스 분류 (대분류)", choices=DEFAULT_LARGE_CATEGORIES, value="선택 안함", interactive=True)
                         medium_category_dropdown = gr.Dropdown(label="서비스 분류 (중분류)", choices=[], interactive=True)
                         small_category_dropdown = gr.Dropdown(label="서비스 분류 (소분류)", choices=[], interactive=True)
@@ -62,7 +65,7 @@ def create_tour_api_playwright_tab():
 
                     with gr.TabItem("내주변 관광정보") as location_tab:
                         loc_language_dropdown = gr.Dropdown(label="언어", choices=list(scraper.LANGUAGE_MAP.keys()), value="한국어", interactive=True)
-                        loc_tourism_type_dropdown = gr.Dropdown(label="관광타입", choices=["선택 안함", "관광지", "문화시설", "축제공연행사", "여행코스", "레포츠", "숙박", "쇼핑", "음식점"], value="선택 안함", interactive=True)
+                        loc_tourism_type_dropdown = gr.Dropdown(label="관광타입", choices=TOURISM_TYPE_CHOICES, value="선택 안함", interactive=True)
                         with gr.Row():
                             map_y_input = gr.Textbox(label="mapY (위도)", value="")
                             map_x_input = gr.Textbox(label="mapX (경도)", value="")
@@ -76,7 +79,7 @@ def create_tour_api_playwright_tab():
 
                     with gr.TabItem("통합 검색"):
                         total_language_dropdown = gr.Dropdown(label="언어", choices=list(scraper.LANGUAGE_MAP.keys()), value="한국어", interactive=True)
-                        total_province_dropdown = gr.Dropdown(label="광역시/도", choices=["전국", "서울", "인천", "대전", "대구", "광주", "부산", "울산", "세종특별자치시", "경기도", "강원특별자치도", "충청북도", "충청남도", "경상북도", "경상남도", "전북특별자치도", "전라남도", "제주특별자치도"], value="전국", interactive=True)
+                        total_province_dropdown = gr.Dropdown(label="광역시/도", choices=PROVINCE_CHOICES, value="전국", interactive=True)
                         total_sigungu_dropdown = gr.Dropdown(label="시/군/구", choices=[], interactive=True)
                         total_large_category_dropdown = gr.Dropdown(label="서비스 분류 (대분류)", choices=DEFAULT_LARGE_CATEGORIES, value="선택 안함", interactive=True)
                         total_medium_category_dropdown = gr.Dropdown(label="서비스 분류 (중분류)", choices=[], interactive=True)
@@ -90,7 +93,7 @@ def create_tour_api_playwright_tab():
                         end_default = (today + datetime.timedelta(days=30)).strftime("%Y-%m-%d")
 
                         date_language_dropdown = gr.Dropdown(label="언어", choices=list(scraper.LANGUAGE_MAP.keys()), value="한국어", interactive=True)
-                        date_province_dropdown = gr.Dropdown(label="광역시/도", choices=["전국", "서울", "인천", "대전", "대구", "광주", "부산", "울산", "세종특별자치시", "경기도", "강원특별자치도", "충청북도", "충청남도", "경상북도", "경상남도", "전북특별자치도", "전라남도", "제주특별자치도"], value="전국", interactive=True)
+                        date_province_dropdown = gr.Dropdown(label="광역시/도", choices=PROVINCE_CHOICES, value="전국", interactive=True)
                         date_sigungu_dropdown = gr.Dropdown(label="시/군/구", choices=[], interactive=True)
                         start_date_input = gr.Textbox(label="시작일", value=start_default, placeholder="YYYY-MM-DD", interactive=True)
                         end_date_input = gr.Textbox(label="종료일", value=end_default, placeholder="YYYY-MM-DD", interactive=True)
@@ -164,7 +167,7 @@ def create_tour_api_playwright_tab():
             options = await scraper.get_small_category_options(tourism_type, large_category, medium_category)
             return gr.update(choices=["선택 안함"] + options, value="선택 안함")
 
-        async def process_search(params, page_num, total_pages=0):
+        async def process_search(params, page_num, total_pages=0, session_id=None):
             page_num = int(page_num)
             
             yield [
@@ -178,7 +181,7 @@ def create_tour_api_playwright_tab():
                 gr.update(), # total_pages
                 gr.update(), # page_number_input
                 gr.update(), # total_pages_output
-                gr.update(), # current_gallery_data
+                gr.update(), # current_gallery_handle
                 gr.update(visible=False), # detail_view_column
                 None, # csv_output_file
             ]
@@ -223,7 +226,7 @@ def create_tour_api_playwright_tab():
                     total_pages_val, # total_pages
                     page_num, # page_number_input
                     f"/ {total_pages_val}", # total_pages_output
-                    results, # current_gallery_data
+                    result_store.put(session_id, "playwright_gallery", results), # current_gallery_handle
                     gr.update(visible=False), # detail_view_column
                     None # csv_output_file
                 ]
@@ -239,26 +242,26 @@ def create_tour_api_playwright_tab():
                     gr.update(), # total_pages
                     gr.update(), # page_number_input
                     gr.update(), # total_pages_output
-                    gr.update(), # current_gallery_data
+                    gr.update(), # current_gallery_handle
                     gr.update(visible=False), # detail_view_column
                     None, # csv_output_file
                 ]
 
-        async def initial_search(lang, prov, sig, tour, c1, c2, c3):
+        async def initial_search(lang, prov, sig, tour, c1, c2, c3, request: gr.Request = None):
             params = {"search_type": "area", "language": lang, "province": prov, "sigungu": sig, "tourism_type": tour, "cat1": c1, "cat2": c2, "cat3": c3}
-            async for update in process_search(params, 1, 0): yield update
+            async for update in process_search(params, 1, 0, session_id_of(request)): yield update
             
-        async def initial_loc_search(lang, tour, map_x, map_y, radius):
+        async def initial_loc_search(lang, tour, map_x, map_y, radius, request: gr.Request = None):
             params = {"search_type": "location", "language": lang, "tourism_type": tour, "map_x": map_x, "map_y": map_y, "radius": radius}
-            async for update in process_search(params, 1, 0): yield update
+            async for update in process_search(params, 1, 0, session_id_of(request)): yield update
 
-        async def initial_total_search(lang, prov, sig, c1, c2, c3, keyword):
+        async def initial_total_search(lang, prov, sig, c1, c2, c3, keyword, request: gr.Request = None):
             params = {"search_type": "total", "language": lang, "province": prov, "sigungu": sig, "tourism_type": "선택 안함", "cat1": c1, "cat2": c2, "cat3": c3, "keyword": keyword}
-            async for update in process_search(params, 1, 0): yield update
+            async for update in process_search(params, 1, 0, session_id_of(request)): yield update
 
-        async def initial_date_search(lang, prov, sig, start_date, end_date):
+        async def initial_date_search(lang, prov, sig, start_date, end_date, request: gr.Request = None):
             params = {"search_type": "date", "language": lang, "province": prov, "sigungu": sig, "start_date": start_date, "end_date": end_date}
-            async for update in process_search(params, 1, 0): yield update
+            async for update in process_search(params, 1, 0, session_id_of(request)): yield update
 
         async def change_page(page_num, stored_params):
             async for update in process_search(stored_params, int(page_num)): yield update
@@ -331,7 +334,8 @@ def create_tour_api_playwright_tab():
             except Exception:
                 return []
 
-        async def show_initial_details(evt: gr.SelectData, s_params, g_data, c_page):
+        async def show_initial_details(evt: gr.SelectData, s_params, gallery_handle, c_page):
+            g_data = result_store.get(gallery_handle)
             if not g_data or evt.index is None:
                 yield {detail_view_column: gr.update(visible=False)}
                 return
@@ -468,7 +472,7 @@ def create_tour_api_playwright_tab():
         search_inputs = [language_dropdown, province_dropdown, sigungu_dropdown, tourism_type_dropdown, 
                          large_category_dropdown, medium_category_dropdown, small_category_dropdown]
         search_outputs = [status_output, results_output, api_accordion, request_url_output, response_xml_output, 
-                          search_params, current_page, total_pages, page_number_input, total_pages_output, current_gallery_data, detail_view_column, csv_output_file]
+                          search_params, current_page, total_pages, page_number_input, total_pages_output, current_gallery_handle, detail_view_column, csv_output_file]
         
         loc_search_inputs = [loc_language_dropdown, loc_tourism_type_dropdown, map_x_input, map_y_input, radius_input]
         total_search_inputs = [total_language_dropdown, total_province_dropdown, total_sigungu_dropdown, total_large_category_dropdown, total_medium_category_dropdown, total_small_category_dropdown, total_keyword_input]
@@ -505,19 +509,19 @@ def create_tour_api_playwright_tab():
         loc_show_map_button.click(fn=show_loc_map, inputs=[map_x_input, map_y_input], outputs=[loc_map_html]).then(lambda: gr.update(visible=True), outputs=[loc_map_group])
         loc_close_map_button.click(lambda: gr.update(visible=False), outputs=[loc_map_group])
 
-        async def change_page(page_num, stored_params, total_pages=0):
-            async for update in process_search(stored_params, int(page_num), total_pages): yield update
+        async def change_page(page_num, stored_params, total_pages=0, session_id=None):
+            async for update in process_search(stored_params, int(page_num), total_pages, session_id): yield update
 
-        async def go_to_first_page(p):
-            async for update in change_page(1, p, 0): yield update
-        async def go_to_prev_page(current_page_num, tp, p):
-            async for update in change_page(max(1, int(current_page_num) - 1), p, tp): yield update
-        async def go_to_next_page(current_page_num, tp, p):
-            async for update in change_page(min(int(current_page_num) + 1, tp), p, tp): yield update
-        async def go_to_last_page(tp, p):
-            async for update in change_page(tp, p, tp): yield update
-        async def go_to_specific_page(pn, tp, p):
-            async for update in change_page(pn, p, tp): yield update
+        async def go_to_first_page(p, request: gr.Request = None):
+            async for update in change_page(1, p, 0, session_id_of(request)): yield update
+        async def go_to_prev_page(current_page_num, tp, p, request: gr.Request = None):
+            async for update in change_page(max(1, int(current_page_num) - 1), p, tp, session_id_of(request)): yield update
+        async def go_to_next_page(current_page_num, tp, p, request: gr.Request = None):
+            async for update in change_page(min(int(current_page_num) + 1, tp), p, tp, session_id_of(request)): yield update
+        async def go_to_last_page(tp, p, request: gr.Request = None):
+            async for update in change_page(tp, p, tp, session_id_of(request)): yield update
+        async def go_to_specific_page(pn, tp, p, request: gr.Request = None):
+            async for update in change_page(pn, p, tp, session_id_of(request)): yield update
 
         first_page_button.click(fn=go_to_first_page, inputs=[search_params], outputs=search_outputs, queue=True)
         prev_page_button.click(fn=go_to_prev_page, inputs=[page_number_input, total_pages, search_params], outputs=search_outputs, queue=True)
@@ -525,7 +529,7 @@ def create_tour_api_playwright_tab():
         last_page_button.click(fn=go_to_last_page, inputs=[total_pages, search_params], outputs=search_outputs, queue=True)
         page_number_input.submit(fn=go_to_specific_page, inputs=[page_number_input, total_pages, search_params], outputs=search_outputs, queue=True)
 
-        results_output.select(fn=show_initial_details, inputs=[search_params, current_gallery_data, current_page], outputs=detail_outputs, queue=True)
+        results_output.select(fn=show_initial_details, inputs=[search_params, current_gallery_handle, current_page], outputs=detail_outputs, queue=True)
 
         detail_tabs.select(fn=update_tab_content, inputs=[selected_item_info], outputs=[intro_info_markdown, repeat_info_markdown, course_info_markdown, room_info_markdown, additional_images_gallery], queue=True)
 
@@ -1,5 +1,6 @@
+import threading
 import gradio as gr
-from utils import common_params, session, BASE_URL, get_api_items
+from utils import common_params, decode_api_items, fetch_tour_api
 
 AREA_CODES = {
     "서울": 1, "인천": 2, "대전": 3, "대구": 4, "광주": 5, "부산": 6, "울산": 7, "세종": 8,
@@ -11,17 +12,41 @@ CONTENT_TYPE_CODES = {
     "여행코스": "25", "레포츠": "28", "숙박": "32", "쇼핑": "38", "음식점": "39"
 }
 
+# --- 시군구 코드 캐시 ---
+# 시군구 코드는 거의 바뀌지 않으므로 지역별로 한 번만 조회하고 프로세스가 끝날 때까지 재사용합니다.
+_sigungu_codes = {}  # 지역 코드 -> {시군구 이름: 시군구 코드}
+_sigungu_lock = threading.Lock()
+
+def get_sigungu_codes(area_code):
+    """지역 코드의 시군구 {이름: 코드}를 반환합니다. (조회 실패 시 예외, 빈 결과는 캐시하지 않음)"""
+    with _sigungu_lock:
+        codes = _sigungu_codes.get(area_code)
+    if codes is not None:
+        return codes
+
+    response = fetch_tour_api("areaCode2", {**common_params, "areaCode": area_code, "numOfRows": "100"})
+    response.raise_for_status()
+    items = decode_api_items(response.content)
+    codes = {item['name']: item['code'] for item in items if isinstance(item, dict) and 'name' in item and 'code' in item}
+    if codes:
+        with _sigungu_lock:
+            _sigungu_codes[area_code] = codes
+    return codes
+
+def get_sigungu_code(area_name, sigungu_name):
+    """지역/시군구 이름으로 시군구 코드를 찾습니다. ("전체"이거나 찾지 못하면 None)"""
+    if not sigungu_name or sigungu_name == "전체":
+        return None
+    return get_sigungu_codes(AREA_CODES.get(area_name)).get(sigungu_name)
+
+def cached_area_count():
+    with _sigungu_lock:
+        return len(_sigungu_codes)
+
 def update_sigungu_dropdown(area_name):
     if not area_name: return gr.update(choices=[], interactive=False)
     try:
-        area_code = AREA_CODES.get(area_name)
-        params = {**common_params, "areaCode": area_code, "numOfRows": "100"}
-        response = session.get(f"{BASE_URL}areaCode2", params=params)
-        response.raise_for_status()
-        
-        items = get_api_items(response.json())
-        
-        sigungu_names = [item['name'] for item in items if isinstance(item, dict) and 'name' in item]
+        sigungu_names = list(get_sigungu_codes(AREA_CODES.get(area_name)))
         
         return gr.update(choices=["전체"] + sigungu_names, value="전체", interactive=True)
     except Exception as e:
@@ -1,83 +1,122 @@
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
 from utils import (
-    common_params, session, BASE_URL, 
+    common_params, fetch_tour_api, api_json,
     format_json_to_clean_string, create_trend_plot
 )
 from modules.naver_search.naver_review import search_naver_blog, get_naver_trend
 
-def get_details(selected_title, places_info):
-    if not selected_title or not places_info:
-        return "", "", "", "", "", ""
-    
-    if selected_title not in places_info:
-        return "선택된 항목을 찾을 수 없습니다.", "", "", "", "", ""
+LOADING_MESSAGE = "불러오는 중..."
 
-    content_id, content_type_id = places_info[selected_title]
-    results = [""] * 6
-    apis_to_call = [("detailCommon2", {"contentId": content_id}), ("detailIntro2", {"contentId": content_id, "contentTypeId": content_type_id}), ("detailInfo2", {"contentId": content_id, "contentTypeId": content_type_id})]
-    
-    # 1. TourAPI 상세 정보 조회
-    for i, (api_name, specific_params) in enumerate(apis_to_call):
-        try:
-            params = {**common_params, **specific_params}
-            response = session.get(f"{BASE_URL}{api_name}", params=params)
-            response.raise_for_status()
-            
-            if not response.text or not response.text.strip():
-                raise ValueError("API 응답이 비어 있습니다.")
-
-            response_json = response.json()
-            
-            header = response_json.get('response', {}).get('header', {})
-            if header.get('resultCode') != '0000':
-                pretty_output = json.dumps(response_json, indent=2, ensure_ascii=False)
-            else:
-                pretty_output = format_json_to_clean_string(response_json)
-
-            results[i * 2] = json.dumps(response_json, indent=2, ensure_ascii=False)
-            results[i * 2 + 1] = pretty_output
-
-        except Exception as e:
-            error_msg = f"{api_name} 처리 중 오류: {e}"
-            results[i * 2] = error_msg
-            results[i * 2 + 1] = f"정보를 가져오는 데 실패했습니다: {e}"
-
-    # 2. 네이버 블로그 리뷰 검색 및 추가
+# 상세 패널 동시 조회에 사용하는 공용 스레드 풀 (상세 API 3개 + 블로그 + 트렌드)
+_detail_executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="details")
+
+def _fetch_tour_detail(api_name, specific_params):
+    """TourAPI 상세 API 하나를 호출하여 (Raw JSON, 포맷된 문자열)을 반환합니다."""
+    try:
+        params = {**common_params, **specific_params}
+        response = fetch_tour_api(api_name, params)
+        response.raise_for_status()
+
+        if not response.text or not response.text.strip():
+            raise ValueError("API 응답이 비어 있습니다.")
+
+        response_json = api_json(response)
+
+        header = response_json.get('response', {}).get('header', {})
+        if header.get('resultCode') != '0000':
+            pretty_output = json.dumps(response_json, indent=2, ensure_ascii=False)
+        else:
+            pretty_output = format_json_to_clean_string(response_json)
+
+        return json.dumps(response_json, indent=2, ensure_ascii=False), pretty_output
+
+    except Exception as e:
+        error_msg = f"{api_name} 처리 중 오류: {e}"
+        return error_msg, f"정보를 가져오는 데 실패했습니다: {e}"
+
+def _build_reviews_markdown(selected_title):
+    """네이버 블로그 리뷰를 검색하여 마크다운 섹션으로 반환합니다."""
     try:
         blog_query = f"{selected_title} 후기"
         blog_reviews = search_naver_blog(blog_query, display=3)
-        
-        if blog_reviews:
-            blog_md = "\n\n---\n\n### 📝 네이버 블로그 리뷰\n\n"
-            for review in blog_reviews:
-                post_date = review.get('postdate', '')
-                if post_date:
-                    post_date = f"{post_date[0:4]}-{post_date[4:6]}-{post_date[6:8]}"
-
-                blog_md += f"**[{review['title']}]({review['link']})** ({post_date})\n"
-                blog_md += f"> {review['description']}...\n\n"
-            
-            results[1] += blog_md
+
+        if not blog_reviews:
+            return ""
+
+        blog_md = "\n\n---\n\n### 📝 네이버 블로그 리뷰\n\n"
+        for review in blog_reviews:
+            post_date = review.get('postdate', '')
+            if post_date:
+                post_date = f"{post_date[0:4]}-{post_date[4:6]}-{post_date[6:8]}"
+
+            blog_md += f"**[{review['title']}]({review['link']})** ({post_date})\n"
+            blog_md += f"> {review['description']}...\n\n"
+        return blog_md
 
     except Exception as e:
         print(f"네이버 블로그 리뷰 검색 중 오류: {e}")
-        results[1] += "\n\n---\n\n블로그 리뷰를 가져오는 중 오류가 발생했습니다."
+        return "\n\n---\n\n블로그 리뷰를 가져오는 중 오류가 발생했습니다."
 
-    # 3. 네이버 검색어 트렌드 그래프 추가
+def _build_trend_markdown(selected_title):
+    """네이버 검색어 트렌드 그래프를 마크다운 섹션으로 반환합니다."""
     try:
         end_date = date.today()
         start_date = end_date - timedelta(days=90)
         trend_data = get_naver_trend(selected_title, start_date, end_date)
-        
+
         if trend_data:
             plot_path = create_trend_plot(trend_data, selected_title)
             if plot_path:
-                trend_md = f"\n\n---\n\n### 📈 네이버 검색 트렌드\n\n![{selected_title} 트렌드]({plot_path})"
-                results[1] += trend_md
+                return f"\n\n---\n\n### 📈 네이버 검색 트렌드\n\n![{selected_title} 트렌드]({plot_path})"
+        return ""
 
     except Exception as e:
         print(f"네이버 트렌드 검색 중 오류: {e}")
-        results[1] += "\n\n---\n\n트렌드 정보를 가져오는 중 오류가 발생했습니다."
-            
-    return tuple(results)
\ No newline at end of file
+        return "\n\n---\n\n트렌드 정보를 가져오는 중 오류가 발생했습니다."
+
+def get_details(selected_title, places_info):
+    """상세 정보를 동시에 조회하고, 각 패널이 준비되는 대로 순차적으로 화면에 내보냅니다."""
+    if not selected_title or not places_info:
+        yield "", "", "", "", "", ""
+        return
+
+    if selected_title not in places_info:
+        yield "선택된 항목을 찾을 수 없습니다.", "", "", "", "", ""
+        return
+
+    content_id, content_type_id = places_info[selected_title]
+    apis_to_call = [("detailCommon2", {"contentId": content_id}), ("detailIntro2", {"contentId": content_id, "contentTypeId": content_type_id}), ("detailInfo2", {"contentId": content_id, "contentTypeId": content_type_id})]
+
+    # 패널 키 -> (Raw, Pretty) 또는 마크다운 섹션
+    panels = {api_name: (LOADING_MESSAGE, LOADING_MESSAGE) for api_name, _ in apis_to_call}
+    extra_sections = {"reviews": "", "trend": ""}
+
+    def snapshot():
+        results = []
+        for api_name, _ in apis_to_call:
+            results.extend(panels[api_name])
+        # 블로그 리뷰와 트렌드는 공통정보 패널 아래에 항상 같은 순서로 덧붙입니다.
+        results[1] += extra_sections["reviews"] + extra_sections["trend"]
+        return tuple(results)
+
+    yield snapshot()
+
+    # 1. 모든 업스트림 호출(TourAPI 3개, 블로그 검색, 트렌드)을 동시에 시작
+    futures = {
+        _detail_executor.submit(_fetch_tour_detail, api_name, specific_params): api_name
+        for api_name, specific_params in apis_to_call
+    }
+    futures[_detail_executor.submit(_build_reviews_markdown, selected_title)] = "reviews"
+    futures[_detail_executor.submit(_build_trend_markdown, selected_title)] = "trend"
+
+    # 2. 먼저 끝난 호출부터 해당 패널을 갱신하여 내보냄
+    for future in as_completed(futures):
+        key = futures[future]
+        result = future.result()
+        if key in extra_sections:
+            extra_sections[key] = result
+        else:
+            panels[key] = result
+        yield snapshot()
@@ -1,12 +1,10 @@
 import gradio as gr
-import math
-import csv
-import io
 import tempfile
-import re
 import traceback
-from utils import common_params, session, BASE_URL, clean_html, is_key_excluded, get_api_items
-from modules.tour_api_search.area_search.controls import AREA_CODES, CONTENT_TYPE_CODES
+import pandas as pd
+from utils import common_params, session, BASE_URL, clean_dataframe, is_key_excluded, decode_api_items
+from modules.tour_api_search.area_search.controls import AREA_CODES, CONTENT_TYPE_CODES, get_sigungu_code
+from modules.tour_api_search.area_search.harvest import ListHarvester
 
 def export_to_csv(area_name, sigungu_name, category_name, progress=gr.Progress()):
     """검색된 모든 결과를 API 응답 순서에 따른 동적 컬럼 CSV 파일로 저장합니다."""
@@ -21,37 +19,22 @@ def export_to_csv(area_name, sigungu_name, category_name, progress=gr.Progress()
         area_code = AREA_CODES.get(area_name)
         content_type_id = CONTENT_TYPE_CODES.get(category_name)
         
-        base_list_params = {**common_params, "areaCode": area_code, "numOfRows": 1, "pageNo": 1}
-        if sigungu_name and sigungu_name != "전체":
-            sigungu_response = session.get(f"{BASE_URL}areaCode2", params={**common_params, "areaCode": area_code, "numOfRows": "100"})
-            sigungu_response.raise_for_status()
-            sigungu_items = get_api_items(sigungu_response.json())
-            sigungu_code = next((item['code'] for item in sigungu_items if isinstance(item, dict) and item.get('name') == sigungu_name), None)
-            if sigungu_code: base_list_params["sigunguCode"] = sigungu_code
+        base_list_params = {**common_params, "areaCode": area_code}
+        sigungu_code = get_sigungu_code(area_name, sigungu_name)
+        if sigungu_code: base_list_params["sigunguCode"] = sigungu_code
         if content_type_id:
             base_list_params["contentTypeId"] = content_type_id
 
-        response = session.get(f"{BASE_URL}areaBasedList2", params=base_list_params)
-        response.raise_for_status()
-        data = response.json()
-        body = data.get('response', {}).get('body', {})
-        total_count = body.get('totalCount', 0) if isinstance(body, dict) else 0
+        # 첫 페이지 조회로 페이지 크기와 전체 개수를 함께 확인
+        harvester = ListHarvester("areaBasedList2", base_list_params)
+        total_count = harvester.probe()
 
         if total_count == 0:
             gr.Info("내보낼 데이터가 없습니다.")
             return None
 
-        # 2. 모든 기본 아이템 정보 수집
-        all_basic_items = []
-        num_of_rows = 100
-        total_pages = math.ceil(total_count / num_of_rows)
-        
-        for page_no in progress.tqdm(range(1, total_pages + 1), desc="관광지 목록 수집 중"):
-            base_list_params.update({"numOfRows": num_of_rows, "pageNo": page_no})
-            response = session.get(f"{BASE_URL}areaBasedList2", params=base_list_params)
-            response.raise_for_status()
-            items = get_api_items(response.json())
-            all_basic_items.extend(items)
+        # 2. 나머지 페이지는 병렬로 수집하며, 도착하는 대로 상세 정보 조회 단계로 넘김
+        all_basic_items = (item for batch in harvester for item in batch)
 
         # 3. 각 아이템의 상세 정보 조회 및 데이터 재구성
         all_item_details = []
@@ -65,7 +48,7 @@ def export_to_csv(area_name, sigungu_name, category_name, progress=gr.Progress()
                 ordered_headers.append(key)
                 seen_keys.add(key)
 
-        for item in progress.tqdm(all_basic_items, desc="상세 정보 조회 및 데이터 구성 중"):
+        for item in progress.tqdm(all_basic_items, total=total_count, desc="상세 정보 조회 및 데이터 구성 중"):
             if not isinstance(item, dict):
                 continue
 
@@ -90,7 +73,7 @@ def export_to_csv(area_name, sigungu_name, category_name, progress=gr.Progress()
                     response.raise_for_status()
                     if not response.text or not response.text.strip(): continue
                     
-                    res_items = get_api_items(response.json())
+                    res_items = decode_api_items(response.content)
 
                     for res_item in res_items:
                         if isinstance(res_item, dict):
@@ -102,7 +85,7 @@ def export_to_csv(area_name, sigungu_name, category_name, progress=gr.Progress()
                 response = session.get(f"{BASE_URL}detailInfo2", params=detail_info_params)
                 response.raise_for_status()
                 
-                info_items = get_api_items(response.json())
+                info_items = decode_api_items(response.content)
 
                 if info_items:
                     for info_item in info_items:
@@ -122,30 +105,21 @@ def export_to_csv(area_name, sigungu_name, category_name, progress=gr.Progress()
             gr.Info("상세 정보를 가져올 수 있는 데이터가 없습니다.")
             return None
 
-        # 4. CSV 파일 생성
+        # 4. CSV 파일 생성 (컬럼 단위 일괄 정제)
         progress(0.9, desc="CSV 파일 생성 중...")
-        output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=ordered_headers, extrasaction='ignore')
-        writer.writeheader()
-
-        for item_data in all_item_details:
-            cleaned_item = {}
-            for k, v in item_data.items():
-                if k == 'homepage':
-                    match = re.search(r'href=["\\](["\\]+)[\"\\]', str(v))
-                    cleaned_item[k] = match.group(1) if match else clean_html(str(v))
-                else:
-                    cleaned_item[k] = clean_html(v) if isinstance(v, str) else v
-            writer.writerow(cleaned_item)
-        
-        csv_content = output.getvalue()
-        output.close()
+        df = pd.DataFrame(all_item_details, columns=ordered_headers, dtype=object)
+        df = clean_dataframe(df)
+        csv_content = df.to_csv(index=False)
         
         encoded_content = csv_content.encode('utf-8-sig')
 
-        with tempfile.NamedTemporaryFile(delete=False, mode='wb', suffix='.csv', prefix='tour_data_') as temp_f:
+        partial_warning = harvester.partial_warning()
+        with tempfile.NamedTemporaryFile(delete=False, mode='wb', suffix='.csv', prefix='tour_data_partial_' if partial_warning else 'tour_data_') as temp_f:
             temp_f.write(encoded_content)
-            gr.Info("CSV 파일 생성이 완료되었습니다. 아래 링크를 클릭하여 다운로드하세요.")
+            if partial_warning:
+                gr.Warning(f"CSV 파일을 만들었지만 {partial_warning} 잠시 후 다시 내보내 주세요.")
+            else:
+                gr.Info("CSV 파일 생성이 완료되었습니다. 아래 링크를 클릭하여 다운로드하세요.")
             return temp_f.name
 
     except Exception as e:
@@ -0,0 +1,138 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils import common_params, session, BASE_URL, api_json, get_api_items
+
+# 큰 것부터 시도하여 엔드포인트가 실제로 허용하는 가장 큰 numOfRows를 찾습니다.
+PAGE_SIZE_CANDIDATES = (1000, 500, 200, 100)
+MAX_WORKERS = 4
+PAGE_RETRIES = 2
+RETRY_BACKOFF_SECONDS = 0.5
+
+class ListHarvester:
+    """TourAPI 목록 API(areaBasedList2 등)의 모든 페이지를 병렬로 수집합니다.
+
+    probe()로 페이지 크기와 전체 개수를 정한 뒤, 반복(iter)하면 페이지가 도착하는 순서대로
+    contentid 기준으로 중복을 제거한 item 묶음을 내보냅니다.
+    """
+
+    def __init__(self, api_name, params, max_workers=MAX_WORKERS, retries=PAGE_RETRIES):
+        self.api_name = api_name
+        self.params = {k: v for k, v in params.items() if k not in ("numOfRows", "pageNo")}
+        self.max_workers = max_workers
+        self.retries = retries
+
+        self.total_count = 0
+        self.page_size = None
+        self.total_pages = 0
+        self.pages_done = 0
+        self.failed_pages = []
+        self._first_page_items = []
+        self._seen_ids = set()
+
+    def _fetch_page(self, page_no, num_of_rows, retries=None):
+        """한 페이지를 조회하여 (items, totalCount)를 반환합니다. 실패하면 지수 백오프로 재시도합니다."""
+        retries = self.retries if retries is None else retries
+        params = {**common_params, **self.params, "numOfRows": num_of_rows, "pageNo": page_no}
+        for attempt in range(retries + 1):
+            try:
+                response = session.get(f"{BASE_URL}{self.api_name}", params=params, timeout=30)
+                response.raise_for_status()
+                data = api_json(response)
+                body = data.get('response', {}).get('body', {})
+                if not isinstance(body, dict):
+                    raise ValueError(f"{self.api_name} 응답에 body가 없습니다.")
+                return get_api_items(data), int(body.get('totalCount', 0) or 0)
+            except Exception:
+                if attempt == retries:
+                    raise
+                time.sleep(RETRY_BACKOFF_SECONDS * (2 ** attempt))
+
+    def probe(self):
+        """허용되는 가장 큰 페이지 크기를 찾고, 첫 페이지와 전체 개수를 확보합니다."""
+        last_error = None
+        for size in PAGE_SIZE_CANDIDATES:
+            try:
+                items, total_count = self._fetch_page(1, size, retries=0)
+            except Exception as e:
+                last_error = e
+                continue
+
+            # 요청한 크기보다 적게 내려오면 서버가 페이지 크기를 제한한 것이므로 더 작은 크기로 재시도
+            if len(items) < min(size, total_count):
+                continue
+
+            self.page_size = size
+            self.total_count = total_count
+            self.total_pages = math.ceil(total_count / size) if total_count else 0
+            self.pages_done = 1 if total_count else 0
+            self._first_page_items = items
+            return total_count
+
+        if last_error is not None:
+            raise last_error
+        raise ValueError(f"{self.api_name}: 사용할 수 있는 페이지 크기를 찾지 못했습니다.")
+
+    def _dedup(self, items):
+        new_items = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            content_id = item.get('contentid')
+            if content_id:
+                if content_id in self._seen_ids:
+                    continue
+                self._seen_ids.add(content_id)
+            new_items.append(item)
+        return new_items
+
+    def __iter__(self):
+        if self.page_size is None:
+            self.probe()
+        if not self.total_count:
+            return
+
+        first_batch = self._dedup(self._first_page_items)
+        self._first_page_items = []
+        if first_batch:
+            yield first_batch
+
+        if self.total_pages <= 1:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="harvest") as executor:
+            futures = {
+                executor.submit(self._fetch_page, page_no, self.page_size): page_no
+                for page_no in range(2, self.total_pages + 1)
+            }
+            for future in as_completed(futures):
+                page_no = futures[future]
+                self.pages_done += 1
+                try:
+                    items, _ = future.result()
+                except Exception as e:
+                    print(f"[ListHarvester] {self.api_name} {page_no} 페이지 수집 실패: {e}")
+                    self.failed_pages.append(page_no)
+                    continue
+                batch = self._dedup(items)
+                if batch:
+                    yield batch
+
+    def missing_item_count(self):
+        """수집에 실패한 페이지에 들어 있었을 항목 수 (마지막 페이지는 남은 개수만큼)."""
+        last_page_size = self.total_count - (self.total_pages - 1) * self.page_size if self.total_pages else 0
+        return sum(last_page_size if page_no == self.total_pages else self.page_size for page_no in self.failed_pages)
+
+    def partial_warning(self):
+        """실패한 페이지가 있으면 사용자에게 보여줄 경고 문구를, 없으면 None을 반환합니다. (반복을 마친 뒤 호출)"""
+        if not self.failed_pages:
+            return None
+        pages = ", ".join(str(page_no) for page_no in sorted(self.failed_pages))
+        return (
+            f"전체 {self.total_pages}페이지 중 {len(self.failed_pages)}페이지({pages})를 가져오지 못해 "
+            f"전체 {self.total_count}개 중 최대 {self.missing_item_count()}개 항목이 빠진 일부 결과입니다."
+        )
+
+    def collect(self):
+        """모든 페이지를 수집하여 하나의 리스트로 반환합니다."""
+        return [item for batch in self for item in batch]
@@ -1,7 +1,7 @@
 import gradio as gr
 import math
-from utils import common_params, session, BASE_URL, get_api_items
-from modules.tour_api_search.area_search.controls import AREA_CODES, CONTENT_TYPE_CODES
+from utils import common_params, session, BASE_URL, get_api_items, api_json
+from modules.tour_api_search.area_search.controls import AREA_CODES, CONTENT_TYPE_CODES, get_sigungu_code
 
 ROWS_PER_PAGE = 10
 PAGE_WINDOW_SIZE = 5
@@ -14,20 +14,14 @@ def update_page_view(area_name, sigungu_name, category_name, page_to_go):
         content_type_id = CONTENT_TYPE_CODES.get(category_name)
 
         params = {**common_params, "areaCode": area_code, "numOfRows": ROWS_PER_PAGE, "pageNo": page_to_go}
-        if sigungu_name and sigungu_name != "전체":
-            sigungu_response = session.get(f"{BASE_URL}areaCode2", params={**common_params, "areaCode": area_code, "numOfRows": "100"})
-            sigungu_response.raise_for_status()
-            
-            sigungu_items = get_api_items(sigungu_response.json())
-            
-            sigungu_code = next((item['code'] for item in sigungu_items if isinstance(item, dict) and item.get('name') == sigungu_name), None)
-            if sigungu_code: params["sigunguCode"] = sigungu_code
+        sigungu_code = get_sigungu_code(area_name, sigungu_name)
+        if sigungu_code: params["sigunguCode"] = sigungu_code
         if content_type_id:
             params["contentTypeId"] = content_type_id
 
         response = session.get(f"{BASE_URL}areaBasedList2", params=params)
         response.raise_for_status()
-        data = response.json()
+        data = api_json(response)
         
         items = get_api_items(data)
         
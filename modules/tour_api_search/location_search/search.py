@@ -1,5 +1,5 @@
 import gradio as gr
-from utils import session, common_params, BASE_URL, get_api_items
+from utils import session, common_params, BASE_URL, decode_api_items
 
 def find_nearby_places(latitude, longitude):
     if not latitude or not longitude: return gr.update(choices=[], value=None), {}
@@ -8,7 +8,7 @@ def find_nearby_places(latitude, longitude):
         response = session.get(f"{BASE_URL}locationBasedList2", params=params)
         response.raise_for_status()
         
-        items = get_api_items(response.json())
+        items = decode_api_items(response.content)
         
         if not items: return gr.update(choices=[], value=None), {}
         
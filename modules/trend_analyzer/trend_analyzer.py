@@ -1,22 +1,22 @@
 import os
 import pandas as pd
 import datetime
-import matplotlib.pyplot as plt
 import gradio as gr
-import math
 import traceback
 import io
 from PIL import Image # PIL 임포트 추가
 
-from utils import common_params, session, BASE_URL, get_api_items, is_key_excluded
-from modules.naver_search.naver_review import get_naver_trend, search_naver_blog
-from modules.tour_api_search.area_search.controls import AREA_CODES, CONTENT_TYPE_CODES
+from utils import common_params, session, BASE_URL, is_key_excluded, decode_api_items
+from modules.naver_search.naver_review import get_naver_trend, get_naver_trends, rank_keywords_by_trend, search_naver_blog, search_naver_blogs
+from modules.tour_api_search.area_search.controls import AREA_CODES, CONTENT_TYPE_CODES, get_sigungu_code
+from modules.tour_api_search.area_search.harvest import ListHarvester
 
 # --- 신규 추가: 단일 아이템 분석 및 결과 반환 함수 ---
 def analyze_single_item(keyword):
     """단일 키워드에 대해 트렌드 그래프와 블로그 후기를 분석하여 반환합니다."""
     if not keyword:
         return None, "분석할 키워드가 없습니다."
+    import matplotlib.pyplot as plt  # 그래프를 그릴 때만 불러와 앱 시작 시간을 줄입니다.
 
     # 1. 트렌드 분석 및 그래프 생성
     today = datetime.date.today()
@@ -67,6 +67,7 @@ def analyze_trends_for_titles(titles, progress=gr.Progress()):
     """주어진 제목 리스트에 대해 네이버 트렌드 및 블로그 후기 분석을 수행하고 결과를 저장합니다."""
     if not titles:
         return "분석할 관광지 이름이 없습니다."
+    import matplotlib.pyplot as plt  # 그래프를 그릴 때만 불러와 앱 시작 시간을 줄입니다.
 
     try:
         plt.rcParams['font.family'] = 'Malgun Gothic'
@@ -80,14 +81,20 @@ def analyze_trends_for_titles(titles, progress=gr.Progress()):
     trend_output_dir = r"C:\Users\SBA\github\TourLens\naver_trend"
     os.makedirs(trend_output_dir, exist_ok=True)
 
+    # 블로그 후기는 모든 제목에 대해 미리 동시에 조회해 두고,
+    # 트렌드는 기간이 같으므로 5개씩 묶어 한 번에 조회합니다.
+    keywords = [str(title).strip() for title in titles if str(title).strip()]
+    blog_posts_by_keyword = search_naver_blogs(keywords, display=5)
+    start_date = today - datetime.timedelta(days=90)
+    trend_by_keyword = dict(zip(keywords, get_naver_trends([(keyword, start_date, today) for keyword in keywords])))
+
     for keyword in progress.tqdm(titles, total=len(titles), desc="관광지별 트렌드 및 후기 분석 중"):
         keyword = str(keyword).strip()
         if not keyword:
             continue
 
-        # 1. 트렌드 분석
-        start_date = today - datetime.timedelta(days=90)
-        df_trend_data = get_naver_trend(keyword, start_date, today)
+        # 1. 트렌드 분석 (미리 조회한 결과 사용)
+        df_trend_data = trend_by_keyword.get(keyword)
 
         if df_trend_data:
             df_trend = pd.DataFrame(df_trend_data)
@@ -111,8 +118,8 @@ def analyze_trends_for_titles(titles, progress=gr.Progress()):
         else:
             print(f"⚠️ '{keyword}'에 대한 트렌드 검색 결과가 없어 그래프를 생성하지 않습니다.")
 
-        # 2. 블로그 후기 검색
-        blog_posts = search_naver_blog(keyword, display=5)
+        # 2. 블로그 후기 (미리 조회한 결과 사용)
+        blog_posts = blog_posts_by_keyword.get(keyword, [])
         if blog_posts:
             for post in blog_posts:
                 post['keyword'] = keyword # 어떤 키워드로 검색되었는지 추가
@@ -138,8 +145,39 @@ def analyze_trends_for_titles(titles, progress=gr.Progress()):
         return f"분석 완료! {' / '.join(output_messages)}. 결과는 \"{trend_output_dir}\" 폴더에 저장되었습니다."
 
 
+# --- 인기 순위 분석 (키워드 간 비교 가능한 점수) ---
+def rank_titles_by_trend(titles, days=90, progress=gr.Progress()):
+    """제목 리스트 전체를 기준 키워드 대비 검색량으로 순위를 매기고 CSV로 저장합니다.
+
+    Seoul_Attractions_Trend.csv의 ratio는 키워드마다 기준이 달라 서로 비교할 수 없으므로,
+    순위는 기준 키워드를 모든 요청에 함께 넣어 계산한 점수를 사용합니다.
+    """
+    keywords = [str(title).strip() for title in titles if str(title).strip()]
+    if not keywords:
+        return "분석할 관광지 이름이 없습니다."
+
+    trend_output_dir = r"C:\Users\SBA\github\TourLens\naver_trend"
+    os.makedirs(trend_output_dir, exist_ok=True)
+
+    today = datetime.date.today()
+    progress(0, desc="인기 순위 계산 중...")
+    ranking = rank_keywords_by_trend(
+        keywords, today - datetime.timedelta(days=days), today,
+        progress_callback=lambda done, total: progress(done / total, desc=f"인기 순위 계산 중 ({done}/{total})"),
+    )
+    scored = int(ranking['relative_to_anchor'].notna().sum())
+    if not scored:
+        return "인기 순위를 계산하지 못했습니다. (트렌드 API 응답 없음)"
+
+    ranking_csv_path = os.path.join(trend_output_dir, "Seoul_Attractions_Trend_Ranking.csv")
+    ranking.to_csv(ranking_csv_path, index=False, encoding="utf-8-sig")
+    return (f"인기 순위 완료! {scored}/{len(ranking)}개 항목 (기준 키워드 '{ranking.attrs['anchor']}', "
+            f"API 호출 {ranking.attrs['requests']}회). 결과는 \"{ranking_csv_path}\"에 저장되었습니다.")
+
+
 # --- 내부 헬퍼 함수: 파일 기반 트렌드 분석 실행 ---
 def _run_analysis_from_file(tour_api_path, trend_output_dir, progress_tracker):
+    import matplotlib.pyplot as plt  # 그래프를 그릴 때만 불러와 앱 시작 시간을 줄입니다.
     try:
         plt.rcParams['font.family'] = 'Malgun Gothic'
         plt.rcParams['axes.unicode_minus'] = False
@@ -157,9 +195,10 @@ def _run_analysis_from_file(tour_api_path, trend_output_dir, progress_tracker):
 
     trend_results = []
     today = datetime.date.today()
-    total_festivals = len(festival_df)
 
-    for index, row in progress_tracker.tqdm(festival_df.iterrows(), total=total_festivals, desc="축제별 트렌드 분석 중"):
+    # 1. 분석 대상 축제와 조회 기간(행사 ±30일)을 먼저 정리한 뒤, 기간이 비슷한 것끼리 묶어 한 번에 조회
+    festivals = []
+    for index, row in festival_df.iterrows():
         keyword = str(row.get('title', '')).strip()
         start = row.get('eventstartdate')
         end = row.get('eventenddate')
@@ -169,8 +208,12 @@ def _run_analysis_from_file(tour_api_path, trend_output_dir, progress_tracker):
 
         start_for_api = (start - datetime.timedelta(days=30)).date()
         end_for_api = min((end + datetime.timedelta(days=30)).date(), today)
+        festivals.append((keyword, start, end, start_for_api, end_for_api))
 
-        df_trend_data = get_naver_trend(keyword, start_for_api, end_for_api)
+    progress_tracker(0, desc="축제별 트렌드 조회 중...")
+    trend_series = get_naver_trends([(keyword, api_start, api_end) for keyword, _, _, api_start, api_end in festivals])
+
+    for (keyword, start, end, _, _), df_trend_data in progress_tracker.tqdm(zip(festivals, trend_series), total=len(festivals), desc="축제별 트렌드 분석 중"):
 
         if df_trend_data is None or len(df_trend_data) == 0:
             print(f"⚠️ '{keyword}'에 대한 트렌드 검색 결과가 없어 그래프를 생성하지 않습니다.")
@@ -210,9 +253,9 @@ def _run_analysis_from_file(tour_api_path, trend_output_dir, progress_tracker):
         return "트렌드 분석을 수행할 항목이 없습니다."
 
 # --- 내부 헬퍼 함수: 아이템 목록의 전체 상세 정보 수집 ---
-def _get_full_details_for_items(items_list, progress_tracker):
+def _get_full_details_for_items(items_list, progress_tracker, total=None):
     all_item_details = []
-    for item in progress_tracker.tqdm(items_list, desc="상세 정보 수집 중"):
+    for item in progress_tracker.tqdm(items_list, total=total, desc="상세 정보 수집 중"):
         if not isinstance(item, dict):
             continue
         content_id = item.get('contentid')
@@ -230,7 +273,7 @@ def _get_full_details_for_items(items_list, progress_tracker):
             for api_name, params in apis_to_process:
                 response = session.get(f"{BASE_URL}{api_name}", params=params)
                 if response.status_code == 200 and response.text:
-                    res_items = get_api_items(response.json())
+                    res_items = decode_api_items(response.content)
                     for res_item in res_items:
                         if isinstance(res_item, dict):
                             base_data.update(res_item)
@@ -238,7 +281,7 @@ def _get_full_details_for_items(items_list, progress_tracker):
             detail_info_params = {**common_params, "contentId": content_id, "contentTypeId": content_type_id}
             response = session.get(f"{BASE_URL}detailInfo2", params=detail_info_params)
             if response.status_code == 200 and response.text:
-                info_items = get_api_items(response.json())
+                info_items = decode_api_items(response.content)
                 if info_items and isinstance(info_items[0], dict):
                     base_data.update(info_items[0])
             all_item_details.append(base_data)
@@ -256,36 +299,21 @@ def generate_trends_from_area_search(area_name, sigungu_name, category_name, pro
         # 1. 모든 아이템 목록 가져오기
         area_code = AREA_CODES.get(area_name)
         content_type_id = CONTENT_TYPE_CODES.get(category_name)
-        count_params = {**common_params, "areaCode": area_code, "numOfRows": 1, "pageNo": 1}
-        if sigungu_name and sigungu_name != "전체":
-            sigungu_response = session.get(f"{BASE_URL}areaCode2", params={**common_params, "areaCode": area_code, "numOfRows": "100"})
-            sigungu_items = get_api_items(sigungu_response.json())
-            sigungu_code = next((item['code'] for item in sigungu_items if isinstance(item, dict) and item.get('name') == sigungu_name), None)
-            if sigungu_code: count_params["sigunguCode"] = sigungu_code
+        list_params = {**common_params, "areaCode": area_code}
+        sigungu_code = get_sigungu_code(area_name, sigungu_name)
+        if sigungu_code: list_params["sigunguCode"] = sigungu_code
         if content_type_id:
-            count_params["contentTypeId"] = content_type_id
+            list_params["contentTypeId"] = content_type_id
 
-        response = session.get(f"{BASE_URL}areaBasedList2", params=count_params)
-        response.raise_for_status()
-        data = response.json()
-        body = data.get('response', {}).get('body', {})
-        total_count = body.get('totalCount', 0) if isinstance(body, dict) else 0
+        harvester = ListHarvester("areaBasedList2", list_params)
+        total_count = harvester.probe()
 
         if total_count == 0:
             return "분석할 데이터가 없습니다."
 
-        all_items = []
-        num_of_rows = 100
-        total_pages = math.ceil(total_count / num_of_rows)
-        list_params = {**count_params}
-        for page_no in progress.tqdm(range(1, total_pages + 1), desc="관광지 목록 수집 중"):
-            list_params.update({"numOfRows": num_of_rows, "pageNo": page_no})
-            response = session.get(f"{BASE_URL}areaBasedList2", params=list_params)
-            items = get_api_items(response.json())
-            all_items.extend(items)
-
-        # 2. 상세 정보 수집
-        full_details = _get_full_details_for_items(all_items, progress)
+        # 2. 상세 정보 수집 (목록 페이지가 도착하는 대로 바로 처리)
+        all_items = (item for batch in harvester for item in batch)
+        full_details = _get_full_details_for_items(all_items, progress, total=total_count)
 
         # 3. 중간 CSV 파일 저장을 위해 데이터 필터링
         filtered_details = []
@@ -300,7 +328,13 @@ def generate_trends_from_area_search(area_name, sigungu_name, category_name, pro
 
         # 4. 트렌드 분석 실행
         trend_output_dir = r"C:\Users\SBA\github\TourLens\naver_trend"
-        return _run_analysis_from_file(intermediate_csv_path, trend_output_dir, progress)
+        result_message = _run_analysis_from_file(intermediate_csv_path, trend_output_dir, progress)
+
+        # 목록 일부 페이지를 가져오지 못했다면 결과가 불완전하다는 것을 함께 알립니다.
+        partial_warning = harvester.partial_warning()
+        if partial_warning:
+            return f"경고: {partial_warning}\n\n{result_message}"
+        return result_message
 
     except Exception as e:
         traceback.print_exc()
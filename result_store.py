@@ -0,0 +1,154 @@
+import os
+import sys
+import time
+import uuid
+import random
+import threading
+from collections import OrderedDict
+
+# --- 서버 측 검색 결과 저장소 설정 (환경 변수로 조정 가능) ---
+MAX_ENTRIES = int(os.getenv("RESULT_STORE_MAX_ENTRIES", 512))
+TTL_SECONDS = int(os.getenv("RESULT_STORE_TTL_SECONDS", 60 * 60))
+MAX_BYTES = int(os.getenv("RESULT_STORE_MAX_MB", 256)) * 1024 * 1024
+SIZE_SAMPLE = 20  # 메모리 추정 시 표본으로 삼을 항목 수
+
+def _deep_size(obj, depth=0):
+    """dict/list/tuple/str로 이루어진 값의 대략적인 메모리 크기를 계산합니다."""
+    size = sys.getsizeof(obj)
+    if depth > 4:
+        return size
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, depth + 1) + _deep_size(v, depth + 1) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_deep_size(v, depth + 1) for v in obj)
+    return size
+
+def estimate_size(data):
+    """리스트는 일부 항목만 표본으로 재어 전체 크기를 추정합니다."""
+    if isinstance(data, list) and len(data) > SIZE_SAMPLE:
+        sample = random.sample(data, SIZE_SAMPLE)
+        per_item = sum(_deep_size(item) for item in sample) / SIZE_SAMPLE
+        return int(sys.getsizeof(data) + per_item * len(data))
+    return _deep_size(data)
+
+class _Entry:
+    __slots__ = ("data", "size", "shared_key", "last_access")
+
+    def __init__(self, data, size, shared_key=None):
+        self.data = data
+        self.size = size
+        self.shared_key = shared_key
+        self.last_access = time.monotonic()
+
+class ResultStore:
+    """검색 결과를 서버 메모리에 보관하고, 클라이언트에는 작은 핸들 문자열만 넘기기 위한 저장소.
+
+    - 세션+이름공간마다 최신 결과 하나만 유지합니다. (새 검색 시 이전 결과는 즉시 해제)
+    - 마지막 접근 후 TTL이 지나면 만료되고, 항목 수나 추정 메모리가 한도를 넘으면
+      가장 오래 사용하지 않은 결과부터 제거합니다.
+    - 여러 결과가 함께 붙잡고 있는 객체(예: 데이터셋 한 버전의 색인)는 shared로 넘기면,
+      그 객체를 참조하는 결과가 하나라도 남아 있는 동안 한 번만 메모리에 계산합니다.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, ttl_seconds=TTL_SECONDS, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # handle -> _Entry (오래된 것부터)
+        self._latest = {}  # (session_id, namespace) -> handle
+        self._shared = {}  # shared_key -> [크기, 참조하는 결과 수]
+        self.total_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _remove(self, handle):
+        entry = self._entries.pop(handle, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+            if entry.shared_key is not None:
+                shared = self._shared[entry.shared_key]
+                shared[1] -= 1
+                if not shared[1]:
+                    del self._shared[entry.shared_key]
+                    self.total_bytes -= shared[0]
+        return entry
+
+    def _purge_expired(self, now):
+        expired = [h for h, e in self._entries.items() if now - e.last_access > self.ttl_seconds]
+        for handle in expired:
+            self._remove(handle)
+        self.expirations += len(expired)
+
+    def put(self, session_id, namespace, data, size=None, shared=None):
+        """결과를 저장하고 핸들을 반환합니다. 같은 세션/이름공간의 이전 결과는 교체됩니다.
+
+        항목이 다른 곳(예: 공유 데이터셋)과 객체를 공유한다면 결과 자체의 메모리만 size로,
+        공유 객체는 (키, 크기)로 shared에 넘기면 됩니다.
+        """
+        session_id = session_id or "anonymous"
+        handle = f"{namespace}:{uuid.uuid4().hex}"
+        shared_key, shared_size = shared if shared is not None else (None, 0)
+        entry = _Entry(data, estimate_size(data) if size is None else size, shared_key)
+
+        with self._lock:
+            now = time.monotonic()
+            self._purge_expired(now)
+            previous = self._latest.get((session_id, namespace))
+            if previous:
+                self._remove(previous)
+
+            self._entries[handle] = entry
+            self._latest[(session_id, namespace)] = handle
+            self.total_bytes += entry.size
+            if shared_key is not None:
+                if shared_key not in self._shared:
+                    self._shared[shared_key] = [shared_size, 0]
+                    self.total_bytes += shared_size
+                self._shared[shared_key][1] += 1
+
+            # 방금 넣은 결과는 남겨두고, 한도를 넘는 동안 가장 오래된 결과부터 제거
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+            self._latest = {key: h for key, h in self._latest.items() if h in self._entries}
+        return handle
+
+    def get(self, handle):
+        """핸들에 해당하는 결과 전체를 반환합니다. 없거나 만료되었으면 None."""
+        if not handle:
+            return None
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                return None
+            now = time.monotonic()
+            if now - entry.last_access > self.ttl_seconds:
+                self._remove(handle)
+                self.expirations += 1
+                return None
+            entry.last_access = now
+            self._entries.move_to_end(handle)
+            return entry.data
+
+    def drop(self, handle):
+        with self._lock:
+            self._remove(handle)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "shared_objects": len(self._shared),
+                "total_mb": round(self.total_bytes / (1024 * 1024), 2),
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+def session_id_of(request):
+    """gr.Request에서 세션 식별자를 꺼냅니다. (API 호출 등 세션이 없으면 None)"""
+    return getattr(request, "session_hash", None) if request is not None else None
+
+result_store = ResultStore()
@@ -1,26 +1,22 @@
-import requests
-import requests.adapters
-import urllib3
 import os
 import re
+import json
+import asyncio
+import functools
+import threading
+from typing import Union
 from urllib.parse import quote
 import pandas as pd
-import matplotlib.pyplot as plt
 import io
 import base64
 
-# --- TourAPI 기본 설정 ---
-class CustomAdapter(requests.adapters.HTTPAdapter):
-    def init_poolmanager(self, *args, **kwargs):
-        context = urllib3.util.ssl_.create_urllib3_context(ciphers='DEFAULT@SECLEVEL=1')
-        kwargs['ssl_context'] = context
-        return super(CustomAdapter, self).init_poolmanager(*args, **kwargs)
+from http_client import get_session
 
+# --- TourAPI 기본 설정 ---
 TOUR_API_KEY = os.getenv("TOUR_API_KEY")
 API_KEY = quote(TOUR_API_KEY) if TOUR_API_KEY else ""
 BASE_URL = "https://apis.data.go.kr/B551011/KorService2/"
-session = requests.Session()
-session.mount("https://", CustomAdapter())
+session = get_session("tourapi")  # SECLEVEL=1 암호화 스위트 + 커넥션 풀 (http_client.CLIENT_CONFIGS)
 
 common_params = {
     "_type": "json",
@@ -29,6 +25,214 @@ common_params = {
     "serviceKey": API_KEY
 }
 
+# --- JSON 디코더 (orjson > msgspec > json 순으로 사용 가능한 것을 선택) ---
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    JSON_BACKEND = "orjson"
+    decode_json = orjson.loads
+elif msgspec is not None:
+    JSON_BACKEND = "msgspec"
+    decode_json = msgspec.json.Decoder().decode
+else:
+    JSON_BACKEND = "json"
+    decode_json = json.loads
+
+def api_json(response):
+    """requests 응답 본문을 사용 가능한 가장 빠른 디코더로 파싱합니다. (response.json() 대체)"""
+    return decode_json(response.content)
+
+if msgspec is not None:
+    class TourItem(msgspec.Struct, omit_defaults=True):
+        """목록형 API(areaBasedList2 등) item을 위한 타입 구조체. 정의되지 않은 필드는 무시됩니다."""
+        contentid: str = ""
+        contenttypeid: str = ""
+        title: str = ""
+        addr1: str = ""
+        addr2: str = ""
+        areacode: str = ""
+        sigungucode: str = ""
+        cat1: str = ""
+        cat2: str = ""
+        cat3: str = ""
+        firstimage: str = ""
+        firstimage2: str = ""
+        mapx: str = ""
+        mapy: str = ""
+        tel: str = ""
+        zipcode: str = ""
+        createdtime: str = ""
+        modifiedtime: str = ""
+
+    class _TourItems(msgspec.Struct):
+        # 결과가 1건이면 item이 dict, 여러 건이면 list로 내려옵니다.
+        item: Union[list[TourItem], TourItem] = []
+
+    class _TourBody(msgspec.Struct):
+        # 결과가 없으면 items가 빈 문자열("")로 내려옵니다.
+        items: Union[_TourItems, str] = ""
+        totalCount: int = 0
+
+    class _TourResponse(msgspec.Struct):
+        body: Union[_TourBody, str] = ""
+
+    class _TourEnvelope(msgspec.Struct):
+        response: _TourResponse = _TourResponse()
+
+    _typed_list_decoder = msgspec.json.Decoder(_TourEnvelope)
+
+def decode_api_items(content, typed=False):
+    """TourAPI 응답 바이트에서 바로 item 리스트를 추출합니다.
+
+    typed=True이고 msgspec이 설치되어 있으면 dict 대신 TourItem 구조체 리스트를 반환합니다.
+    스키마가 맞지 않는 응답은 일반 디코딩 경로로 처리합니다.
+    """
+    if typed and msgspec is not None:
+        try:
+            body = _typed_list_decoder.decode(content).response.body
+        except (msgspec.ValidationError, msgspec.DecodeError):
+            body = None
+        if body is not None:
+            if not isinstance(body, _TourBody) or not isinstance(body.items, _TourItems):
+                return []
+            items = body.items.item
+            return items if isinstance(items, list) else [items]
+    return get_api_items(decode_json(content))
+
+# --- 동일 요청 병합 (singleflight) ---
+def _freeze(value):
+    """dict/list 인자를 해시 가능한 정규화된 키로 변환합니다. (인증키는 키에서 제외)"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items() if k != "serviceKey"))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return str(value)
+
+def request_key(name, *args, **kwargs):
+    """업스트림 요청을 식별하는 정규화된 키를 만듭니다."""
+    return (name, _freeze(args), _freeze(kwargs))
+
+class _FlightCall:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """같은 키로 동시에 진행 중인 호출을 하나로 합치고, 그 결과를 모든 호출자가 공유합니다.
+
+    결과를 캐시하지는 않습니다. 진행 중인 호출이 끝나면 다음 호출은 다시 실행됩니다.
+    """
+    _registry = {}
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+        self.executed = 0  # 실제로 업스트림에 보낸 호출 수
+        self.shared = 0    # 진행 중인 호출에 합류하여 절약된 호출 수
+        SingleFlight._registry[name] = self
+
+    def do(self, key, fn, *args, **kwargs):
+        """동기 호출 경로 (requests.Session 등)."""
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _FlightCall()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    async def do_async(self, key, coro_fn, *args, **kwargs):
+        """비동기 호출 경로 (Playwright 헬퍼 등). 같은 이벤트 루프 안의 호출끼리만 합칩니다.
+
+        실제 호출은 별도 task로 실행하고 각 호출자는 shield로 기다리므로, 한 호출자가 취소되어도
+        (예: 클라이언트 연결 종료) 같은 키를 기다리는 다른 호출자는 그대로 결과를 받습니다.
+        """
+        flight_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            task = self._async_calls.get(flight_key)
+            if task is None:
+                task = self._async_calls[flight_key] = asyncio.ensure_future(self._run_async(flight_key, coro_fn, *args, **kwargs))
+                # 모든 호출자가 취소된 뒤 실패해도 "exception was never retrieved" 경고가 남지 않도록 조회 처리
+                task.add_done_callback(lambda done: done.cancelled() or done.exception())
+                self.executed += 1
+            else:
+                self.shared += 1
+        return await asyncio.shield(task)
+
+    async def _run_async(self, flight_key, coro_fn, *args, **kwargs):
+        try:
+            return await coro_fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._async_calls.pop(flight_key, None)
+
+    def coalesced(self, name):
+        """함수 인자로 키를 만들어 호출을 병합하는 데코레이터. 동기/비동기 함수 모두 지원합니다."""
+        def decorator(fn):
+            if asyncio.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    return await self.do_async(request_key(name, *args, **kwargs), fn, *args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                return self.do(request_key(name, *args, **kwargs), fn, *args, **kwargs)
+            return wrapper
+        return decorator
+
+    def stats(self):
+        total = self.executed + self.shared
+        return {
+            "executed": self.executed,
+            "shared": self.shared,
+            "saved_ratio": round(self.shared / total, 3) if total else 0.0,
+        }
+
+def get_flight_stats():
+    """등록된 모든 singleflight 그룹의 병합 통계를 반환합니다."""
+    return {name: flight.stats() for name, flight in SingleFlight._registry.items()}
+
+tour_api_flight = SingleFlight("tourapi")
+playwright_flight = SingleFlight("playwright")
+
+def fetch_tour_api(api_name, params, **kwargs):
+    """TourAPI를 호출합니다. 동일한 요청이 이미 진행 중이면 새로 보내지 않고 그 응답을 공유합니다."""
+    def _call():
+        response = session.get(f"{BASE_URL}{api_name}", params=params, **kwargs)
+        response.content  # 여러 호출자가 공유할 수 있도록 본문을 미리 읽어 둡니다.
+        return response
+    return tour_api_flight.do(request_key(api_name, params), _call)
+
 # --- 데이터 필터링 및 포맷팅 ---
 EXCLUDED_KEYS = {
     'createdtime', 'modifiedtime', 'cpyrhtDivCd', 'areacode', 'sigungucode',
@@ -61,12 +265,66 @@ def get_api_items(response_json):
         
     return []
 
+# --- HTML/필드 정제 ---
+HTML_TAG_RE = re.compile(r'<.*?>')
+# href="...", href='...' 와 JSON 이스케이프된 href=\"...\" 형태를 모두 처리합니다.
+HOMEPAGE_HREF_RE = re.compile(r'href=\\?["\']([^"\'\\]*)')
+
 def clean_html(raw_html):
     if not raw_html:
         return ""
-    cleanr = re.compile('<.*?>')
-    cleantext = re.sub(cleanr, '', raw_html)
-    return cleantext.strip()
+    return HTML_TAG_RE.sub('', raw_html).strip()
+
+def extract_homepage_url(value):
+    """homepage 필드의 <a href> 태그에서 URL을 추출합니다. 없으면 태그만 제거한 값을 반환합니다."""
+    match = HOMEPAGE_HREF_RE.search(str(value))
+    return match.group(1) if match else clean_html(str(value))
+
+# 컬럼의 문자열들을 구분자로 이어 붙여 정규식을 한 번만 실행합니다. '<.*?>'는 줄바꿈을 넘지 않으므로
+# 구분자와 줄바꿈에서 멈추는 아래 패턴이 셀마다 HTML_TAG_RE를 적용한 것과 같은 결과를 냅니다.
+_CELL_SEPARATOR = '\x00'
+_JOINED_HTML_TAG_RE = re.compile(r'<[^>\n\x00]*>')
+
+def clean_html_values(values):
+    """문자열 목록에서 HTML 태그를 제거하고 앞뒤 공백을 정리합니다. (clean_html과 같은 결과)"""
+    if not values:
+        return []
+    joined = _CELL_SEPARATOR.join(values)
+    if joined.count(_CELL_SEPARATOR) != len(values) - 1:
+        # 값 안에 구분자가 들어 있으면 셀 단위로 처리합니다.
+        return [clean_html(value) for value in values]
+    if '<' in joined:
+        joined = _JOINED_HTML_TAG_RE.sub('', joined)
+    return [value.strip() for value in joined.split(_CELL_SEPARATOR)]
+
+def _clean_column(values, is_homepage):
+    positions = [i for i, value in enumerate(values) if isinstance(value, str)]
+    strings = [values[i] for i in positions]
+    if is_homepage:
+        # homepage는 <a href>의 URL을 우선 사용하고, href가 없는 값만 태그를 제거합니다.
+        matches = [HOMEPAGE_HREF_RE.search(value) for value in strings]
+        fallback = iter(clean_html_values([value for value, match in zip(strings, matches) if not match]))
+        cleaned = [match.group(1) if match else next(fallback) for match in matches]
+    else:
+        cleaned = clean_html_values(strings)
+    values = list(values)
+    for i, value in zip(positions, cleaned):
+        values[i] = value
+    return values
+
+def clean_dataframe(df, columns=None):
+    """내보내기 직전의 DataFrame에서 HTML 태그를 제거하고 homepage URL을 추출합니다.
+
+    columns를 주면 해당 컬럼만 정제하고, 문자열이 아닌 값은 그대로 둡니다.
+    """
+    cleaned_columns = {}
+    for column in df.columns:
+        if columns is not None and column not in columns:
+            cleaned_columns[column] = df[column]
+        else:
+            values = _clean_column(df[column].tolist(), column == 'homepage')
+            cleaned_columns[column] = pd.Series(values, index=df.index, dtype=object)
+    return pd.DataFrame(cleaned_columns, index=df.index, columns=df.columns)
 
 def is_key_excluded(key):
     if key == 'eventenddate':
@@ -81,7 +339,6 @@ def format_json_to_clean_string(json_data):
         return "표시할 정보가 없습니다."
 
     output_lines = []
-    homepage_regex = "href=([\"'])(.*?)\\1"
 
     for item in items:
         image_keys = ['firstimage', 'firstimage2']
@@ -96,8 +353,7 @@ def format_json_to_clean_string(json_data):
             if not is_key_excluded(key) and value and str(value).strip():
                 cleaned_value = ""
                 if key == 'homepage':
-                    match = re.search(homepage_regex, str(value))
-                    cleaned_value = match.group(2) if match else clean_html(str(value))
+                    cleaned_value = extract_homepage_url(value)
                 else:
                     cleaned_value = clean_html(str(value))
                 
@@ -115,7 +371,9 @@ def create_trend_plot(trend_data, keyword):
     """트렌드 데이터로 그래프를 그리고 Base64 데이터 URI를 반환합니다."""
     if not trend_data:
         return None
-    
+
+    import matplotlib.pyplot as plt  # 그래프를 그릴 때만 불러와 앱 시작 시간을 줄입니다.
+
     try:
         plt.rcParams['font.family'] = 'Malgun Gothic'
         plt.rcParams['axes.unicode_minus'] = False
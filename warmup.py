@@ -0,0 +1,256 @@
+import os
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.responses import JSONResponse
+
+from http_client import get_pool_telemetry
+from result_store import result_store
+from utils import get_flight_stats
+
+# --- 워밍업 설정 (환경 변수로 조정 가능) ---
+def _env_list(name, default):
+    return [part.strip() for part in os.getenv(name, default).split(",") if part.strip()]
+
+ALL_TASKS = "seoul_dataset,area_codes,matplotlib,nlp,blog_browser,taxonomy"
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+WARMUP_TASKS = _env_list("WARMUP_TASKS", ALL_TASKS)  # 시작 직후 실행할 작업
+# 이 작업들이 모두 끝나야 /readyz가 200을 반환합니다. (나머지는 백그라운드에서 계속 데워짐)
+WARMUP_REQUIRED = _env_list("WARMUP_REQUIRED", "seoul_dataset,area_codes")
+MAX_ATTEMPTS = int(os.getenv("WARMUP_MAX_ATTEMPTS", 3))
+RETRY_DELAY_SECONDS = int(os.getenv("WARMUP_RETRY_DELAY_SECONDS", 10))
+SEOUL_DATASET_TIMEOUT = int(os.getenv("WARMUP_SEOUL_DATASET_TIMEOUT_SECONDS", 300))
+BROWSER_LAUNCH_TIMEOUT = 120
+AREA_CODE_WORKERS = 4
+
+# --- 워밍업 작업 ---
+# 각 함수는 성공하면 상태에 표시할 요약(dict)을 반환하고, 실패하면 예외를 던집니다.
+def warm_seoul_dataset():
+    """서울시 관광지 데이터셋 (디스크 캐시 또는 첫 다운로드)"""
+    from modules.seoul_search.dataset_cache import seoul_dataset
+
+    version, frame = seoul_dataset.get_snapshot(timeout=SEOUL_DATASET_TIMEOUT)
+    if not seoul_dataset.is_ready():
+        raise RuntimeError("서울시 데이터셋을 아직 불러오지 못했습니다.")
+    return {"version": version, "rows": len(frame)}
+
+def warm_area_codes():
+    """TourAPI 지역별 시군구 코드 (areaCode2)"""
+    from modules.tour_api_search.area_search.controls import AREA_CODES, get_sigungu_codes
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=AREA_CODE_WORKERS) as executor:
+        futures = {executor.submit(get_sigungu_codes, code): name for name, code in AREA_CODES.items()}
+        for future, name in futures.items():
+            try:
+                if not future.result():
+                    failed.append(name)
+            except Exception:
+                failed.append(name)
+    if failed:
+        raise RuntimeError(f"시군구 코드 조회 실패: {', '.join(failed)}")
+    return {"areas": len(AREA_CODES)}
+
+def warm_matplotlib():
+    """matplotlib import와 폰트 캐시 (트렌드 그래프)"""
+    import matplotlib
+    import matplotlib.pyplot  # noqa: F401  (첫 import 때 폰트 목록 캐시를 만듭니다.)
+    from matplotlib import font_manager
+
+    font_manager.findfont("Malgun Gothic")
+    return {"backend": matplotlib.get_backend()}
+
+def warm_nlp():
+    """후기 챗봇/요약에 쓰는 문장 토크나이저, TF-IDF, LLM 클라이언트 import"""
+    from modules.naver_search.review_retrieval import prepare_retrieval
+    import langchain_openai  # noqa: F401
+
+    prepare_retrieval()
+    return {}
+
+def warm_blog_browser():
+    """네이버 블로그 스크래핑용 공유 브라우저 실행"""
+    from modules.naver_search.blog_browser import blog_browser
+
+    blog_browser.warm_up(timeout=BROWSER_LAUNCH_TIMEOUT)
+    return blog_browser.stats()
+
+def warm_taxonomy():
+    """Playwright 탭의 시군구/서비스 대분류 목록 (visitkorea 페이지 크롤링)"""
+    from modules.tour_api_playwright_search.common import PROVINCE_CHOICES, TOURISM_TYPE_CHOICES
+    from modules.tour_api_playwright_search.area.search import (
+        get_sigungu_options, get_large_category_options, taxonomy_cache_size
+    )
+
+    async def crawl():
+        # 브라우저를 하나씩만 띄워 사용자 요청과 CPU를 다투지 않게 합니다. (이미 캐시된 목록은 건너뜀)
+        failed = []
+        for fetch, value in [(get_sigungu_options, p) for p in PROVINCE_CHOICES[1:]] + \
+                            [(get_large_category_options, t) for t in TOURISM_TYPE_CHOICES[1:]]:
+            try:
+                if not await fetch(value):
+                    failed.append(value)
+            except Exception:
+                failed.append(value)
+        return failed
+
+    failed = asyncio.run(crawl())
+    if failed:
+        raise RuntimeError(f"분류 목록 조회 실패: {', '.join(failed)}")
+    return {"cached_lists": taxonomy_cache_size()}
+
+TASK_FUNCTIONS = {
+    "seoul_dataset": warm_seoul_dataset,
+    "area_codes": warm_area_codes,
+    "matplotlib": warm_matplotlib,
+    "nlp": warm_nlp,
+    "blog_browser": warm_blog_browser,
+    "taxonomy": warm_taxonomy,
+}
+
+# --- 워밍업 실행/상태 ---
+class Warmup:
+    """앱 시작 직후 각 하위 시스템의 초기화 비용을 백그라운드에서 미리 치르고, 그 상태를 보고합니다.
+
+    작업마다 별도 스레드에서 실행되며, 실패하면 RETRY_DELAY_SECONDS 간격으로 MAX_ATTEMPTS번까지 다시 시도합니다.
+    필수 작업(WARMUP_REQUIRED)이 모두 끝나야 준비 완료로 보고하므로, 로드 밸런서는 /readyz가 200이 된
+    뒤에만 트래픽을 보내면 됩니다.
+    """
+
+    def __init__(self, tasks=WARMUP_TASKS, required=WARMUP_REQUIRED, enabled=WARMUP_ENABLED):
+        unknown = [name for name in tasks if name not in TASK_FUNCTIONS]
+        if unknown:
+            print(f"[Warmup] 알 수 없는 워밍업 작업은 건너뜁니다: {', '.join(unknown)}")
+        self.enabled = enabled
+        self.tasks = [name for name in tasks if name in TASK_FUNCTIONS] if enabled else []
+        self.required = [name for name in required if name in self.tasks]
+        self._lock = threading.Lock()
+        self._status = {name: {"status": "pending", "attempts": 0} for name in self.tasks}
+        self._started = False
+        self.started_at = time.time()
+
+    def start(self):
+        """워밍업 스레드들을 시작합니다. 여러 번 호출해도 한 번만 시작됩니다."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            self.started_at = time.time()
+        for name in self.tasks:
+            threading.Thread(target=self._run, args=(name,), name=f"warmup-{name}", daemon=True).start()
+
+    def _update(self, name, **fields):
+        with self._lock:
+            self._status[name].update(fields)
+
+    def _run(self, name):
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            started = time.perf_counter()
+            self._update(name, status="running", attempts=attempt)
+            try:
+                detail = TASK_FUNCTIONS[name]()
+            except Exception as e:
+                print(f"[Warmup] {name} 워밍업 실패 ({attempt}/{MAX_ATTEMPTS}): {e}")
+                self._update(name, status="failed", error=str(e), seconds=round(time.perf_counter() - started, 2))
+                if attempt < MAX_ATTEMPTS:
+                    time.sleep(RETRY_DELAY_SECONDS)
+                continue
+            self._update(name, status="ready", error=None, detail=detail, seconds=round(time.perf_counter() - started, 2))
+            print(f"[Warmup] {name} 준비 완료 ({time.perf_counter() - started:.1f}초)")
+            return
+
+    def is_ready(self):
+        with self._lock:
+            return all(self._status[name]["status"] == "ready" for name in self.required)
+
+    def snapshot(self):
+        with self._lock:
+            tasks = {name: {**status, "required": name in self.required} for name, status in self._status.items()}
+        return {
+            "enabled": self.enabled,
+            "ready": all(tasks[name]["status"] == "ready" for name in self.required),
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "tasks": tasks,
+        }
+
+warmup = Warmup()
+
+# --- 헬스 체크 ---
+def _seoul_dataset_stats():
+    from modules.seoul_search.dataset_cache import seoul_dataset
+    return {"ready": seoul_dataset.is_ready(), "version": seoul_dataset.version}
+
+def _area_code_stats():
+    from modules.tour_api_search.area_search.controls import cached_area_count
+    return {"cached_areas": cached_area_count()}
+
+def _taxonomy_stats():
+    from modules.tour_api_playwright_search.area.search import taxonomy_cache_size
+    return {"cached_lists": taxonomy_cache_size()}
+
+def _blog_browser_stats():
+    from modules.naver_search.blog_browser import blog_browser
+    return blog_browser.stats()
+
+def _blog_corpus_stats():
+    from modules.naver_search.blog_corpus import blog_corpus
+    return blog_corpus.stats()
+
+def _image_cache_stats():
+    from modules.naver_search.image_cache import blog_image_cache
+    return blog_image_cache.stats()
+
+def _naver_client_stats():
+    from modules.naver_search.naver_review import naver_search_client
+    return naver_search_client.stats()
+
+def _llm_cache_stats():
+    from modules.naver_search.llm_cache import llm_cache
+    return llm_cache.stats()
+
+TELEMETRY_SECTIONS = {
+    "seoul_dataset": _seoul_dataset_stats,
+    "area_codes": _area_code_stats,
+    "taxonomy": _taxonomy_stats,
+    "blog_browser": _blog_browser_stats,
+    "blog_corpus": _blog_corpus_stats,
+    "image_cache": _image_cache_stats,
+    "naver_client": _naver_client_stats,
+    "llm_cache": _llm_cache_stats,
+    "result_store": result_store.stats,
+    "http_pools": get_pool_telemetry,
+    "single_flight": get_flight_stats,
+}
+
+def telemetry_snapshot():
+    """각 캐시/커넥션 풀/병합 그룹의 현재 통계를 모읍니다.
+
+    항목마다 따로 모으며, 어느 하위 시스템(예: 잠긴 SQLite 파일)에서 예외가 나도 해당 항목에
+    오류 메시지만 남기고 나머지는 그대로 보고합니다.
+    """
+    telemetry = {}
+    for name, collect in TELEMETRY_SECTIONS.items():
+        try:
+            telemetry[name] = collect()
+        except Exception as e:
+            telemetry[name] = {"error": f"{type(e).__name__}: {e}"}
+    return telemetry
+
+def add_health_routes(app):
+    """FastAPI 앱에 헬스 체크 엔드포인트를 추가합니다. (Gradio 앱을 마운트하기 전에 호출)
+
+    - /healthz: 프로세스가 살아 있으면 항상 200 (워밍업 상태와 텔레메트리 포함)
+    - /readyz: 필수 워밍업 작업이 모두 끝났으면 200, 아니면 503
+    """
+    @app.get("/healthz")
+    def healthz():
+        return {**warmup.snapshot(), "telemetry": telemetry_snapshot()}
+
+    @app.get("/readyz")
+    def readyz():
+        snapshot = warmup.snapshot()
+        return JSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
+
+    return app